@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Literal
+from typing import Dict, FrozenSet, List, Optional, Any, Literal
 
 
 @dataclass
@@ -36,7 +36,8 @@ class Goal:
 class NPC:
     id: str
     name: str
-    inventory: List[str] = field(default_factory=list)
+    # Insertion-ordered set of item ids (values are always None) for O(1) membership checks
+    inventory: Dict[str, None] = field(default_factory=dict)
     slots: Dict[str, Optional[str]] = field(default_factory=dict)
     hp: int = 0
     # Long-term memory (LTM) stored on disk
@@ -57,6 +58,10 @@ class NPC:
         default_factory=lambda: {"strength": 10, "dexterity": 10, "constitution": 10}
     )
     skills: Dict[str, str] = field(default_factory=dict)
+    # Derived equipment caches, maintained by WorldState (see refresh_equipment_cache):
+    # summed armour_rating of equipped items and the main-hand weapon blueprint
+    ac_bonus: int = field(default=0, repr=False, compare=False)
+    mainhand_bp: Optional["ItemBlueprint"] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -76,6 +81,13 @@ class LocationState:
     sublocations: List[str] = field(default_factory=list)
     transient_effects: List[str] = field(default_factory=list)
     connections_state: Dict[str, dict] = field(default_factory=dict)
+    # Derived: occupant npc_id -> display name, maintained by WorldState.add_occupant/remove_occupant
+    _occupant_names: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    # Derived: item_id -> display name in items order, maintained by WorldState.add_location_item/remove_location_item
+    _item_names: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    # Derived: neighbor ids by connection status, rebuilt by WorldState.refresh_neighbor_sets
+    _open_neighbors: FrozenSet[str] = field(default_factory=frozenset, repr=False, compare=False)
+    _closed_neighbors: FrozenSet[str] = field(default_factory=frozenset, repr=False, compare=False)
 
 @dataclass
 class ItemBlueprint:
@@ -1,16 +1,110 @@
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Sequence
 from .data_models import PerceptionEvent
 
 
+class EventType(IntEnum):
+    """Closed vocabulary of event types; unknown strings map to UNKNOWN (no mask bits)."""
+    UNKNOWN = 0
+    DESCRIBE_LOCATION = 1
+    WAIT = 2
+    TALK = 3
+    SCREAM = 4
+    TALK_LOUD = 5
+    GRAB = 6
+    DROP = 7
+    EAT = 8
+    MOVE = 9
+    ATTACK_ATTEMPT = 10
+    ATTACK_HIT = 11
+    ATTACK_MISSED = 12
+    DAMAGE_APPLIED = 13
+    ATTACK_RESOLUTION = 14
+    NPC_DIED = 15
+    INVENTORY = 16
+    STATS = 17
+    EQUIP = 18
+    UNEQUIP = 19
+    ANALYZE = 20
+    GIVE = 21
+    TOGGLE_STARVATION = 22
+    OPEN_CONNECTION = 23
+    CLOSE_CONNECTION = 24
+    REST = 25
+    LEAVE_CONVERSATION = 26
+    REASON = 27
+    REFLECT = 28
+
+
+# event_type string -> EventType; keys are interned so dispatch dict lookups hit the identity fast path
+EVENT_TYPE_IDS: Dict[str, EventType] = {
+    sys.intern(member.name.lower()): member for member in EventType if member is not EventType.UNKNOWN
+}
+
+_CANONICAL_NAMES: Dict[EventType, str] = {member: name for name, member in EVENT_TYPE_IDS.items()}
+
+
+def _mask(*types: EventType) -> int:
+    m = 0
+    for t in types:
+        m |= 1 << t
+    return m
+
+
+# Precomputed classification bitmasks; test with ``(1 << event.event_type_id) & MASK``
+SKIP_PERCEPTION_MASK = _mask(EventType.DESCRIBE_LOCATION)
+NOISE_MASK = _mask(EventType.SCREAM, EventType.TALK_LOUD)
+# Events whose perceived location is carried in target_ids[0] rather than the actor's position
+TARGET_LOCATION_MASK = _mask(EventType.MOVE, EventType.NPC_DIED)
+VISUAL_MASK = _mask(
+    EventType.GRAB, EventType.DROP, EventType.EQUIP, EventType.UNEQUIP,
+    EventType.ATTACK_HIT, EventType.ATTACK_MISSED, EventType.DAMAGE_APPLIED,
+    EventType.ATTACK_RESOLUTION, EventType.INVENTORY, EventType.STATS, EventType.ANALYZE,
+)
+
+
 @dataclass
 class Event:
     """Core event envelope passed through the simulator."""
     event_type: str
     tick: int
     actor_id: str
-    target_ids: List[str] = field(default_factory=list)
+    # Immutable shared default; events without targets allocate nothing here
+    target_ids: Sequence[str] = ()
     payload: Dict[str, Any] = field(default_factory=dict)
+    event_type_id: int = field(init=False, repr=False, compare=False, default=EventType.UNKNOWN)
+
+    def __post_init__(self) -> None:
+        etype = EVENT_TYPE_IDS.get(self.event_type, EventType.UNKNOWN)
+        if etype is not EventType.UNKNOWN:
+            # Share the canonical interned string so later comparisons are identity checks
+            self.event_type = _CANONICAL_NAMES[etype]
+        self.event_type_id = int(etype)
+
+
+def event_factory(event_type: str) -> Callable[..., Event]:
+    """
+    Return a constructor for a single event type that skips the dataclass __init__/__post_init__.
+    The canonical type string and its EventType id are resolved once, here, instead of per event.
+    """
+    etype = EVENT_TYPE_IDS.get(event_type, EventType.UNKNOWN)
+    canonical = _CANONICAL_NAMES.get(etype) or sys.intern(event_type)
+    type_id = int(etype)
+    new = object.__new__
+
+    def make(tick: int, actor_id: str, target_ids: Optional[Sequence[str]] = None, payload: Optional[Dict[str, Any]] = None) -> Event:
+        ev = new(Event)
+        ev.event_type = canonical
+        ev.tick = tick
+        ev.actor_id = actor_id
+        ev.target_ids = target_ids if target_ids is not None else ()
+        ev.payload = payload if payload is not None else {}
+        ev.event_type_id = type_id
+        return ev
+
+    return make
 
 
 # Conversation-related lightweight types (kept optional to avoid circular deps)
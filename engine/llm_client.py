@@ -4,6 +4,17 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from urllib import request, error
 
+try:  # Optional C serializer for the per-turn context block; stdlib json is the fallback
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# Prepended to every chat request; built once since it never changes
+_JSON_GUARD_MESSAGE = {
+    "role": "system",
+    "content": "Output must be ONLY a single JSON object, no prose, no code fences. If you produce hidden reasoning, wrap it in <think>...</think> BEFORE the JSON."
+}
+
 
 class LLMClient:
     """Simple connector to an OpenAI-compatible endpoint (e.g., OpenRouter)."""
@@ -41,6 +52,44 @@ class LLMClient:
         self.extra_headers = cfg.get("extra_headers", {})
         # Optional debug flag to control verbose logging and request/response dumps
         self.debug = bool(cfg.get("debug", False))
+        # Mark the static system prefix with an explicit cache breakpoint (Anthropic-style cache_control).
+        # OpenAI-family models cache long shared prefixes automatically; Anthropic models need the marker.
+        self.cache_control = bool(cfg.get("cache_control", str(self.model or "").startswith("anthropic/")))
+        # Last exchange kept in memory for log mirroring (the llm_last_* files are only written in debug mode)
+        self.last_request: Optional[dict] = None
+        self.last_response_raw: Optional[str] = None
+        self.last_response_full: Optional[dict] = None
+        # JSON-encoded static system messages, keyed by (content, cache-marked); they repeat every turn
+        self._system_fragments: Dict[tuple, bytes] = {}
+
+    @staticmethod
+    def _mark_cacheable_prefix(msgs: List[Dict]) -> List[Dict]:
+        """Attach an ephemeral cache breakpoint to the last leading system message (the static prefix)."""
+        last = -1
+        for i, m in enumerate(msgs):
+            if m.get("role") != "system":
+                break
+            last = i
+        if last < 0 or not isinstance(msgs[last].get("content"), str):
+            return msgs
+        marked = dict(msgs[last])
+        marked["content"] = [{"type": "text", "text": marked["content"], "cache_control": {"type": "ephemeral"}}]
+        return msgs[:last] + [marked] + msgs[last + 1:]
+
+    def _encode_message(self, m: Dict) -> bytes:
+        """JSON-encode one chat message; system messages are encoded once and reused across requests."""
+        if m.get("role") == "system":
+            content = m.get("content")
+            if isinstance(content, list) and len(content) == 1 and isinstance(content[0], dict):
+                key = (content[0].get("text"), True)
+            else:
+                key = (content, False)
+            if isinstance(key[0], str):
+                enc = self._system_fragments.get(key)
+                if enc is None:
+                    enc = self._system_fragments[key] = json.dumps(m).encode()
+                return enc
+        return json.dumps(m).encode()
 
     def chat(self, messages: List[Dict[str, str]]) -> str:
         if isinstance(self.endpoint, str) and "openrouter.ai" in self.endpoint:
@@ -48,12 +97,11 @@ class LLMClient:
                 raise RuntimeError("OpenRouter requires an api_key in config/llm.json.")
         # Request the model to ONLY return a JSON object; no prose.
         # Add an assistant-side system instruction to enforce JSON output.
-        sys_guard = {
-            "role": "system",
-            "content": "Output must be ONLY a single JSON object, no prose, no code fences. If you produce hidden reasoning, wrap it in <think>...</think> BEFORE the JSON."
-        }
-        # Prepend guard if not already present
-        msgs = [sys_guard] + messages
+        # Static messages (guard, system prompt) always come first and dynamic context last, so providers
+        # with prefix caching can reuse the shared prefix across turns.
+        msgs = [_JSON_GUARD_MESSAGE] + messages
+        if self.cache_control:
+            msgs = self._mark_cacheable_prefix(msgs)
 
         payload = {
             "model": self.model,
@@ -74,16 +122,28 @@ class LLMClient:
         for k, v in (self.extra_headers or {}).items():
             headers[k] = v
 
+        self.last_request = payload
+        self.last_response_raw = None
+        self.last_response_full = None
+        # Splice the cached system-message fragments into the body so only the per-turn messages
+        # and the small request options are serialized here
+        opts = json.dumps({k: v for k, v in payload.items() if k != "messages"})
+        body = b"".join((
+            b'{"messages": [',
+            b", ".join([self._encode_message(m) for m in msgs]),
+            b"], ",
+            opts[1:].encode(),
+        ))
         req = request.Request(
             self.endpoint,
-            data=json.dumps(payload).encode(),
+            data=body,
             headers=headers,
             method="POST",
         )
         try:
             if debug:
                 # Print outbound request (truncated) for troubleshooting
-                print("[LLMClient] Request payload:", json.dumps(payload)[:500])
+                print("[LLMClient] Request payload:", body[:500].decode(errors="replace"))
                 # Persist last request for external log readers (e.g., CLI)
                 try:
                     with open("llm_last_request.json", "w", encoding="utf-8") as f:
@@ -94,6 +154,7 @@ class LLMClient:
             # Allow long-thinking local models: increase timeout substantially
             with request.urlopen(req, timeout=600) as resp:
                 raw = resp.read().decode()
+                self.last_response_raw = raw
                 if debug:
                     # Print raw response length and first chars; also dump to a file for full inspection
                     print("[LLMClient] Raw response length:", len(raw))
@@ -109,7 +170,15 @@ class LLMClient:
                     raise RuntimeError("Empty response from LLM")
                 # Some providers (including OpenRouter) support a beta response_format and may still return JSON content in choices.
                 data = json.loads(raw)
+                self.last_response_full = data
                 if debug:
+                    # Report prefix-cache reuse when the provider exposes it
+                    try:
+                        cached = ((data.get("usage") or {}).get("prompt_tokens_details") or {}).get("cached_tokens")
+                        if cached is not None:
+                            print("[LLMClient] Cached prompt tokens:", cached)
+                    except Exception:
+                        pass
                     # After successful parse, store structured JSON response for downstream tools
                     try:
                         with open("llm_last_full.json", "w", encoding="utf-8") as f:
@@ -215,8 +284,18 @@ class LLMClient:
         sys_prompt = system_prompt_override or system_prompt
         user_payload = user_input
         if additional_context is not None:
-            # Provide additional context as a JSON block preceding the user text
-            user_payload = json.dumps({"context": additional_context, "input": user_input})
+            # Provide additional context as a JSON block preceding the user text. It changes every turn,
+            # so it stays in the user message, after the static system prompt that providers can cache.
+            block = {"context": additional_context, "input": user_input}
+            user_payload = None
+            if _orjson is not None:
+                try:
+                    user_payload = _orjson.dumps(block).decode()
+                except TypeError:
+                    # orjson rejects some payloads json handles (non-str dict keys, ints past 64 bits)
+                    pass
+            if user_payload is None:
+                user_payload = json.dumps(block)
 
         messages = [
             {"role": "system", "content": sys_prompt},
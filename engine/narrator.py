@@ -23,6 +23,7 @@ class Narrator:
             "attack_hit": self._r_attack_hit,
             "attack_missed": self._r_attack_missed,
             "damage_applied": self._r_damage_applied,
+            "attack_resolution": self._r_attack_resolution,
             "talk": self._r_talk,
             "scream": self._r_scream,
             "talk_loud": self._r_talk_loud,
@@ -114,6 +115,28 @@ class Narrator:
         dmg_type = event.payload.get("damage_type", "")
         return f"{target.name} takes {amount} {dmg_type} damage (HP: {target.hp})"
 
+    def _r_attack_resolution(self, event: Event, extra: Optional[Dict[str, Any]] = None) -> str:
+        """Render a fused attack by replaying the legacy sub-event texts from its payload."""
+        p = event.payload
+        target_id = p.get("target_id") or (event.target_ids[0] if event.target_ids else None)
+        sub = Event(event_type="attack_attempt", tick=event.tick, actor_id=event.actor_id, target_ids=[target_id], payload=p)
+        lines = [self._r_attack_attempt(sub)]
+        if p.get("hit"):
+            lines.append(self._r_attack_hit(sub))
+            dmg = Event(
+                event_type="damage_applied",
+                tick=event.tick,
+                actor_id=event.actor_id,
+                target_ids=[target_id],
+                payload={"amount": p.get("damage", 0), "damage_type": p.get("damage_type", "")},
+            )
+            lines.append(self._r_damage_applied(dmg))
+            if p.get("target_dead"):
+                lines.append(self._r_npc_died(Event(event_type="npc_died", tick=event.tick, actor_id=target_id)))
+        else:
+            lines.append(self._r_attack_missed(sub))
+        return "\n".join(lines)
+
     def _r_talk(self, event: Event, extra: Optional[Dict[str, Any]] = None) -> str:
         speaker = self.world.get_npc(event.actor_id)
         content = event.payload.get("content", "")
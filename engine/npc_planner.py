@@ -3,6 +3,7 @@ from .llm_client import LLMClient
 from .data_models import Memory
 import json
 import re
+from functools import lru_cache
 
 PLANNER_SYSTEM_PROMPT = (
     "You are an action planner for a deterministic text-sim.\n"
@@ -35,6 +36,13 @@ PLANNER_SYSTEM_PROMPT = (
     "Before deciding, write brief hidden reasoning inside <think>...</think>. Then output ONLY one JSON object with the command.\n"
 )
 
+# Tool names the planner may return; anything else falls back to wait
+_VALID_TOOLS = frozenset({
+    "move", "talk", "talk_loud", "scream", "grab", "drop", "attack",
+    "inventory", "stats", "equip", "unequip", "analyze", "eat", "give",
+    "open", "close", "toggle_starvation", "wait", "rest", "interject", "leave_conversation",
+})
+
 # Minimal per-tool schemas and tiny examples used to assist the model and validate planner output.
 _SCHEMAS: Dict[str, Dict[str, Any]] = {
     "move": {
@@ -101,6 +109,21 @@ _SCHEMAS: Dict[str, Dict[str, Any]] = {
     "leave_conversation": {"required": [], "example": {"tool": "leave_conversation", "params": {}}},
 }
 
+@lru_cache(maxsize=32)
+def _tool_spec_bundle(tool_names: Tuple[str, ...]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Prompt schemas/examples for a tool set; cached since the registered tools rarely change."""
+    tool_schemas = {}
+    tool_examples = {}
+    for t in tool_names:
+        spec = _SCHEMAS.get(t)
+        if spec:
+            tool_schemas[t] = {k: v for k, v in spec.items() if k in {"required", "optional", "one_of"}}
+            ex = spec.get("example")
+            if ex:
+                tool_examples[t] = ex
+    return tool_schemas, tool_examples
+
+
 def _tokenize(text: str) -> List[str]:
     text = (text or "").lower()
     return re.findall(r"[a-z0-9_]+", text)
@@ -193,9 +216,12 @@ def build_working_memory(context: Dict[str, Any], retrieval_top_k: int = 6, max_
         if k not in keywords:
             keywords.append(k)
     convo = context.get("conversation") or {}
-    for h in (convo.get("history") or [])[-4:]:
-        if isinstance(h, dict):
-            for k in _tokenize(h.get("content") or ""):
+    # History may be a bounded deque (no slicing); copy before taking the tail
+    for h in list(convo.get("history") or [])[-4:]:
+        # History lines are dicts or ConvoLine namedtuples
+        content = h.get("content") if isinstance(h, dict) else getattr(h, "content", None)
+        if isinstance(content, str):
+            for k in _tokenize(content):
                 if k not in keywords:
                     keywords.append(k)
     for p in stm[-max_stm:]:
@@ -335,16 +361,8 @@ class NPCPlanner:
             neighbor_names = {}
         
         # Build schemas/examples for only the tools available in this context
-        tool_schemas = {}
-        tool_examples = {}
         try:
-            for t in (ctx_copy.get("available_tools") or []):
-                spec = _SCHEMAS.get(t)
-                if spec:
-                    tool_schemas[t] = {k: v for k, v in spec.items() if k in {"required", "optional", "one_of"}}
-                    ex = spec.get("example")
-                    if ex:
-                        tool_examples[t] = ex
+            tool_schemas, tool_examples = _tool_spec_bundle(tuple(ctx_copy.get("available_tools") or ()))
         except Exception:
             tool_schemas = {}
             tool_examples = {}
@@ -429,12 +447,7 @@ class NPCPlanner:
         params = parsed.get("params", {}) if isinstance(parsed.get("params"), dict) else {}
         if tool is None or (isinstance(tool, str) and tool.strip().lower() in {"null", "none"}):
             return None
-        valid_tools = {
-            "move","talk","talk_loud","scream","grab","drop","attack",
-            "inventory","stats","equip","unequip","analyze","eat","give",
-            "open","close","toggle_starvation","wait","rest","interject","leave_conversation",
-        }
-        if tool not in valid_tools:
+        if tool not in _VALID_TOOLS:
             # Stage 3 fallback immediately
             print(f"[NPCPlanner] invalid tool: {tool}")
             return {"tool": "wait", "params": {"ticks": 1}}
@@ -448,7 +461,7 @@ class NPCPlanner:
         if isinstance(repaired, dict):
             tool2 = repaired.get("tool")
             params2 = repaired.get("params", {}) if isinstance(repaired.get("params"), dict) else {}
-            if tool2 in valid_tools:
+            if tool2 in _VALID_TOOLS:
                 params2 = _normalize(tool2, params2)
                 err2 = _validate_schema(tool2, params2)
                 if err2 is None:
@@ -4,9 +4,19 @@ from typing import Dict, Any, List, Optional, Protocol, Tuple
 import random
 import json
 import math
+import heapq
+from collections import deque, namedtuple
 
 from .world_state import WorldState
-from .events import Event, make_perception_from_event
+from .events import (
+    Event,
+    EventType,
+    make_perception_from_event,
+    SKIP_PERCEPTION_MASK,
+    NOISE_MASK,
+    TARGET_LOCATION_MASK,
+    VISUAL_MASK,
+)
 from .data_models import NPC, PerceptionEvent
 import json as _json_for_cfg  # local alias to avoid shadowing
 from .tools.base import Tool
@@ -15,6 +25,72 @@ from rpg import combat_rules
 from .llm_client import LLMClient
 # Optional UI renderer is injected externally; no import here to keep engine headless by default.
 
+# One conversation history line; use ``line._asdict()`` where it crosses a JSON boundary
+ConvoLine = namedtuple("ConvoLine", ("speaker", "tick", "content"))
+
+# Lines kept per conversation; older lines spill into participants' long-term memories
+_CONVO_HISTORY_CAP = 200
+# Conversations checked for participant dispersal per _gc_conversations call (round-robin)
+_CONVO_DISPERSAL_SAMPLE = 2
+
+
+# Per-tool param alias normalizers used by process_command; each mutates params in place
+def _norm_target_location(params: Dict[str, Any]) -> None:
+    loc = params.get("target_location") or params.get("location_id") or params.get("target") or params.get("to")
+    if isinstance(loc, str) and loc:
+        params["target_location"] = loc
+
+
+def _norm_attack_target(params: Dict[str, Any]) -> None:
+    tgt = params.get("target_id")
+    if not isinstance(tgt, str):
+        if isinstance(params.get("target"), str):
+            params["target_id"] = params["target"]
+        elif isinstance(params.get("target_ids"), list) and params["target_ids"]:
+            first = params["target_ids"][0]
+            if isinstance(first, str):
+                params["target_id"] = first
+
+
+def _norm_content(params: Dict[str, Any]) -> None:
+    content = params.get("content")
+    params["content"] = content[:200] if isinstance(content, str) else "..."
+
+
+def _norm_give_recipient(params: Dict[str, Any]) -> None:
+    recip = params.get("recipient_id") or params.get("target_id")
+    if isinstance(recip, str):
+        params["target_id"] = recip
+
+
+def _norm_slot(params: Dict[str, Any]) -> None:
+    slot = params.get("slot") or params.get("equipment_slot")
+    if isinstance(slot, str):
+        params["slot"] = slot
+
+
+_PARAM_NORMALIZERS = {
+    "move": _norm_target_location,
+    "open": _norm_target_location,
+    "close": _norm_target_location,
+    "attack": _norm_attack_target,
+    "talk": _norm_content,
+    "talk_loud": _norm_content,
+    "scream": _norm_content,
+    "give": _norm_give_recipient,
+    "equip": _norm_slot,
+    "unequip": _norm_slot,
+}
+
+# Tools whose time cost is the requested tick count rather than Tool.time_cost
+_TICK_COST_TOOLS = frozenset({"wait", "rest"})
+
+# Event types whose handlers defer the world mutation to _flush_world_events; consecutive runs
+# of these are applied together, any other event flushes the run first
+_DEFERRED_EVENT_TYPES = frozenset({
+    "damage_applied", "equip", "unequip", "give", "open_connection", "close_connection",
+})
+
 class RendererProtocol(Protocol):
     def set_board(self, top_locations: List[str], sublocations_map: Dict[str, List[str]]) -> None: ...
     def update_state(self, actors: List[Dict[str, Any]], messages: Dict[str, Any]) -> None: ...
@@ -62,7 +138,7 @@ class Simulator:
             if not npc:
                 continue
             # Skip dead NPCs
-            if "dead" in getattr(npc, "tags", {}).get("dynamic", []):
+            if world.is_dead(nid):
                 continue
             # If actor is busy, skip this tick for that NPC (time will advance after an action below)
             if getattr(npc, "next_available_tick", 0) > self.game_tick:
@@ -142,7 +218,7 @@ class Simulator:
                     "occupants": visible_npcs,
                     "items": visible_items,
                 },
-                "available_tools": list(self.tools.keys()),
+                "available_tools": self._tool_names,
                 "recent_memories": getattr(world, "recent_memories", []),
                 "conversation": convo_snapshot,
             }
@@ -154,16 +230,10 @@ class Simulator:
                     action = planner.plan(ctx)
                     # If available, log hidden reasoning from last LLM response to run log (non-fatal)
                     try:
-                        from .llm_client import LLMClient as _LLM
-                        extractor = _LLM().extract_think
-                        raw = ""
-                        try:
-                            with open("llm_last_response.txt", "r", encoding="utf-8") as f:
-                                raw = f.read()
-                        except Exception:
-                            raw = ""
+                        llm = getattr(planner, "llm", None)
+                        raw = getattr(llm, "last_response_raw", None) or ""
                         if raw:
-                            think = extractor(raw)
+                            think = llm.extract_think(raw)
                             if think:
                                 print(f"[LLM think] npc_plan {nid}: {think}")
                     except Exception:
@@ -198,6 +268,7 @@ class Simulator:
                         self.event_queue = [e for e in self.event_queue if e.tick > self.game_tick]
                         for evt in ready_events:
                             self.handle_event(evt)
+                        self._flush_world_events()
                 except Exception:
                     pass
 
@@ -223,11 +294,22 @@ class Simulator:
         #  - shutdown()
         self.renderer: Optional[RendererProtocol] = None
         self.game_tick = 0
+        # Bumped whenever the world may have changed (commands, events, ticks, GM edits) so
+        # callers can reuse context derived from it while the version is unchanged
+        self._context_version = 0
         self.event_queue: List[Event] = []
+        # Run of consecutive deferrable world mutations (_DEFERRED_EVENT_TYPES); flushed before the next
+        # other event and at the end of each drain pass, so queue order is preserved
+        self._pending_world_events: List[Event] = []
         self.tools: Dict[str, Tool] = {}
+        # Registered tool names, rebuilt only by register_tool; shared by every planner context
+        self._tool_names: Tuple[str, ...] = ()
         self.narrator = narrator or Narrator(world)
         self.player_id = player_id
         self.starvation_enabled = True
+        # Deprecated: resolve attacks via the queued attack_hit/attack_missed/damage_applied/npc_died
+        # chain instead of a single fused attack_resolution event. Kept for one deprecation window.
+        self.legacy_attack_chain = False
         self.llm: Optional[LLMClient] = None  # Initialized lazily on first use
 
         # Memory config knobs with runtime overrides from config/llm.json if present
@@ -257,44 +339,55 @@ class Simulator:
         self._ui_meta: Dict[str, Any] = {}
 
         # In-memory conversation state
-        # conversations: {conversation_id: {participants, turn_order, current_speaker, start_tick, last_interaction_tick, history: [{speaker, tick, content}], location_id}}
+        # conversations: {conversation_id: {participants, turn_order, current_speaker, start_tick, last_interaction_tick, history: deque[ConvoLine(speaker, tick, content)] (bounded), location_id}}
+        # participants_set mirrors participants for O(1) membership; mutate both via _convo_add/_convo_remove_participant
         self.conversations: Dict[str, Dict[str, Any]] = {}
         # Map actor -> conversation_id (only one active conversation per actor for now)
         self.actor_conversation: Dict[str, str] = {}
+        # Min-heap of (last_interaction_tick, convo_id) for timeout GC; stale pushes are filtered on pop
+        self._convo_heap: List[Tuple[int, str]] = []
+        # Round-robin queue of conversation ids sampled for the location-dispersal check
+        self._convo_rr: deque = deque()
         # Internal flags
         self._planner_import_failed_logged = False
 
-        # Event dispatch table replacing long if/elif chain in handle_event
-        self.event_handlers = {
-            "describe_location": self._handle_describe_location,
+        # Event dispatch tables replacing long if/elif chain in handle_event.
+        # Mutating handlers always run; narration-only handlers are skipped when the
+        # narrator has no renderer subscribed for that event type.
+        self._mutating_handlers = {
             "move": self._handle_move,
             "grab": self._handle_grab,
             "drop": self._handle_drop,
             "eat": self._handle_eat,
             "attack_attempt": self._handle_attack_attempt,
-            "attack_hit": self._handle_attack_hit,
-            "attack_missed": self._handle_attack_missed,
             "damage_applied": self._handle_damage_applied,
             "talk": self._handle_talk,
-            "talk_loud": self._handle_talk_loud,
-            "scream": self._handle_scream,
-            "inventory": self._handle_inventory,
-            "stats": self._handle_stats,
             "equip": self._handle_equip,
             "unequip": self._handle_unequip,
-            "analyze": self._handle_analyze,
             "give": self._handle_give,
             "toggle_starvation": self._handle_toggle_starvation,
             "open_connection": self._handle_open_close_connection,
             "close_connection": self._handle_open_close_connection,
             "npc_died": self._handle_npc_died,
-            "wait": self._handle_wait,
             "rest": self._handle_rest,
             "leave_conversation": self._handle_leave_conversation,
         }
+        self._narration_handlers = {
+            "describe_location": self._handle_describe_location,
+            "attack_hit": self._handle_attack_hit,
+            "attack_missed": self._handle_attack_missed,
+            "talk_loud": self._handle_talk_loud,
+            "scream": self._handle_scream,
+            "inventory": self._handle_inventory,
+            "stats": self._handle_stats,
+            "analyze": self._handle_analyze,
+            "wait": self._handle_wait,
+        }
+        self.event_handlers = {**self._mutating_handlers, **self._narration_handlers}
 
     def register_tool(self, tool: Tool):
         self.tools[tool.name] = tool
+        self._tool_names = tuple(self.tools)
 
     def process_command(self, actor_id: str, command: Dict[str, Any]):
         tool_name = command.get("tool")
@@ -307,48 +400,25 @@ class Simulator:
         params = command.get("params", {}) if isinstance(command.get("params"), dict) else {}
         # Normalize common param aliases to the canonical schema expected by tools
         try:
-            if isinstance(tool_name, str):
-                t = tool_name
-                if t in {"move", "open", "close"}:
-                    loc = params.get("target_location") or params.get("location_id") or params.get("target") or params.get("to")
-                    if isinstance(loc, str) and loc:
-                        params["target_location"] = loc
-                if t == "attack":
-                    tgt = params.get("target_id")
-                    if not isinstance(tgt, str):
-                        if isinstance(params.get("target"), str):
-                            params["target_id"] = params["target"]
-                        elif isinstance(params.get("target_ids"), list) and params["target_ids"]:
-                            first = params["target_ids"][0]
-                            if isinstance(first, str):
-                                params["target_id"] = first
-                if t in {"talk", "talk_loud", "scream"}:
-                    content = params.get("content")
-                    params["content"] = content[:200] if isinstance(content, str) else "..."
-                if t == "give":
-                    recip = params.get("recipient_id") or params.get("target_id")
-                    if isinstance(recip, str):
-                        params["target_id"] = recip
-                if t in {"equip", "unequip"}:
-                    slot = params.get("slot") or params.get("equipment_slot")
-                    if isinstance(slot, str):
-                        params["slot"] = slot
+            normalize = _PARAM_NORMALIZERS.get(tool_name) if isinstance(tool_name, str) else None
+            if normalize is not None:
+                normalize(params)
         except Exception:
             pass
         if not tool.validate_intent(params, self.world, actor):
             raise ValueError("Invalid intent")
 
         # Compute time cost per command to avoid shared Tool state issues.
-        time_cost = getattr(tool, "time_cost", 1)
-        if getattr(tool, "name", "") in {"wait", "rest"}:
-            try:
-                time_cost = max(1, int(params.get("ticks", 1)))
-            except Exception:
-                time_cost = 1
+        # Tools are slotted frozen dataclasses, so plain attribute reads are cheap and always present
+        time_cost = tool.time_cost
+        if tool.name in _TICK_COST_TOOLS:
+            # Wait/Rest validators already guarantee an int >= 1; no re-coercion needed
+            time_cost = params.get("ticks", 1)
 
         events = tool.generate_events(params, self.world, actor, self.game_tick)
         self.event_queue.extend(events)
         actor.next_available_tick = self.game_tick + time_cost
+        self._context_version += 1
 
     def npc_think(self, npc: NPC) -> Optional[Dict[str, Any]]:
         """Deprecated: Use NPCPlanner.plan via run_npc_round. Retained for compatibility."""
@@ -411,7 +481,7 @@ class Simulator:
                 "occupants": occupants,
                 "items": items_here,
             },
-            "available_tools": list(self.tools.keys()),
+            "available_tools": self._tool_names,
             "recent_memories": getattr(self.world, "recent_memories", []),
             "conversation": convo_snapshot,
         }
@@ -427,6 +497,7 @@ class Simulator:
         between player turns.
         """
         self.game_tick += 1
+        self._context_version += 1
         if self.starvation_enabled:
             hunger_events = self.world.update_hunger(self.game_tick)
             self.event_queue.extend(hunger_events)
@@ -439,9 +510,48 @@ class Simulator:
             self.event_queue = [e for e in self.event_queue if e.tick > self.game_tick]
             for event in ready_events:
                 self.handle_event(event)
+            self._flush_world_events()
         # After all events for this tick have been handled and actor bubbles recorded, update the renderer once.
         self._renderer_push_state()
 
+    def advance_to(self, target_tick: int) -> None:
+        """
+        Advance time until game_tick reaches target_tick. Spans with no queued events and no
+        starvation damage due are skipped in one step; hunger stages are recomputed from absolute
+        cutoffs on the next real tick, so the end state matches ticking one at a time.
+        """
+        while self.game_tick < target_tick:
+            quiet_until = target_tick - 1
+            if self.event_queue:
+                quiet_until = min(quiet_until, min(e.tick for e in self.event_queue) - 1)
+            if self.starvation_enabled:
+                starve_at = self.world.next_starvation_tick()
+                if starve_at is not None:
+                    quiet_until = min(quiet_until, starve_at - 1)
+            if quiet_until > self.game_tick:
+                self.game_tick = quiet_until
+            self.tick()
+
+    def advance_until_player_ready(self, player_id: str) -> None:
+        """
+        Settle a player action in one call: drain its events, run NPC rounds (one tick after them
+        if any NPC acted), then advance time until the player's cooldown has elapsed.
+        """
+        self.drain_events()
+        any_npc_acted = False
+        while self.run_npc_round():
+            any_npc_acted = True
+        if any_npc_acted:
+            self.tick()
+        self.advance_to(self.world.get_npc(player_id).next_available_tick)
+
+    def drain_events(self) -> None:
+        """Tick until the event queue is empty."""
+        # tick() rebinds self.event_queue, so re-read the attribute each pass rather than caching the list
+        tick = self.tick
+        while self.event_queue:
+            tick()
+
     def set_renderer(self, renderer_adapter: Any):
         """Attach a renderer adapter (pygame-based UI)."""
         # Allow Any for call sites, but store as Protocol-typed
@@ -604,7 +714,6 @@ class Simulator:
                 event_type="reason",
                 tick=self.game_tick,
                 actor_id=npc_id,
-                target_ids=[],
                 payload={"desired_outcome": {"add_memory": {"text": str(text)[:1000]}}},
             )
             # Use world.apply_event directly to avoid narration/perception side-effects for GM ops
@@ -622,7 +731,6 @@ class Simulator:
                 event_type="reason",
                 tick=self.game_tick,
                 actor_id=npc_id,
-                target_ids=[],
                 payload={"desired_outcome": {"add_goal": {"text": str(text)[:500]}}},
             )
             self.world.apply_event(evt)
@@ -632,34 +740,21 @@ class Simulator:
             except Exception:
                 pass
 
-    def _gm_spawn_npc(self, location_id: str) -> Optional[str]:
-        """Create a simple NPC and place at location_id."""
+    def _gm_spawn_npc(self, location_id: str, name: Optional[str] = None) -> Optional[str]:
+        """Create a simple NPC (named name, or "GM NPC <n>") and place at location_id."""
         try:
             # Generate unique id
-            idx = 1
-            while True:
-                cand = f"npc_gm_{idx}"
-                if cand not in self.world.npcs:
-                    break
-                idx += 1
-            nid = cand
+            idx = self.world.next_gm_index("npc_gm_", self.world.npcs)
+            nid = f"npc_gm_{idx}"
             from .data_models import NPC  # local import to avoid cycles at import time
             npc = NPC(
                 id=nid,
-                name=f"GM NPC {idx}",
+                name=name or f"GM NPC {idx}",
                 hp=10,
             )
             self.world.npcs[nid] = npc
-            # Place in location occupants
-            try:
-                st = self.world.get_location_state(location_id)
-            except Exception:
-                # Create minimal LocationState if missing (defensive)
-                from .data_models import LocationState
-                self.world.locations_state[location_id] = LocationState(id=location_id)
-                st = self.world.locations_state[location_id]
-            if nid not in st.occupants:
-                st.occupants.append(nid)
+            # Place in location occupants (creates a minimal LocationState if missing)
+            self.world.add_occupant(location_id, nid)
             return nid
         except Exception as e:
             try:
@@ -681,25 +776,12 @@ class Simulator:
                 print("[GM] No item blueprints available; cannot spawn item.")
                 return None
             # Generate unique instance id
-            idx = 1
-            while True:
-                cand = f"item_gm_{idx}"
-                if cand not in self.world.item_instances:
-                    break
-                idx += 1
-            iid = cand
+            iid = f"item_gm_{self.world.next_gm_index('item_gm_', self.world.item_instances)}"
             from .data_models import ItemInstance
             inst = ItemInstance(id=iid, blueprint_id=bp_id, current_location=location_id, owner_id=None)
             self.world.item_instances[iid] = inst
             # Attach to location state
-            try:
-                st = self.world.get_location_state(location_id)
-            except Exception:
-                from .data_models import LocationState
-                self.world.locations_state[location_id] = LocationState(id=location_id)
-                st = self.world.locations_state[location_id]
-            if iid not in st.items:
-                st.items.append(iid)
+            self.world.add_location_item(location_id, iid)
             return iid
         except Exception as e:
             try:
@@ -718,17 +800,14 @@ class Simulator:
                 # Create minimal LocationState if missing
                 from .data_models import LocationState
                 self.world.locations_state[to_location_id] = LocationState(id=to_location_id)
+                # Dangling edges to this id become real neighbors now
+                self.world.refresh_neighbor_sets()
             # Remove from current
             cur = self.world.find_npc_location(npc_id)
             if cur and npc_id in self.world.locations_state[cur].occupants:
-                try:
-                    self.world.locations_state[cur].occupants.remove(npc_id)
-                except ValueError:
-                    pass
+                self.world.remove_occupant(cur, npc_id)
             # Add to target
-            st = self.world.get_location_state(to_location_id)
-            if npc_id not in st.occupants:
-                st.occupants.append(npc_id)
+            self.world.add_occupant(to_location_id, npc_id)
             return True
         except Exception:
             return False
@@ -764,8 +843,7 @@ class Simulator:
                         pass
                     for item_id in all_items:
                         try:
-                            if item_id not in st.items:
-                                st.items.append(item_id)
+                            self.world.add_location_item(loc_id, item_id)
                             inst = self.world.item_instances.get(item_id)
                             if inst:
                                 inst.owner_id = None
@@ -779,8 +857,7 @@ class Simulator:
                         pass
                     # Remove from occupants
                     try:
-                        if npc_id in st.occupants:
-                            st.occupants.remove(npc_id)
+                        self.world.remove_occupant(loc_id, npc_id)
                     except Exception:
                         pass
             # Remove cached UI message
@@ -789,7 +866,7 @@ class Simulator:
             except Exception:
                 pass
             # Finally delete NPC from world
-            self.world.npcs.pop(npc_id, None)
+            self.world.forget_npc(npc_id)
             return True
         except Exception:
             return False
@@ -805,23 +882,23 @@ class Simulator:
                 try:
                     owner = self.world.npcs[inst.owner_id]
                     if item_id in owner.inventory:
-                        owner.inventory.remove(item_id)
+                        owner.inventory.pop(item_id, None)
                     # If equipped in any slot, unequip
                     for slot, eq in list(owner.slots.items()):
                         if eq == item_id:
                             owner.slots[slot] = None
+                    self.world.refresh_equipment_cache(owner.id)
                 except Exception:
                     pass
             # Remove from location items
             if inst.current_location and inst.current_location in self.world.locations_state:
                 try:
-                    st = self.world.locations_state[inst.current_location]
-                    if item_id in st.items:
-                        st.items.remove(item_id)
+                    self.world.remove_location_item(inst.current_location, item_id)
                 except Exception:
                     pass
             # Remove instance
             self.world.item_instances.pop(item_id, None)
+            self.world.invalidate_item_name(item_id)
             return True
         except Exception:
             return False
@@ -835,7 +912,10 @@ class Simulator:
                 return False
             from .data_models import LocationStatic, LocationState
             self.world.locations_static[location_id] = LocationStatic(id=location_id, description=str(description or ""))
+            self.world.invalidate_location_names()
             self.world.locations_state[location_id] = LocationState(id=location_id)
+            # Dangling edges to this id become real neighbors now
+            self.world.refresh_neighbor_sets()
             return True
         except Exception:
             return False
@@ -855,6 +935,7 @@ class Simulator:
                             other = self.world.locations_state.get(nb)
                             if other and location_id in other.connections_state:
                                 other.connections_state.pop(location_id, None)
+                                self.world.refresh_neighbor_sets(nb)
                         except Exception:
                             pass
                     st.connections_state.clear()
@@ -867,6 +948,7 @@ class Simulator:
                         continue
                     if location_id in (s.connections_state or {}):
                         s.connections_state.pop(location_id, None)
+                        self.world.refresh_neighbor_sets(loc)
                     # Remove from any sublocation lists
                     try:
                         if location_id in (s.sublocations or []):
@@ -880,7 +962,7 @@ class Simulator:
                 if st:
                     for item_id in list(st.items or []):
                         try:
-                            st.items.remove(item_id)
+                            self.world.remove_location_item(location_id, item_id)
                             inst = self.world.item_instances.get(item_id)
                             if inst:
                                 inst.current_location = None
@@ -891,6 +973,7 @@ class Simulator:
             # Remove static/state entries
             self.world.locations_state.pop(location_id, None)
             self.world.locations_static.pop(location_id, None)
+            self.world.invalidate_location_names()
             return True
         except Exception:
             return False
@@ -908,18 +991,16 @@ class Simulator:
             ent_b = st_b.connections_state.setdefault(a, {})
             ent_a["status"] = "open" if status != "closed" else "closed"
             ent_b["status"] = "open" if status != "closed" else "closed"
+            self.world.refresh_neighbor_sets(a, b)
             # Attempt to infer directions from static if unknown
             try:
                 if "direction" not in ent_a:
-                    stat_a = self.world.locations_static.get(a)
-                    if stat_a:
-                        for d, nb in (getattr(stat_a, "hex_connections", {}) or {}).items():
-                            if nb == b:
-                                ent_a["direction"] = d
-                                break
+                    d = self.world.hex_direction(a, b)
+                    if d is not None:
+                        ent_a["direction"] = d
                 if "direction" not in ent_b and "direction" in ent_a:
-                    from .world_state import HEX_DIR_INVERSE
-                    inv = HEX_DIR_INVERSE.get(ent_a.get("direction"))
+                    from .world_state import inverse_direction
+                    inv = inverse_direction(ent_a.get("direction"))
                     if inv:
                         ent_b["direction"] = inv
             except Exception:
@@ -935,6 +1016,7 @@ class Simulator:
                 self.world.locations_state[a].connections_state.pop(b, None)
             if b in self.world.locations_state:
                 self.world.locations_state[b].connections_state.pop(a, None)
+            self.world.refresh_neighbor_sets(a, b)
             return True
         except Exception:
             return False
@@ -951,6 +1033,7 @@ class Simulator:
             st = "closed" if str(status).lower() == "closed" else "open"
             ent_a["status"] = st
             ent_b["status"] = st
+            self.world.refresh_neighbor_sets(a, b)
             return True
         except Exception:
             return False
@@ -991,6 +1074,8 @@ class Simulator:
             # No-op view commands (renderer already updated its internal view state)
             if name in {"noop", "enter", "back"}:
                 return
+            if name.startswith("gm_"):
+                self._context_version += 1
 
             def _refresh_conn_snapshot():
                 try:
@@ -1219,9 +1304,20 @@ class Simulator:
             pass
 
     def handle_event(self, event: Event):
-        handler = self.event_handlers.get(event.event_type)
+        self._context_version += 1
+        etype = event.event_type
+        if self._pending_world_events and etype not in _DEFERRED_EVENT_TYPES:
+            # Earlier deferred mutations must land (and be narrated) before this event is handled
+            self._flush_world_events()
+        handler = self._mutating_handlers.get(etype)
         if handler:
-            handler(event)
+            # Handlers may return a replacement event (e.g. a fused attack_resolution)
+            # which then takes the original's place for perception and bubbles.
+            resolved = handler(event)
+            if isinstance(resolved, Event):
+                event = resolved
+        elif etype in self._narration_handlers:
+            self._narration_handlers[etype](event)
         else:
             # Fallback for simple world mutations without bespoke logic
             try:
@@ -1274,6 +1370,57 @@ class Simulator:
         self._emit_narration(event)
 
     def _handle_attack_attempt(self, event: Event):
+        if self.legacy_attack_chain:
+            return self._handle_attack_attempt_legacy(event)
+        # The fused path mutates the world directly; land earlier deferred mutations (e.g. hunger damage) first
+        self._flush_world_events()
+        attacker = self.world.get_npc(event.actor_id)
+        target = self.world.get_npc(event.target_ids[0])
+        result = combat_rules.resolve_attack(self.world, attacker, target)
+        payload = {
+            "target_id": target.id,
+            "hit": result["hit"],
+            "to_hit": result["to_hit"],
+            "target_ac": result["target_ac"],
+            "damage": 0,
+            "target_dead": False,
+        }
+        if result["hit"]:
+            damage_type = result["damage_type"]
+            payload["damage"] = result["damage"]
+            payload["damage_type"] = damage_type
+            self.world.apply_event(
+                Event(
+                    event_type="damage_applied",
+                    tick=self.game_tick,
+                    actor_id=event.actor_id,
+                    target_ids=event.target_ids,
+                    payload={"amount": result["damage"], "damage_type": damage_type},
+                )
+            )
+            if target.hp <= 0 and not self.world.is_dead(target.id):
+                loc_id = self.world.find_npc_location(target.id)
+                self.world.apply_event(
+                    Event(
+                        event_type="npc_died",
+                        tick=self.game_tick,
+                        actor_id=target.id,
+                        target_ids=[loc_id] if loc_id else [],
+                    )
+                )
+                self._last_actor_msgs.pop(target.id, None)
+                payload["target_dead"] = True
+        resolution = Event(
+            event_type="attack_resolution",
+            tick=event.tick,
+            actor_id=event.actor_id,
+            target_ids=event.target_ids,
+            payload=payload,
+        )
+        self._emit_narration(resolution)
+        return resolution
+
+    def _handle_attack_attempt_legacy(self, event: Event):
         attacker = self.world.get_npc(event.actor_id)
         target = self.world.get_npc(event.target_ids[0])
         result = combat_rules.resolve_attack(self.world, attacker, target)
@@ -1300,7 +1447,7 @@ class Simulator:
                     target_ids=event.target_ids,
                     payload={
                         "amount": result["damage"],
-                        "damage_type": combat_rules.get_weapon(self.world, attacker).damage_type,
+                        "damage_type": result["damage_type"],
                     },
                 )
             )
@@ -1323,10 +1470,12 @@ class Simulator:
         self._emit_narration(event)
 
     def _handle_damage_applied(self, event: Event):
-        self.world.apply_event(event)
-        self._emit_narration(event)
+        # Applied in the per-drain world batch; death is checked in _flush_world_events
+        self._pending_world_events.append(event)
+
+    def _check_death(self, event: Event):
         target = self.world.get_npc(event.target_ids[0])
-        if target.hp <= 0 and "dead" not in target.tags.get("dynamic", []):
+        if target.hp <= 0 and not self.world.is_dead(target.id):
             loc_id = self.world.find_npc_location(target.id)
             self.event_queue.append(
                 Event(
@@ -1352,8 +1501,8 @@ class Simulator:
                 # Validate co-location with conversation location
                 if current_loc and current_loc == convo.get("location_id"):
                     # Add if not already a participant
-                    if speaker_id not in convo["participants"]:
-                        convo["participants"].append(speaker_id)
+                    if speaker_id not in convo["participants_set"]:
+                        self._convo_add_participant(convo, speaker_id)
                         self.actor_conversation[speaker_id] = payload_convo_id
                         # Join at end of queue
                         if speaker_id != convo.get("current_speaker"):
@@ -1361,14 +1510,14 @@ class Simulator:
                                 convo["turn_order"].append(speaker_id)
                     # If it is their turn right now, accept line; else just log as aside without turn advance
                     if convo.get("current_speaker") == speaker_id:
-                        convo["history"].append({"speaker": speaker_id, "tick": self.game_tick, "content": content})
-                        convo["last_interaction_tick"] = self.game_tick
+                        self._append_convo_line(convo, ConvoLine(speaker_id, self.game_tick, content))
+                        self._touch_conversation(convo)
                         self._emit_narration(event)
                         self._advance_conversation_turn(payload_convo_id, hint_target=target_id)
                     else:
                         # Allow interjecting content as history but don't advance turn
-                        convo["history"].append({"speaker": speaker_id, "tick": self.game_tick, "content": content})
-                        convo["last_interaction_tick"] = self.game_tick
+                        self._append_convo_line(convo, ConvoLine(speaker_id, self.game_tick, content))
+                        self._touch_conversation(convo)
                         self._emit_narration(event)
             return
 
@@ -1391,15 +1540,18 @@ class Simulator:
                 self.conversations[convo_id] = {
                     "conversation_id": convo_id,
                     "participants": participants[:],
+                    "participants_set": set(participants),
                     "turn_order": [pid for pid in participants if pid != speaker_id],
                     "current_speaker": speaker_id,
                     "start_tick": self.game_tick,
                     "last_interaction_tick": self.game_tick,
-                    "history": [{"speaker": speaker_id, "tick": self.game_tick, "content": content}],
+                    "history": deque([ConvoLine(speaker_id, self.game_tick, content)], maxlen=_CONVO_HISTORY_CAP),
                     "location_id": location_id,
                 }
                 for pid in participants:
                     self.actor_conversation[pid] = convo_id
+                heapq.heappush(self._convo_heap, (self.game_tick, convo_id))
+                self._convo_rr.append(convo_id)
                 self._emit_narration(event)
                 # Advance turn: targeted speech moves target to front if in participants
                 self._advance_conversation_turn(convo_id, hint_target=target_id)
@@ -1408,8 +1560,8 @@ class Simulator:
             convo = self.conversations.get(convo_id)
             if convo and convo.get("current_speaker") == speaker_id:
                 # Append to history and narrate
-                convo["history"].append({"speaker": speaker_id, "tick": self.game_tick, "content": content})
-                convo["last_interaction_tick"] = self.game_tick
+                self._append_convo_line(convo, ConvoLine(speaker_id, self.game_tick, content))
+                self._touch_conversation(convo)
                 self._emit_narration(event)
                 # Advance turn
                 self._advance_conversation_turn(convo_id, hint_target=target_id)
@@ -1427,20 +1579,17 @@ class Simulator:
         self._emit_narration(event)
 
     def _handle_equip(self, event: Event):
-        self.world.apply_event(event)
-        self._emit_narration(event)
+        self._pending_world_events.append(event)
 
     def _handle_unequip(self, event: Event):
-        self.world.apply_event(event)
-        self._emit_narration(event)
+        self._pending_world_events.append(event)
 
     def _handle_analyze(self, event: Event):
         self._emit_narration(event)
 
     def _handle_give(self, event: Event):
         # Simple world mutation; expect payload with item_id/recipient_id for clarity but keep target_ids compat
-        self.world.apply_event(event)
-        self._emit_narration(event)
+        self._pending_world_events.append(event)
 
     def _handle_toggle_starvation(self, event: Event):
         self.starvation_enabled = event.payload.get("enabled", True)
@@ -1451,8 +1600,37 @@ class Simulator:
         self._emit_narration(event)
 
     def _handle_open_close_connection(self, event: Event):
-        self.world.apply_event(event)
-        self._emit_narration(event)
+        self._pending_world_events.append(event)
+
+    def _flush_world_events(self):
+        """Apply and narrate the pending run of deferred world mutations in queue order.
+
+        Each event is narrated right after it is applied, so narration sees the state at that
+        event (e.g. HP after this hit); deaths found here are enqueued so the caller's drain loop
+        picks them up. The connections snapshot is refreshed once per run.
+        """
+        pending = self._pending_world_events
+        if not pending:
+            return
+        self._pending_world_events = []
+        apply = self.world.apply_event
+        connections_changed = False
+        is_dead = self.world.is_dead
+        for event in pending:
+            etype = event.event_type
+            if etype == "damage_applied" and event.target_ids and is_dead(event.target_ids[0]):
+                # Damage arriving after the target died is dropped, not applied or narrated
+                continue
+            apply(event)
+            self._emit_narration(event)
+            if etype == "damage_applied":
+                self._check_death(event)
+            elif etype == "open_connection" or etype == "close_connection":
+                connections_changed = True
+        if connections_changed:
+            self._refresh_connections_snapshot()
+
+    def _refresh_connections_snapshot(self):
         # Push a fresh connections_state snapshot to UI meta so renderer can draw open/closed edges
         try:
             snapshot: Dict[str, Dict[str, Any]] = {}
@@ -1498,13 +1676,12 @@ class Simulator:
 
     def record_perception(self, event: Event):
         """Add a simplified perception entry to actors in the same or adjacent locations per rules."""
-        if event.event_type in {"describe_location"}:
+        type_bit = 1 << event.event_type_id
+        if type_bit & SKIP_PERCEPTION_MASK:
             return
 
         # Determine the primary location where the event is perceived
-        if event.event_type == "move":
-            location_id = event.target_ids[0] if event.target_ids else None
-        elif event.event_type == "npc_died":
+        if type_bit & TARGET_LOCATION_MASK:
             location_id = event.target_ids[0] if event.target_ids else None
         else:
             location_id = self.world.find_npc_location(event.actor_id)
@@ -1512,31 +1689,34 @@ class Simulator:
         if not location_id:
             return
 
-        recipients: set[str] = set()
-        try:
-            loc_state = self.world.get_location_state(location_id)
-            # Same-location recipients (excluding the actor)
-            for npc_id in getattr(loc_state, "occupants", []):
-                if npc_id != event.actor_id:
-                    recipients.add(npc_id)
-        except Exception:
-            pass
+        loc_state = self.world.locations_state.get(location_id)
+        if loc_state is None:
+            return
+        noisy = bool(type_bit & NOISE_MASK)
+        occupants = [o for o in loc_state.occupants if o != event.actor_id]
+        # Solo actor and nothing audible beyond this location: nobody to inform
+        if not occupants and not noisy:
+            return
 
-        # Noise propagation rules
-        try:
-            if event.event_type in {"scream", "talk_loud"}:
+        recipients = occupants
+        # Noise propagation rules (only these need de-duplication across neighbors)
+        if noisy:
+            try:
+                seen: set[str] = set(occupants)
+                recipients = list(occupants)
                 loc_static = self.world.get_location_static(location_id)
-                state_here = self.world.get_location_state(location_id)
                 for neighbor_id in getattr(loc_static, "hex_connections", {}).values():
-                    conn = getattr(state_here, "connections_state", {}).get(neighbor_id, {})
+                    conn = getattr(loc_state, "connections_state", {}).get(neighbor_id, {})
                     is_open = conn.get("status", "open") == "open"
-                    if event.event_type == "scream" or is_open:
+                    if event.event_type_id == EventType.SCREAM or is_open:
                         neighbor_state = self.world.get_location_state(neighbor_id)
                         for npc_id in getattr(neighbor_state, "occupants", []):
                             # If neighbor location has an elevated_vantage_point tag, allow perception even if door closed (visual), but this block is for audio
-                            recipients.add(npc_id)
-        except Exception:
-            pass
+                            if npc_id not in seen:
+                                seen.add(npc_id)
+                                recipients.append(npc_id)
+            except Exception:
+                pass
 
         # Append as structured PerceptionEvent objects and cap buffer
         for npc_id in recipients:
@@ -1544,8 +1724,7 @@ class Simulator:
                 npc = self.world.get_npc(npc_id)
                 # Elevated vantage point: allow additional cross-location perception for visual events even if door closed
                 try:
-                    visual_events = {"grab","drop","equip","unequip","attack_hit","attack_missed","damage_applied","inventory","stats","analyze"}
-                    if event.event_type in visual_events:
+                    if type_bit & VISUAL_MASK:
                         # If recipient has elevated_vantage_point inherent tag, they can also perceive from neighbors
                         tags = (npc.tags or {})
                         inh = set((tags.get("inherent") or []))
@@ -1571,25 +1750,28 @@ class Simulator:
         current = convo.get("current_speaker")
         turn_order: List[str] = convo.get("turn_order", [])
         participants: List[str] = convo.get("participants", [])
+        members = convo.get("participants_set")
+        if members is None:
+            members = convo["participants_set"] = set(participants)
 
         # Ensure turn_order only contains current participants except current speaker
-        turn_order = [p for p in turn_order if p in participants and p != current]
+        turn_order = [p for p in turn_order if p in members and p != current]
 
         # Target rule: if hint_target in participants, move it to the front
-        if hint_target and hint_target in participants and hint_target != current:
+        if hint_target and hint_target in members and hint_target != current:
             # Ensure target is in queue at most once, then move to front
             turn_order = [pid for pid in turn_order if pid != hint_target]
             turn_order.insert(0, hint_target)
 
         # Move current to end
-        if current and current in participants:
+        if current and current in members:
             turn_order.append(current)
 
         # Pop next speaker
         next_speaker = turn_order.pop(0) if turn_order else None
         convo["turn_order"] = turn_order
         convo["current_speaker"] = next_speaker
-        convo["last_interaction_tick"] = self.game_tick
+        self._touch_conversation(convo)
 
         # Dissolve if fewer than 2 participants remain
         if len(participants) < 2 or not next_speaker:
@@ -1603,9 +1785,8 @@ class Simulator:
         if not convo:
             self.actor_conversation.pop(actor_id, None)
             return
+        self._convo_remove_participant(convo, actor_id)
         participants: List[str] = convo.get("participants", [])
-        if actor_id in participants:
-            participants.remove(actor_id)
         # Remove from queues
         if actor_id == convo.get("current_speaker"):
             # If others remain, immediately advance to next speaker rather than setting None
@@ -1619,7 +1800,23 @@ class Simulator:
         if len(participants) < 2:
             self._dissolve_conversation(convo_id)
         else:
-            convo["last_interaction_tick"] = self.game_tick
+            self._touch_conversation(convo)
+
+    def _convo_add_participant(self, convo: Dict[str, Any], pid: str) -> None:
+        """Append pid to the ordered participants list and the membership set together."""
+        members = convo.setdefault("participants_set", set(convo.get("participants", [])))
+        if pid not in members:
+            members.add(pid)
+            convo.setdefault("participants", []).append(pid)
+
+    def _convo_remove_participant(self, convo: Dict[str, Any], pid: str) -> None:
+        members = convo.setdefault("participants_set", set(convo.get("participants", [])))
+        if pid in members:
+            members.discard(pid)
+            try:
+                convo.get("participants", []).remove(pid)
+            except ValueError:
+                pass
 
     def _dissolve_conversation(self, convo_id: str):
         convo = self.conversations.pop(convo_id, None)
@@ -1629,19 +1826,62 @@ class Simulator:
             if self.actor_conversation.get(pid) == convo_id:
                 self.actor_conversation.pop(pid, None)
 
+    def _append_convo_line(self, convo: Dict[str, Any], line: ConvoLine) -> None:
+        """Append to the bounded history, spilling the evicted line into participants' memories."""
+        history = convo.get("history")
+        if not isinstance(history, deque):
+            history = convo["history"] = deque(history or [], maxlen=_CONVO_HISTORY_CAP)
+        if history.maxlen is not None and len(history) >= history.maxlen:
+            old = history[0]
+            for pid in convo.get("participants", []):
+                try:
+                    self.world.apply_event(
+                        Event(
+                            event_type="reason",
+                            tick=self.game_tick,
+                            actor_id=pid,
+                            payload={
+                                "desired_outcome": {
+                                    "add_memory": {
+                                        "text": f"{old.speaker} said: {old.content}",
+                                        "priority": "low",
+                                        "source_id": old.speaker,
+                                        "payload": {"conversation_id": convo.get("conversation_id"), "tick": old.tick},
+                                    }
+                                }
+                            },
+                        )
+                    )
+                except Exception:
+                    pass
+        history.append(line)
+
+    def _touch_conversation(self, convo: Dict[str, Any]) -> None:
+        """Record activity on a conversation and schedule its timeout check."""
+        convo["last_interaction_tick"] = self.game_tick
+        cid = convo.get("conversation_id")
+        if cid:
+            heapq.heappush(self._convo_heap, (self.game_tick, cid))
+
     def _gc_conversations(self, timeout: int = 300):
-        # Remove conversations that are stale or location participants dispersed
-        to_remove = []
-        for convo_id, convo in self.conversations.items():
-            if self.game_tick - convo.get("last_interaction_tick", 0) > timeout:
-                to_remove.append(convo_id)
+        # Timeouts: pop only the stalest entries; skip pushes superseded by newer activity
+        heap = self._convo_heap
+        while heap and self.game_tick - heap[0][0] > timeout:
+            tick, cid = heapq.heappop(heap)
+            convo = self.conversations.get(cid)
+            if convo and convo.get("last_interaction_tick", 0) == tick:
+                self._dissolve_conversation(cid)
+        # Dispersal: sample a few live conversations per call instead of scanning them all
+        rr = self._convo_rr
+        for _ in range(min(_CONVO_DISPERSAL_SAMPLE, len(rr))):
+            cid = rr.popleft()
+            convo = self.conversations.get(cid)
+            if not convo:
                 continue
-            # If participants are no longer co-located, dissolve
             loc = convo.get("location_id")
-            if not loc:
-                continue
-            still_here = [pid for pid in convo.get("participants", []) if self.world.find_npc_location(pid) == loc]
-            if len(still_here) < 2:
-                to_remove.append(convo_id)
-        for cid in to_remove:
-            self._dissolve_conversation(cid)
+            if loc:
+                still_here = [pid for pid in convo.get("participants", []) if self.world.find_npc_location(pid) == loc]
+                if len(still_here) < 2:
+                    self._dissolve_conversation(cid)
+                    continue
+            rr.append(cid)
@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_analyze_event = event_factory("analyze")
+
 
 class AnalyzeTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="analyze", time_cost=time_cost)
 
@@ -24,7 +28,7 @@ class AnalyzeTool(Tool):
 
     def generate_events(
         self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int
-    ) -> List[Event]:
+    ) -> Sequence[Event]:
         item_id = intent["item_id"]
         inst = world.get_item_instance(item_id)
         bp = world.get_item_blueprint(inst.blueprint_id)
@@ -36,12 +40,6 @@ class AnalyzeTool(Tool):
             "armour_rating": bp.armour_rating,
             "properties": bp.properties,
         }
-        return [
-            Event(
-                event_type="analyze",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[item_id],
-                payload=payload,
-            )
-        ]
+        return (
+            _new_analyze_event(tick, actor.id, [item_id], payload),
+        )
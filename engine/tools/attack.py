@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_attack_attempt_event = event_factory("attack_attempt")
+
 
 class AttackTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 3):
         super().__init__(name="attack", time_cost=time_cost)
 
@@ -16,17 +20,11 @@ class AttackTool(Tool):
             return False
         attacker_loc = world.find_npc_location(actor.id)
         target_loc = world.find_npc_location(target_id)
-        target_npc = world.get_npc(target_id) if target_id in world.npcs else None
-        if target_npc and "dead" in target_npc.tags.get("dynamic", []):
+        if world.is_dead(target_id):
             return False
         return attacker_loc is not None and attacker_loc == target_loc
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
-        return [
-            Event(
-                event_type="attack_attempt",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[intent["target_id"]],
-            )
-        ]
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
+        return (
+            _new_attack_attempt_event(tick, actor.id, [intent["target_id"]]),
+        )
@@ -1,23 +1,55 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence, Callable, Optional, Tuple
 
 from ..events import Event
 from ..world_state import WorldState
 from ..data_models import NPC
 
+# Marks a schema field that has no default: a missing key reads as None.
+REQUIRED = object()
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Tool:
+    """Immutable tool config; slotted so per-tick lookups skip instance dicts."""
+
     name: str
     time_cost: int = 1
 
+    @classmethod
+    def _build_validator(
+        cls, schema: Dict[str, Tuple[type, Optional[Callable[[Any], bool]], Any]]
+    ) -> Callable[..., bool]:
+        """Compile a ``validate_intent`` method from ``{field: (type, check, default)}``.
+
+        Each field is read once with ``intent.get(field, default)``, must be an
+        instance of ``type`` and, when ``check`` is given, satisfy it. The body is
+        generated and exec'd once so per-call work is straight-line code.
+        """
+        ns: Dict[str, Any] = {}
+        lines = ["def validate_intent(self, intent, world, actor):"]
+        for i, (field_name, (typ, check, default)) in enumerate(schema.items()):
+            ns[f"_t{i}"] = typ
+            if default is REQUIRED:
+                lines.append(f"    v{i} = intent.get({field_name!r})")
+            else:
+                ns[f"_d{i}"] = default
+                lines.append(f"    v{i} = intent.get({field_name!r}, _d{i})")
+            lines.append(f"    if not isinstance(v{i}, _t{i}): return False")
+            if check is not None:
+                ns[f"_c{i}"] = check
+                lines.append(f"    if not _c{i}(v{i}): return False")
+        lines.append("    return True")
+        exec("\n".join(lines), ns)
+        return ns["validate_intent"]
+
     def get_llm_prompt_fragment(self) -> str:
         return self.name
 
     def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         raise NotImplementedError
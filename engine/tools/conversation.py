@@ -1,12 +1,17 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_leave_conversation_event = event_factory("leave_conversation")
+_new_talk_event = event_factory("talk")
+
 
 class InterjectTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="interject", time_cost=time_cost)
 
@@ -22,25 +27,26 @@ class InterjectTool(Tool):
         # here we just accept structure.
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         # Use standard 'talk' event with content; simulator will interpret as interjection
         # by virtue of not being a participant yet and adding actor to convo.
-        return [
-            Event(
-                event_type="talk",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[],
-                payload={
+        return (
+            _new_talk_event(
+                tick,
+                actor.id,
+                [],
+                {
                     "content": intent["content"],
                     "conversation_id": intent["conversation_id"],
                     "interject": True,
                 },
-            )
-        ]
+            ),
+        )
 
 
 class LeaveConversationTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="leave_conversation", time_cost=time_cost)
 
@@ -48,14 +54,8 @@ class LeaveConversationTool(Tool):
         # No params required
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         # Special event the simulator will handle to remove actor from conversation
-        return [
-            Event(
-                event_type="leave_conversation",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[],
-                payload={},
-            )
-        ]
+        return (
+            _new_leave_conversation_event(tick, actor.id),
+        )
@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_drop_event = event_factory("drop")
+
 
 class DropTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="drop", time_cost=time_cost)
 
@@ -14,12 +18,7 @@ class DropTool(Tool):
         item_id = intent.get("item_id")
         return bool(item_id in actor.inventory)
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
-        return [
-            Event(
-                event_type="drop",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[intent["item_id"]],
-            )
-        ]
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
+        return (
+            _new_drop_event(tick, actor.id, [intent["item_id"]]),
+        )
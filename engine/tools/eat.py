@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_eat_event = event_factory("eat")
+
 
 class EatTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="eat", time_cost=time_cost)
 
@@ -18,15 +22,9 @@ class EatTool(Tool):
         bp = world.get_item_blueprint(item.blueprint_id)
         return "food" in bp.properties
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         item = world.get_item_instance(intent["item_id"])
         bp = world.get_item_blueprint(item.blueprint_id)
-        return [
-            Event(
-                event_type="eat",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[intent["item_id"]],
-                payload={"item_name": bp.name},
-            )
-        ]
+        return (
+            _new_eat_event(tick, actor.id, [intent["item_id"]], {"item_name": bp.name}),
+        )
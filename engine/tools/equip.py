@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_equip_event = event_factory("equip")
+
 
 class EquipTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 2):
         super().__init__(name="equip", time_cost=time_cost)
 
@@ -21,19 +25,18 @@ class EquipTool(Tool):
             return False
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         item_id = intent["item_id"]
         slot = intent["slot"]
         # Provide structured payload and legacy target_ids for compatibility
-        return [
-            Event(
-                event_type="equip",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[item_id],
-                payload={
+        return (
+            _new_equip_event(
+                tick,
+                actor.id,
+                [item_id],
+                {
                     "item_id": item_id,
                     "slot": slot,
                 },
-            )
-        ]
+            ),
+        )
@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_give_event = event_factory("give")
+
 
 class GiveTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="give", time_cost=time_cost)
 
@@ -23,19 +27,18 @@ class GiveTool(Tool):
         target_loc = world.find_npc_location(target_id)
         return actor_loc is not None and actor_loc == target_loc
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         item_id = intent["item_id"]
         target_id = intent["target_id"]
         # Populate both structured payload and legacy target_ids for compatibility
-        return [
-            Event(
-                event_type="give",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[item_id, target_id],
-                payload={
+        return (
+            _new_give_event(
+                tick,
+                actor.id,
+                [item_id, target_id],
+                {
                     "item_id": item_id,
                     "recipient_id": target_id,
                 },
-            )
-        ]
+            ),
+        )
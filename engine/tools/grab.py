@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_grab_event = event_factory("grab")
+
 
 class GrabTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="grab", time_cost=time_cost)
 
@@ -20,12 +24,7 @@ class GrabTool(Tool):
         loc_state = world.get_location_state(loc_id)
         return item_id in loc_state.items
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
-        return [
-            Event(
-                event_type="grab",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[intent["item_id"]],
-            )
-        ]
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
+        return (
+            _new_grab_event(tick, actor.id, [intent["item_id"]]),
+        )
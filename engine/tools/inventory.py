@@ -1,29 +1,25 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_inventory_event = event_factory("inventory")
+
 
 class InventoryTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="inventory", time_cost=time_cost)
 
     def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
-        items = []
-        for item_id in actor.inventory:
-            instance = world.get_item_instance(item_id)
-            blueprint = world.get_item_blueprint(instance.blueprint_id)
-            items.append(blueprint.name)
-        return [
-            Event(
-                event_type="inventory",
-                tick=tick,
-                actor_id=actor.id,
-                payload={"items": items},
-            )
-        ]
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
+        name_of = world.item_name
+        items = [name_of(item_id) for item_id in actor.inventory]
+        return (
+            _new_inventory_event(tick, actor.id, None, {"items": items}),
+        )
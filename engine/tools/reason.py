@@ -1,15 +1,60 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Any, List, Optional, Literal
+from typing import Dict, Any, Sequence, Optional, Literal
 
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC, Memory, Goal
 from .base import Tool
 
+_new_reason_event = event_factory("reason")
+
+_MEMORY_STATUSES = frozenset({"active", "recalled", "archived", "consolidated"})
+_GOAL_STATUSES = frozenset({"active", "pending", "done", "cancelled"})
+
+
+# Quick format checks, one per allowed desired_outcome op
+def _v_add_memory(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("text", ""), str)
+
+
+def _v_update_memory_status(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("match_text", ""), str) and data.get("new_status") in _MEMORY_STATUSES
+
+
+def _v_add_goal(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("text", ""), str) and isinstance(data.get("type", ""), str)
+
+
+def _v_update_goal_status(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("match_text", ""), str) and data.get("new_status") in _GOAL_STATUSES
+
+
+def _v_update_relationship(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("target_id", ""), str) and isinstance(data.get("new_status", ""), str)
+
+
+_REASON_VALIDATORS = {
+    "add_memory": _v_add_memory,
+    "update_memory_status": _v_update_memory_status,
+    "add_goal": _v_add_goal,
+    "update_goal_status": _v_update_goal_status,
+    "update_relationship": _v_update_relationship,
+}
+_REASON_OPS = frozenset(_REASON_VALIDATORS)
+
+_REASON_PROMPT_FRAGMENT = (
+    "reason(thought: string, desired_outcome: object)\n"
+    "Allowed desired_outcome variants:\n"
+    "- add_memory: {text, priority?, status?, source_id?, confidence?, is_secret?, payload?}\n"
+    "- update_memory_status: {match_text: string, new_status: 'active'|'recalled'|'archived'|'consolidated'}\n"
+    "- add_goal: {text, type, priority?, status?, payload?, expiry_tick?}\n"
+    "- update_goal_status: {match_text: string, new_status: 'active'|'pending'|'done'|'cancelled'}\n"
+    "- update_relationship: {target_id: string, new_status: string}\n"
+    "Forbidden: modifying hp, attributes, skills, inventory, slots, or moving actors."
+)
+
 
-@dataclass
 class ReasonTool(Tool):
     """
     Safe meta-tool for requesting state mutations that are social/cognitive:
@@ -20,20 +65,13 @@ class ReasonTool(Tool):
     - update_relationship
     Explicitly forbids changes to hp, inventory, equipment, or locations.
     """
-    name: str = "reason"
-    time_cost: int = 1
+    __slots__ = ()
+
+    def __init__(self, time_cost: int = 1):
+        super().__init__(name="reason", time_cost=time_cost)
 
     def get_llm_prompt_fragment(self) -> str:
-        return (
-            "reason(thought: string, desired_outcome: object)\n"
-            "Allowed desired_outcome variants:\n"
-            "- add_memory: {text, priority?, status?, source_id?, confidence?, is_secret?, payload?}\n"
-            "- update_memory_status: {match_text: string, new_status: 'active'|'recalled'|'archived'|'consolidated'}\n"
-            "- add_goal: {text, type, priority?, status?, payload?, expiry_tick?}\n"
-            "- update_goal_status: {match_text: string, new_status: 'active'|'pending'|'done'|'cancelled'}\n"
-            "- update_relationship: {target_id: string, new_status: string}\n"
-            "Forbidden: modifying hp, attributes, skills, inventory, slots, or moving actors."
-        )
+        return _REASON_PROMPT_FRAGMENT
 
     def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
         if not isinstance(intent, dict):
@@ -42,30 +80,14 @@ class ReasonTool(Tool):
         if not isinstance(desired, dict):
             return False
         # Hard allowlist for operation type
-        allowed_ops = {"add_memory", "update_memory_status", "add_goal", "update_goal_status", "update_relationship"}
-        op = next((k for k in desired.keys() if k in allowed_ops), None)
-        if not op:
+        ops = desired.keys() & _REASON_OPS
+        if not ops:
             return False
+        # Several ops requested: honour the first in request order, as the world applies only one
+        op = next(iter(ops)) if len(ops) == 1 else next(k for k in desired if k in ops)
+        return _REASON_VALIDATORS[op](desired[op])
 
-        # Quick format checks
-        if op == "add_memory":
-            data = desired[op]
-            return isinstance(data, dict) and isinstance(data.get("text", ""), str)
-        if op == "update_memory_status":
-            data = desired[op]
-            return isinstance(data, dict) and isinstance(data.get("match_text", ""), str) and data.get("new_status") in {"active", "recalled", "archived", "consolidated"}
-        if op == "add_goal":
-            data = desired[op]
-            return isinstance(data, dict) and isinstance(data.get("text", ""), str) and isinstance(data.get("type", ""), str)
-        if op == "update_goal_status":
-            data = desired[op]
-            return isinstance(data, dict) and isinstance(data.get("match_text", ""), str) and data.get("new_status") in {"active", "pending", "done", "cancelled"}
-        if op == "update_relationship":
-            data = desired[op]
-            return isinstance(data, dict) and isinstance(data.get("target_id", ""), str) and isinstance(data.get("new_status", ""), str)
-        return False
-
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         """
         This tool produces a single 'reason' event which is then applied deterministically by the world/simulator.
         World.apply_event should implement the mutations under this allowlist.
@@ -76,4 +98,4 @@ class ReasonTool(Tool):
             "thought": thought,
             "desired_outcome": desired,
         }
-        return [Event(event_type="reason", tick=tick, actor_id=actor.id, payload=payload)]
+        return (_new_reason_event(tick, actor.id, None, payload),)
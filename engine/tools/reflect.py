@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Sequence, Optional
 
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC, Memory
 from .base import Tool
 
+_new_reflect_event = event_factory("reflect")
+
+_REFLECT_LIST_KEYS = frozenset(("new_core_memories", "new_memories", "archive_matches", "consolidate_matches"))
+
+_REFLECT_PROMPT_FRAGMENT = (
+    "reflect(thought: string, outputs: {"
+    " new_core_memories?: [{text, confidence?, is_secret?, payload?}],"
+    " new_memories?: [{text, confidence?, is_secret?, payload?}],"
+    " archive_matches?: [string],"
+    " consolidate_matches?: [string]"
+    "})"
+)
+
 
-@dataclass
 class ReflectTool(Tool):
     """
     Reflection/consolidation tool. Allows an actor to:
@@ -17,18 +28,14 @@ class ReflectTool(Tool):
     - mark older detailed memories as consolidated/archived
     This tool does not mutate stats/inventory/slots.
     """
-    name: str = "reflect"
-    time_cost: int = 5  # reflection takes longer than a normal action
+    __slots__ = ()
+
+    def __init__(self, time_cost: int = 5):
+        # Reflection takes longer than a normal action
+        super().__init__(name="reflect", time_cost=time_cost)
 
     def get_llm_prompt_fragment(self) -> str:
-        return (
-            "reflect(thought: string, outputs: {"
-            " new_core_memories?: [{text, confidence?, is_secret?, payload?}],"
-            " new_memories?: [{text, confidence?, is_secret?, payload?}],"
-            " archive_matches?: [string],"
-            " consolidate_matches?: [string]"
-            "})"
-        )
+        return _REFLECT_PROMPT_FRAGMENT
 
     def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
         if not isinstance(intent, dict):
@@ -36,18 +43,14 @@ class ReflectTool(Tool):
         outputs = intent.get("outputs")
         if outputs is None or not isinstance(outputs, dict):
             return False
-        # Basic sanity checks if present
-        for key in ("new_core_memories", "new_memories"):
-            vals = outputs.get(key)
-            if vals is not None and not isinstance(vals, list):
-                return False
-        for key in ("archive_matches", "consolidate_matches"):
-            vals = outputs.get(key)
+        # Basic sanity checks if present: every known key must hold a list (thought-only outputs skip the loop)
+        for key in _REFLECT_LIST_KEYS & outputs.keys():
+            vals = outputs[key]
             if vals is not None and not isinstance(vals, list):
                 return False
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         """
         Emits a single 'reflect' event which world_state.apply_event will handle deterministically:
         - add Memory objects to npc.core_memories or npc.memories
@@ -59,4 +62,4 @@ class ReflectTool(Tool):
             "thought": thought,
             "outputs": outputs,
         }
-        return [Event(event_type="reflect", tick=tick, actor_id=actor.id, payload=payload)]
+        return (_new_reflect_event(tick, actor.id, None, payload),)
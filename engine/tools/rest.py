@@ -1,31 +1,28 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_rest_event = event_factory("rest")
+
 
 class RestTool(Tool):
     """Spend time to recover hit points."""
 
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         # Allow overriding time_cost for consistency with other tools
         super().__init__(name="rest", time_cost=time_cost)
 
-    def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
-        ticks = intent.get("ticks", 1)
-        return isinstance(ticks, int) and ticks >= 1
+    validate_intent = Tool._build_validator({"ticks": (int, lambda v: v >= 1, 1)})
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         ticks = intent.get("ticks", 1)
-        healed = ticks  # heal 1 HP per tick
-        # Do not mutate shared Tool state; schedule narration immediately.
-        return [
-            Event(
-                event_type="rest",
-                tick=tick,
-                actor_id=actor.id,
-                payload={"ticks": ticks, "healed": healed},
-            )
-        ]
+        # Do not mutate shared Tool state; schedule narration immediately. Heal 1 HP per tick,
+        # applied for the whole span [tick, end_tick) by a single apply_event.
+        return (
+            _new_rest_event(tick, actor.id, None, {"ticks": ticks, "end_tick": tick + ticks, "healed": ticks}),
+        )
@@ -1,30 +1,26 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
-from .base import Tool
-from ..events import Event
+from .base import Tool, REQUIRED
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_scream_event = event_factory("scream")
+
 
 class ScreamTool(Tool):
     """Broadcast a loud shout that can be heard in adjacent locations."""
 
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="scream", time_cost=time_cost)
 
-    def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
-        content = intent.get("content")
-        return isinstance(content, str) and bool(content)
+    validate_intent = Tool._build_validator({"content": (str, bool, REQUIRED)})
 
     def generate_events(
         self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int
-    ) -> List[Event]:
-        return [
-            Event(
-                event_type="scream",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[],
-                payload={"content": intent["content"]},
-            )
-        ]
+    ) -> Sequence[Event]:
+        return (
+            _new_scream_event(tick, actor.id, None, {"content": intent["content"]}),
+        )
@@ -1,29 +1,33 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_stats_event = event_factory("stats")
+
 
 class StatsTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="stats", time_cost=time_cost)
 
     def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
-        return [
-            Event(
-                event_type="stats",
-                tick=tick,
-                actor_id=actor.id,
-                payload={
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
+        return (
+            _new_stats_event(
+                tick,
+                actor.id,
+                None,
+                {
                     "hp": actor.hp,
                     "attributes": actor.attributes,
                     "skills": actor.skills,
                     "hunger_stage": actor.hunger_stage,
                 },
-            )
-        ]
+            ),
+        )
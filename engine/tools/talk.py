@@ -1,12 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_talk_event = event_factory("talk")
+
 
 class TalkTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="talk", time_cost=time_cost)
 
@@ -20,19 +24,19 @@ class TalkTool(Tool):
             return False
         # ensure speaker and target share location if target given
         if target:
+            # Occupant name map keys mirror the occupants list, so this is a single membership test
             actor_loc = world.find_npc_location(actor.id)
-            target_loc = world.find_npc_location(target)
-            if actor_loc != target_loc:
+            if actor_loc is None or target not in world.location_occupant_names(actor_loc):
                 return False
         return True
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
-        return [
-            Event(
-                event_type="talk",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[intent.get("target_id")] if intent.get("target_id") else [],
-                payload={"content": intent["content"]},
-            )
-        ]
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
+        target = intent.get("target_id")
+        return (
+            _new_talk_event(
+                tick,
+                actor.id,
+                [target] if target else None,
+                {"content": intent["content"]},
+            ),
+        )
@@ -1,30 +1,26 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
-from .base import Tool
-from ..events import Event
+from .base import Tool, REQUIRED
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_talk_loud_event = event_factory("talk_loud")
+
 
 class TalkLoudTool(Tool):
     """Speak loudly so adjacent locations with open connections can hear."""
 
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         super().__init__(name="talk_loud", time_cost=time_cost)
 
-    def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
-        content = intent.get("content")
-        return isinstance(content, str) and bool(content)
+    validate_intent = Tool._build_validator({"content": (str, bool, REQUIRED)})
 
     def generate_events(
         self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int
-    ) -> List[Event]:
-        return [
-            Event(
-                event_type="talk_loud",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[],
-                payload={"content": intent["content"]},
-            )
-        ]
+    ) -> Sequence[Event]:
+        return (
+            _new_talk_loud_event(tick, actor.id, None, {"content": intent["content"]}),
+        )
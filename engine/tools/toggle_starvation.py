@@ -1,27 +1,24 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
-from .base import Tool
-from ..events import Event
+from .base import Tool, REQUIRED
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_toggle_starvation_event = event_factory("toggle_starvation")
+
 
 class ToggleStarvationTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 0):
         super().__init__(name="toggle_starvation", time_cost=time_cost)
 
-    def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
-        return isinstance(intent.get("enabled"), bool)
+    validate_intent = Tool._build_validator({"enabled": (bool, None, REQUIRED)})
 
     def generate_events(
         self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int
-    ) -> List[Event]:
-        return [
-            Event(
-                event_type="toggle_starvation",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[],
-                payload={"enabled": intent["enabled"]},
-            )
-        ]
+    ) -> Sequence[Event]:
+        return (
+            _new_toggle_starvation_event(tick, actor.id, None, {"enabled": intent["enabled"]}),
+        )
@@ -1,38 +1,35 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_unequip_event = event_factory("unequip")
+
 
 class UnequipTool(Tool):
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 2):
         super().__init__(name="unequip", time_cost=time_cost)
 
     def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
-        slot = intent.get("slot")
-        if not slot:
-            return False
-        if slot not in actor.slots:
-            return False
-        if not actor.slots.get(slot):
-            return False
-        return True
+        # Empty and unknown slots both read as None
+        return bool(actor.slots.get(intent.get("slot")))
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         slot = intent["slot"]
         item_id = actor.slots[slot]
         # Provide structured payload and legacy target_ids for compatibility
-        return [
-            Event(
-                event_type="unequip",
-                tick=tick,
-                actor_id=actor.id,
-                target_ids=[item_id],
-                payload={
+        return (
+            _new_unequip_event(
+                tick,
+                actor.id,
+                [item_id],
+                {
                     "item_id": item_id,
                     "slot": slot,
                 },
-            )
-        ]
+            ),
+        )
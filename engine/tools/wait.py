@@ -1,30 +1,28 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Sequence
 
 from .base import Tool
-from ..events import Event
+from ..events import Event, event_factory
 from ..world_state import WorldState
 from ..data_models import NPC
 
+_new_wait_event = event_factory("wait")
+
 
 class WaitTool(Tool):
     """Tool allowing an actor to deliberately pass time."""
 
+    __slots__ = ()
+
     def __init__(self, time_cost: int = 1):
         # Allow overriding time_cost for consistency with other tools
         super().__init__(name="wait", time_cost=time_cost)
 
-    def validate_intent(self, intent: Dict[str, Any], world: WorldState, actor: NPC) -> bool:
-        ticks = intent.get("ticks", 1)
-        return isinstance(ticks, int) and ticks >= 1
+    validate_intent = Tool._build_validator({"ticks": (int, lambda v: v >= 1, 1)})
 
-    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> List[Event]:
+    def generate_events(self, intent: Dict[str, Any], world: WorldState, actor: NPC, tick: int) -> Sequence[Event]:
         ticks = intent.get("ticks", 1)
         # Do not mutate shared Tool state; narration should occur immediately.
-        return [
-            Event(
-                event_type="wait",
-                tick=tick,
-                actor_id=actor.id,
-                payload={"ticks": ticks},
-            )
-        ]
+        # One event covers the whole span [tick, end_tick); nothing is scheduled per tick.
+        return (
+            _new_wait_event(tick, actor.id, None, {"ticks": ticks, "end_tick": tick + ticks}),
+        )
@@ -1,6 +1,17 @@
 import json
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, List, Tuple, FrozenSet
+
+try:  # Optional C parser; stdlib json is the fallback and yields identical dicts/lists
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
 
 from .data_models import (
     NPC,
@@ -13,33 +24,242 @@ from .events import Event
 from .data_models import Memory, Goal, PerceptionEvent
 
 
-# Shared hex-direction inverse map (DRY for hydration and event handling)
-HEX_DIR_INVERSE = {
-    "E": "W",
-    "W": "E",
-    "NE": "SW",
-    "SW": "NE",
-    "NW": "SE",
-    "SE": "NW",
-    "north": "south",
-    "south": "north",
-    "north_east": "south_west",
-    "north-east": "south-west",
-    "northeast": "southwest",
-    "south_west": "north_east",
-    "south-west": "north-east",
-    "southwest": "northeast",
-    "south_east": "north_west",
-    "south-east": "north-west",
-    "southeast": "northwest",
-    "north_west": "south_east",
-    "north-west": "south-east",
-    "northwest": "southeast",
-    "east": "west",
-    "west": "east",
+def _build_hex_dir_inverse() -> Dict[str, str]:
+    inverse: Dict[str, str] = {}
+    for a, b in (("E", "W"), ("NE", "SW"), ("NW", "SE"), ("north", "south"), ("east", "west")):
+        inverse[a] = b
+        inverse[b] = a
+    # Compound names appear with '-', '' or '_' separators; the inverse keeps the caller's spelling
+    for a, b in (("north_east", "south_west"), ("south_east", "north_west")):
+        for sep in ("-", "", "_"):
+            x, y = a.replace("_", sep), b.replace("_", sep)
+            inverse[x] = y
+            inverse[y] = x
+    return inverse
+
+
+# Ticks since last meal at which an NPC becomes hungry / starving (see WorldState.update_hunger)
+HUNGRY_THRESHOLD = 20
+STARVING_THRESHOLD = 40
+# Soft caps for NPC memory/goal lists; beyond MEMORY_SOFT_CAP the oldest memories are archived, not dropped
+MEMORY_SOFT_CAP = 1000
+MEMORY_ARCHIVE_BATCH = 50
+CORE_MEMORY_CAP = 50
+GOAL_CAP = 100
+
+
+# Shared hex-direction inverse map (DRY for hydration and event handling), exact spellings only
+HEX_DIR_INVERSE: Dict[str, str] = _build_hex_dir_inverse()
+# Same map keyed by lower-case, '_'-separated spelling; built once, consulted only on an exact miss
+_HEX_DIR_INVERSE_NORMALIZED: Dict[str, str] = {
+    k.lower().replace("-", "_"): v for k, v in HEX_DIR_INVERSE.items()
 }
 
 
+def inverse_direction(direction: Any) -> Optional[str]:
+    """Opposite hex direction, or None for non-strings and unknown directions."""
+    if not isinstance(direction, str):
+        return None
+    inv = HEX_DIR_INVERSE.get(direction)
+    if inv is None:
+        inv = _HEX_DIR_INVERSE_NORMALIZED.get(direction.lower().replace("-", "_"))
+    return inv
+
+
+def _substring_matcher(tokens: Any) -> Optional["re.Pattern[str]"]:
+    """Compiled pattern matching any of the lower-cased string tokens as a plain substring; None if there are none."""
+    needles = {t.lower() for t in tokens if isinstance(t, str)}
+    if not needles:
+        return None
+    # Longest first so the alternation never stops at a shorter prefix of another needle
+    return re.compile("|".join(re.escape(t) for t in sorted(needles, key=len, reverse=True)))
+
+
+# Coerce memory/goal/perception dicts into dataclasses when loading from JSON. Legacy dict
+# entries are migrated here once, so runtime handlers only ever see dataclass instances.
+def _to_memory(raw: Any) -> Memory:
+    if isinstance(raw, Memory):
+        return raw
+    if isinstance(raw, dict):
+        return Memory(
+            text=str(raw.get("text", "")),
+            tick=int(raw.get("tick", 0) or 0),
+            priority=str(raw.get("priority", "normal")),
+            status=str(raw.get("status", "active")),
+            source_id=raw.get("source_id"),
+            confidence=float(raw.get("confidence", 1.0)),
+            is_secret=bool(raw.get("is_secret", False)),
+            payload=dict(raw.get("payload", {})) if isinstance(raw.get("payload", {}), dict) else {},
+        )
+    return Memory(text=str(raw))
+
+
+def _to_goal(raw: Any) -> Goal:
+    if isinstance(raw, Goal):
+        return raw
+    if isinstance(raw, dict):
+        return Goal(
+            text=str(raw.get("text", "")),
+            type=str(raw.get("type", "note")),
+            priority=str(raw.get("priority", "normal")),
+            status=str(raw.get("status", "active")),
+            payload=dict(raw.get("payload", {})) if isinstance(raw.get("payload", {}), dict) else {},
+            expiry_tick=int(raw.get("expiry_tick")) if raw.get("expiry_tick") is not None else None,
+        )
+    return Goal(text=str(raw))
+
+
+def _to_perception(raw: Any) -> PerceptionEvent:
+    if isinstance(raw, PerceptionEvent):
+        return raw
+    if isinstance(raw, dict):
+        return PerceptionEvent(
+            event_type=str(raw.get("event_type", raw.get("type", "generic"))),
+            tick=int(raw.get("tick", 0) or 0),
+            actor_id=raw.get("actor_id"),
+            target_ids=list(raw.get("target_ids", []) or []),
+            location_id=raw.get("location_id"),
+            payload=dict(raw.get("payload", {})) if isinstance(raw.get("payload", {}), dict) else {},
+        )
+    return PerceptionEvent(event_type="generic", payload={"raw": raw})
+
+
+def _intern_id(value: Any) -> Any:
+    """sys.intern string ids so equal ids parsed from different files share one object (and its hash)."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_ids(values: Any) -> List[Any]:
+    return [_intern_id(v) for v in values]
+
+
+def _read_json(path) -> Any:
+    """Parse a JSON file from raw bytes (no intermediate str decode when orjson is available)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _name_matches(name: str, pattern: str) -> bool:
+    """``*<suffix>`` patterns match by suffix; any other pattern is an exact file name."""
+    if pattern.startswith("*"):
+        return name.endswith(pattern[1:])
+    return name == pattern
+
+
+def _json_files(directory: Path, pattern: str = "*.json") -> List[str]:
+    """Paths of regular files in ``directory`` matching ``pattern``; empty if the directory is missing."""
+    try:
+        with os.scandir(directory) as it:
+            return [e.path for e in it if _name_matches(e.name, pattern) and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(record) + b"\n"
+    return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+# Packed world data: one JSON-lines file per section under <data_dir>/.pack, built by build_pack().
+# section -> (source directory relative to data_dir, source file pattern: "*<suffix>" or an exact name)
+PACK_DIR_NAME = ".pack"
+_PACK_SECTIONS: Dict[str, Tuple[str, str]] = {
+    "npcs": ("npcs", "*.json"),
+    "locations_static": ("locations", "*_static.json"),
+    "locations_state": ("locations", "*_state.json"),
+    "items_catalog": ("items", "catalog.json"),
+    "items_instances": (os.path.join("items", "instances"), "*.json"),
+}
+
+
+def _file_records(section: str, paths: List[str]) -> List[Tuple[Any, Dict[str, Any]]]:
+    """(id, body) records for a section read from its per-file JSON sources."""
+    records: List[Tuple[Any, Dict[str, Any]]] = []
+    for path in paths:
+        data = _read_json(path)
+        if section == "items_catalog":
+            records.extend(data.items())
+        else:
+            records.append((data.get("id"), data))
+    return records
+
+
+def _pack_records(pack_path: Path) -> List[Tuple[Any, Dict[str, Any]]]:
+    """(id, body) records from a pack file, parsed line by line off a read-only mmap."""
+    loads = _orjson.loads if _orjson is not None else json.loads
+    records: List[Tuple[Any, Dict[str, Any]]] = []
+    with open(pack_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return records
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                if line.strip():
+                    rec = loads(line)
+                    records.append((rec.get("id"), rec.get("body") or {}))
+    return records
+
+
+def _pack_is_fresh(pack_path: Path, source_dir: Path, pattern: str) -> bool:
+    """True if the pack is at least as new as its source directory and every source file."""
+    try:
+        pack_mtime = os.stat(pack_path).st_mtime_ns
+        newest = os.stat(source_dir).st_mtime_ns
+        with os.scandir(source_dir) as it:
+            for e in it:
+                if _name_matches(e.name, pattern):
+                    newest = max(newest, e.stat().st_mtime_ns)
+    except OSError:
+        return False
+    return pack_mtime >= newest
+
+
+def build_pack(data_dir: Path) -> Path:
+    """
+    Write each world data section as a single JSON-lines file ({"id", "body"} per line) so
+    WorldState.load can stream one file per section instead of opening every small JSON file.
+    Packs are skipped automatically once any source file is newer; rerun after editing data.
+    """
+    data_dir = Path(data_dir)
+    pack_dir = data_dir / PACK_DIR_NAME
+    pack_dir.mkdir(exist_ok=True)
+    for section, (subdir, pattern) in _PACK_SECTIONS.items():
+        paths = sorted(_json_files(data_dir / subdir, pattern))
+        tmp_path = pack_dir / f"{section}.jsonl.tmp"
+        with open(tmp_path, "wb") as f:
+            for rec_id, body in _file_records(section, paths):
+                f.write(_dumps_line({"id": rec_id, "body": body}))
+        os.replace(tmp_path, pack_dir / f"{section}.jsonl")
+    return pack_dir
+
+
+class _ItemNameCache(dict):
+    """item_id -> blueprint display name, resolved lazily on first lookup.
+
+    An unknown instance falls back to its item id and an unknown blueprint to the blueprint id;
+    fallbacks are not cached, so the real name shows up once the instance/blueprint exists.
+    """
+
+    def __init__(self, world: "WorldState"):
+        super().__init__()
+        self._world = world
+
+    def __missing__(self, item_id: str) -> str:
+        world = self._world
+        inst = world.item_instances.get(item_id)
+        if inst is None:
+            return item_id
+        bp = world.item_blueprints.get(inst.blueprint_id)
+        if bp is None:
+            return inst.blueprint_id
+        name = bp.name
+        self[item_id] = name
+        return name
+
+
 class WorldState:
     def __init__(self, data_dir: Path):
         self.data_dir = data_dir
@@ -48,17 +268,66 @@ class WorldState:
         self.locations_state: Dict[str, LocationState] = {}
         self.item_blueprints: Dict[str, ItemBlueprint] = {}
         self.item_instances: Dict[str, ItemInstance] = {}
+        # Lazily filled item_id -> name map; drop entries via invalidate_item_name when items/blueprints change
+        self._item_name_cache: Dict[str, str] = _ItemNameCache(self)
+        # Lazily filled item_id -> armour_rating; dropped together with names by invalidate_item_name
+        self._item_ac: Dict[str, int] = {}
+        # Reverse index npc_id -> location_id, maintained by add_occupant/remove_occupant
+        self._npc_location: Dict[str, str] = {}
+        # Ids of NPCs carrying the dynamic "dead" tag, maintained by npc_died; see is_dead
+        self._dead_npcs: set = set()
+        # (loc_id, neighbor_id) -> static hex direction; rebuild_hex_dir_index after editing hex_connections
+        self._hex_dir_index: Dict[Tuple[str, str], str] = {}
+        # Lazily built lower-cased display name/id -> location ids; reset by invalidate_location_names
+        self._location_name_index: Optional[Dict[str, Tuple[str, ...]]] = None
+        # Bumped whenever locations, their names or their connections change; lets views cache the map
+        self.topology_version = 0
+        # id prefix -> next free numeric suffix for GM-spawned ids; seeded lazily in next_gm_index
+        self._gm_next_index: Dict[str, int] = {}
+        # event_type -> world mutator; apply_event dispatches through this table
+        self._apply_handlers = {
+            "move": self._apply_move,
+            "grab": self._apply_grab,
+            "drop": self._apply_drop,
+            "eat": self._apply_eat,
+            "damage_applied": self._apply_damage_applied,
+            "rest": self._apply_rest,
+            "equip": self._apply_equip,
+            "unequip": self._apply_unequip,
+            "give": self._apply_give,
+            "open_connection": self._apply_open_connection,
+            "close_connection": self._apply_close_connection,
+            "npc_died": self._apply_npc_died,
+            "reason": self._apply_reason,
+            "reflect": self._apply_reflect,
+        }
+        # ReasonTool operations in precedence order (the first one present is applied)
+        self._reason_ops = (
+            ("add_memory", self._reason_add_memory),
+            ("update_memory_status", self._reason_update_memory_status),
+            ("add_goal", self._reason_add_goal),
+            ("update_goal_status", self._reason_update_goal_status),
+            ("update_relationship", self._reason_update_relationship),
+        )
 
     def load(self):
-        self._load_npcs()
-        self._load_locations()
-        self._load_items()
+        # The three loaders are I/O bound and each fills only its own dicts, so their reads can overlap;
+        # every index/reconcile pass below runs serially once all of them have finished.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(self._load_npcs), pool.submit(self._load_locations), pool.submit(self._load_items)]
+            for future in futures:
+                future.result()
+        self.rebuild_hex_dir_index()
         # Hydrate dynamic connection directions from static hex layout for initial world
         try:
             self._hydrate_connection_directions()
         except Exception:
             # Non-fatal; renderer can still function with status-only edges
             pass
+        self.refresh_occupant_names()
+        self.refresh_neighbor_sets()
+        self.rebuild_npc_location_index()
+        self.rebuild_dead_index()
         # assign current_location for items based on location state
         for loc_id, state in self.locations_state.items():
             for item_id in state.items:
@@ -67,60 +336,37 @@ class WorldState:
                     inst.current_location = loc_id
         # Reconcile item ownership/location references across NPCs and locations.
         self._reconcile_item_references()
+        # Reconciliation edits items lists directly; derive name maps from the final lists
+        self.refresh_location_item_names()
+        self.refresh_equipment_cache()
+
+    def _load_section(self, section: str) -> List[Tuple[Any, Dict[str, Any]]]:
+        """(id, body) records for a data section: from a fresh pack if present, else per-file JSON."""
+        subdir, pattern = _PACK_SECTIONS[section]
+        source_dir = self.data_dir / subdir
+        pack_path = self.data_dir / PACK_DIR_NAME / f"{section}.jsonl"
+        if _pack_is_fresh(pack_path, source_dir, pattern):
+            try:
+                return _pack_records(pack_path)
+            except Exception:
+                # Corrupt or partial pack: fall back to the source files
+                pass
+        return _file_records(section, _json_files(source_dir, pattern))
 
     def _load_npcs(self):
-        npcs_dir = self.data_dir / "npcs"
-        for path in npcs_dir.glob("*.json"):
-            with open(path, "r") as f:
-                data = json.load(f)
+        for _, data in self._load_section("npcs"):
             if "next_available_tick" not in data:
                 data["next_available_tick"] = 0
             if "last_meal_tick" not in data:
                 data["last_meal_tick"] = 0
             if "hunger_stage" not in data:
                 data["hunger_stage"] = "sated"
-            # Coerce memory/goal/perception dicts into dataclasses when loading from JSON.
-            def _to_memory(raw):
-                if isinstance(raw, Memory):
-                    return raw
-                if isinstance(raw, dict):
-                    return Memory(
-                        text=str(raw.get("text", "")),
-                        tick=int(raw.get("tick", 0) or 0),
-                        priority=str(raw.get("priority", "normal")),
-                        status=str(raw.get("status", "active")),
-                        source_id=raw.get("source_id"),
-                        confidence=float(raw.get("confidence", 1.0)),
-                        is_secret=bool(raw.get("is_secret", False)),
-                        payload=dict(raw.get("payload", {})) if isinstance(raw.get("payload", {}), dict) else {},
-                    )
-                return Memory(text=str(raw))
-            def _to_goal(raw):
-                if isinstance(raw, Goal):
-                    return raw
-                if isinstance(raw, dict):
-                    return Goal(
-                        text=str(raw.get("text", "")),
-                        type=str(raw.get("type", "note")),
-                        priority=str(raw.get("priority", "normal")),
-                        status=str(raw.get("status", "active")),
-                        payload=dict(raw.get("payload", {})) if isinstance(raw.get("payload", {}), dict) else {},
-                        expiry_tick=int(raw.get("expiry_tick")) if raw.get("expiry_tick") is not None else None,
-                    )
-                return Goal(text=str(raw))
-            def _to_perception(raw):
-                if isinstance(raw, PerceptionEvent):
-                    return raw
-                if isinstance(raw, dict):
-                    return PerceptionEvent(
-                        event_type=str(raw.get("event_type", raw.get("type", "generic"))),
-                        tick=int(raw.get("tick", 0) or 0),
-                        actor_id=raw.get("actor_id"),
-                        target_ids=list(raw.get("target_ids", []) or []),
-                        location_id=raw.get("location_id"),
-                        payload=dict(raw.get("payload", {})) if isinstance(raw.get("payload", {}), dict) else {},
-                    )
-                return PerceptionEvent(event_type="generic", payload={"raw": raw})
+            if "id" in data:
+                data["id"] = _intern_id(data["id"])
+            if isinstance(data.get("inventory"), (list, dict)):
+                data["inventory"] = dict.fromkeys(_intern_ids(data["inventory"]))
+            if isinstance(data.get("slots"), dict):
+                data["slots"] = {slot: _intern_id(i) for slot, i in data["slots"].items()}
             if isinstance(data.get("memories"), list):
                 data["memories"] = [_to_memory(m) for m in data["memories"]]
             if isinstance(data.get("core_memories"), list):
@@ -133,15 +379,27 @@ class WorldState:
             self.npcs[npc.id] = npc
 
     def _load_locations(self):
-        loc_dir = self.data_dir / "locations"
-        for path in loc_dir.glob("*_static.json"):
-            with open(path, "r") as f:
-                data = json.load(f)
+        for _, data in self._load_section("locations_static"):
+            if "id" in data:
+                data["id"] = _intern_id(data["id"])
+            if isinstance(data.get("hex_connections"), dict):
+                # Direction codes are interned too: they key the hex index and match the canonical literals
+                data["hex_connections"] = {_intern_id(d): _intern_id(nb) for d, nb in data["hex_connections"].items()}
             loc = LocationStatic(**data)
             self.locations_static[loc.id] = loc
-        for path in loc_dir.glob("*_state.json"):
-            with open(path, "r") as f:
-                data = json.load(f)
+        for _, data in self._load_section("locations_state"):
+            if "id" in data:
+                data["id"] = _intern_id(data["id"])
+            for key in ("occupants", "items"):
+                if isinstance(data.get(key), list):
+                    data[key] = _intern_ids(data[key])
+            if isinstance(data.get("connections_state"), dict):
+                conns = {}
+                for nb, meta in data["connections_state"].items():
+                    if isinstance(meta, dict) and "direction" in meta:
+                        meta["direction"] = _intern_id(meta["direction"])
+                    conns[_intern_id(nb)] = meta
+                data["connections_state"] = conns
             loc = LocationState(**data)
             self.locations_state[loc.id] = loc
         # Ensure every static location has a matching dynamic state entry.
@@ -177,27 +435,21 @@ class WorldState:
                     if "status" not in recip_entry:
                         recip_entry["status"] = entry.get("status", "open")
                     if "direction" not in recip_entry:
-                        inv = HEX_DIR_INVERSE.get(dir_key)
+                        inv = inverse_direction(dir_key)
                         if inv:
                             recip_entry["direction"] = inv
 
     def _load_items(self):
-        items_dir = self.data_dir / "items"
-        catalog_path = items_dir / "catalog.json"
-        if catalog_path.exists():
-            with open(catalog_path, "r") as f:
-                catalog = json.load(f)
-            for item_id, data in catalog.items():
-                blueprint = ItemBlueprint(id=item_id, **data)
-                self.item_blueprints[blueprint.id] = blueprint
-
-        instances_dir = items_dir / "instances"
-        if instances_dir.exists():
-            for path in instances_dir.glob("*.json"):
-                with open(path, "r") as f:
-                    data = json.load(f)
-                instance = ItemInstance(**data)
-                self.item_instances[instance.id] = instance
+        for item_id, data in self._load_section("items_catalog"):
+            blueprint = ItemBlueprint(id=_intern_id(item_id), **data)
+            self.item_blueprints[blueprint.id] = blueprint
+
+        for _, data in self._load_section("items_instances"):
+            for key in ("id", "blueprint_id", "current_location", "owner_id"):
+                if key in data:
+                    data[key] = _intern_id(data[key])
+            instance = ItemInstance(**data)
+            self.item_instances[instance.id] = instance
 
     def _reconcile_item_references(self):
         """Ensure item instances, NPC inventories/slots, and location items are consistent."""
@@ -217,7 +469,7 @@ class WorldState:
                 # Equipped items should not remain in inventory.
                 try:
                     if item_id in npc.inventory:
-                        npc.inventory.remove(item_id)
+                        npc.inventory.pop(item_id, None)
                 except Exception:
                     pass
         # Ensure inventory ownership is reflected on instances.
@@ -227,22 +479,28 @@ class WorldState:
                 if inst:
                     inst.owner_id = npc.id
                     inst.current_location = None
+        # Index which locations list each item once, instead of scanning every location per item.
+        listed_in: Dict[str, List[LocationState]] = {}
+        for loc in self.locations_state.values():
+            for item_id in loc.items:
+                locs = listed_in.setdefault(item_id, [])
+                if not locs or locs[-1] is not loc:
+                    locs.append(loc)
         # Ensure item instances placed in locations appear in LocationState.items.
         for item_id, inst in self.item_instances.items():
             if inst.owner_id:
                 # Owned items should not be listed in location items.
-                for loc in self.locations_state.values():
+                for loc in listed_in.get(item_id, ()):
                     try:
-                        if item_id in loc.items:
-                            loc.items.remove(item_id)
+                        loc.items.remove(item_id)
                     except Exception:
                         pass
                 continue
             if inst.current_location:
-                loc_state = self.locations_state.setdefault(
-                    inst.current_location, LocationState(id=inst.current_location)
-                )
-                if item_id not in loc_state.items:
+                loc_state = self.locations_state.get(inst.current_location)
+                if loc_state is None:
+                    loc_state = self.locations_state[inst.current_location] = LocationState(id=inst.current_location)
+                if not any(loc is loc_state for loc in listed_in.get(item_id, ())):
                     loc_state.items.append(item_id)
 
     def get_npc(self, npc_id: str) -> NPC:
@@ -260,375 +518,617 @@ class WorldState:
     def get_item_blueprint(self, blueprint_id: str) -> ItemBlueprint:
         return self.item_blueprints[blueprint_id]
 
-    def find_npc_location(self, npc_id: str) -> Optional[str]:
+    def invalidate_item_name(self, item_id: Optional[str] = None) -> None:
+        """Forget a cached item name and armour rating, or all of them (e.g. after a blueprint edit)."""
+        if item_id is None:
+            self._item_name_cache.clear()
+            self._item_ac.clear()
+            for st in self.locations_state.values():
+                st._item_names.clear()
+        else:
+            self._item_name_cache.pop(item_id, None)
+            self._item_ac.pop(item_id, None)
+            # A dropped entry leaves the location's name map short, which readers resync on
+            inst = self.item_instances.get(item_id)
+            st = self.locations_state.get(inst.current_location) if inst and inst.current_location else None
+            if st is not None:
+                st._item_names.pop(item_id, None)
+
+    def add_location_item(self, loc_id: str, item_id: str) -> None:
+        """Place item_id in a location's items, keeping the location's item name map in sync."""
+        st = self.locations_state.get(loc_id)
+        if st is None:
+            st = self.locations_state[loc_id] = LocationState(id=loc_id)
+        # Resolve the name before touching items so the list and the name map change together
+        name = self._item_name_cache[item_id]
+        # The name map's keys mirror items, so it doubles as an O(1) membership set
+        if item_id not in st._item_names:
+            st.items.append(item_id)
+        st._item_names[item_id] = name
+
+    def remove_location_item(self, loc_id: str, item_id: str) -> bool:
+        st = self.locations_state.get(loc_id)
+        if st is None:
+            return False
+        try:
+            st.items.remove(item_id)
+        except ValueError:
+            return False
+        st._item_names.pop(item_id, None)
+        return True
+
+    def refresh_location_item_names(self, loc_id: Optional[str] = None) -> None:
+        """Rebuild item name maps for one location (or all) from items lists."""
+        name_of = self._item_name_cache.__getitem__
+        targets = [loc_id] if loc_id is not None else list(self.locations_state.keys())
+        for lid in targets:
+            st = self.locations_state.get(lid)
+            if st is None:
+                continue
+            st._item_names = {item_id: name_of(item_id) for item_id in st.items}
+
+    def add_occupant(self, loc_id: str, npc_id: str) -> None:
+        """Place npc_id in a location's occupants, keeping derived caches in sync."""
+        st = self.locations_state.get(loc_id)
+        if st is None:
+            st = self.locations_state[loc_id] = LocationState(id=loc_id)
+        # The occupant name map's keys mirror occupants, so it doubles as an O(1) membership set
+        if npc_id not in st._occupant_names:
+            st.occupants.append(npc_id)
+        self._npc_location[npc_id] = loc_id
+        npc = self.npcs.get(npc_id)
+        st._occupant_names[npc_id] = npc.name if npc else npc_id
+
+    def remove_occupant(self, loc_id: str, npc_id: str) -> None:
+        st = self.locations_state.get(loc_id)
+        if st is None:
+            return
+        try:
+            st.occupants.remove(npc_id)
+        except ValueError:
+            pass
+        st._occupant_names.pop(npc_id, None)
+        if self._npc_location.get(npc_id) == loc_id:
+            del self._npc_location[npc_id]
+
+    def refresh_occupant_names(self, loc_id: Optional[str] = None) -> None:
+        """Rebuild occupant name caches for one location (or all) from occupants lists."""
+        targets = [loc_id] if loc_id is not None else list(self.locations_state.keys())
+        for lid in targets:
+            st = self.locations_state.get(lid)
+            if st is None:
+                continue
+            names: Dict[str, str] = {}
+            for npc_id in st.occupants:
+                npc = self.npcs.get(npc_id)
+                names[npc_id] = npc.name if npc else npc_id
+            st._occupant_names = names
+
+    def refresh_neighbor_sets(self, *loc_ids: str) -> None:
+        """
+        Rebuild open/closed neighbor sets from connections_state for the given locations (or all).
+        Edges to locations without a LocationState are left out, so membership alone validates a target.
+        """
+        self.topology_version += 1
+        states = self.locations_state
+        for lid in (loc_ids or list(states.keys())):
+            st = states.get(lid)
+            if st is None:
+                continue
+            open_ids = []
+            closed_ids = []
+            for nb, meta in (st.connections_state or {}).items():
+                if nb not in states:
+                    continue
+                if (meta or {}).get("status", "open") == "open":
+                    open_ids.append(nb)
+                else:
+                    closed_ids.append(nb)
+            st._open_neighbors = frozenset(open_ids)
+            st._closed_neighbors = frozenset(closed_ids)
+
+    def item_blueprint_of(self, item_id: Optional[str]) -> Optional[ItemBlueprint]:
+        """Blueprint of an item instance; None for empty slots and unknown items."""
+        inst = self.item_instances.get(item_id) if item_id else None
+        if inst is None:
+            return None
+        return self.item_blueprints.get(inst.blueprint_id)
+
+    def item_armour_rating(self, item_id: Optional[str]) -> int:
+        """armour_rating of an item instance's blueprint; 0 for empty slots and unknown items."""
+        if not item_id:
+            return 0
+        rating = self._item_ac.get(item_id)
+        if rating is None:
+            bp = self.item_blueprint_of(item_id)
+            rating = (getattr(bp, "armour_rating", 0) or 0) if bp else 0
+            # Only cache resolvable items so an instance spawned later is not pinned at 0
+            if bp is not None:
+                self._item_ac[item_id] = rating
+        return rating
+
+    def refresh_equipment_cache(self, npc_id: Optional[str] = None) -> None:
+        """Recompute the cached armour bonus and main-hand blueprint for one NPC (or all) from its slots."""
+        if npc_id is None:
+            npcs = list(self.npcs.values())
+        else:
+            npcs = [self.npcs[npc_id]] if npc_id in self.npcs else []
+        for npc in npcs:
+            npc.ac_bonus = sum(self.item_armour_rating(i) for i in npc.slots.values())
+            npc.mainhand_bp = self.item_blueprint_of(npc.slots.get("main_hand"))
+
+    def rebuild_hex_dir_index(self) -> None:
+        """Recompute the (loc_id, neighbor_id) -> direction index from static hex_connections."""
+        self.topology_version += 1
+        index: Dict[Tuple[str, str], str] = {}
+        for loc_id, static in self.locations_static.items():
+            for d, nb in (getattr(static, "hex_connections", {}) or {}).items():
+                # First direction listed for a neighbor wins, as with a linear scan
+                index.setdefault((loc_id, nb), d)
+        self._hex_dir_index = index
+
+    def invalidate_location_names(self) -> None:
+        """Drop the location name index after locations are created, deleted or renamed."""
+        self._location_name_index = None
+        self.topology_version += 1
+
+    def location_ids_for_name(self, text: str) -> Tuple[str, ...]:
+        """Ids of locations whose lower-cased display name (name, else description) or id equals text.lower()."""
+        index = self._location_name_index
+        if index is None:
+            lists: Dict[str, List[str]] = {}
+            for lid, st in self.locations_static.items():
+                display = getattr(st, "name", None) or getattr(st, "description", None) or lid
+                for key in {str(display).lower(), str(lid).lower()}:
+                    lists.setdefault(key, []).append(lid)
+            index = self._location_name_index = {k: tuple(v) for k, v in lists.items()}
+        return index.get(text.lower(), ())
+
+    def hex_direction(self, loc_id: str, neighbor_id: str) -> Optional[str]:
+        """Static hex direction from loc_id to neighbor_id, or None if they are not hex neighbors."""
+        return self._hex_dir_index.get((loc_id, neighbor_id))
+
+    def rebuild_npc_location_index(self) -> None:
+        """Recompute the npc -> location reverse index from occupants lists."""
+        index: Dict[str, str] = {}
         for loc_id, loc in self.locations_state.items():
-            if npc_id in loc.occupants:
-                return loc_id
-        return None
+            for npc_id in loc.occupants:
+                index.setdefault(npc_id, loc_id)
+        self._npc_location = index
+
+    def rebuild_dead_index(self) -> None:
+        """Recompute the set of dead NPC ids from their dynamic tags."""
+        self._dead_npcs = {
+            npc_id for npc_id, npc in self.npcs.items()
+            if "dead" in (npc.tags.get("dynamic") or ())
+        }
+
+    def is_dead(self, npc_id: str) -> bool:
+        return npc_id in self._dead_npcs
+
+    def find_npc_location(self, npc_id: str) -> Optional[str]:
+        return self._npc_location.get(npc_id)
+
+    def forget_npc(self, npc_id: str) -> None:
+        """Drop an NPC record together with its location and death index entries."""
+        self.npcs.pop(npc_id, None)
+        self._npc_location.pop(npc_id, None)
+        self._dead_npcs.discard(npc_id)
+
+    def item_name(self, item_id: str) -> str:
+        return self._item_name_cache[item_id]
+
+    def location_item_names(self, loc_id: str) -> Dict[str, str]:
+        """item_id -> display name for the items lying in a location (read-only view)."""
+        st = self.locations_state.get(loc_id)
+        if st is None:
+            return {}
+        if len(st._item_names) != len(st.items):
+            # Items were edited outside add_location_item/remove_location_item; resync once
+            self.refresh_location_item_names(loc_id)
+        return st._item_names
+
+    def location_occupant_names(self, loc_id: str) -> Dict[str, str]:
+        """npc_id -> display name for a location's occupants (read-only view)."""
+        st = self.locations_state.get(loc_id)
+        if st is None:
+            return {}
+        if len(st._occupant_names) != len(st.occupants):
+            # Occupants were edited outside add_occupant/remove_occupant; resync once
+            self.refresh_occupant_names(loc_id)
+        return st._occupant_names
+
+    def open_neighbors(self, loc_id: Optional[str]) -> FrozenSet[str]:
+        st = self.locations_state.get(loc_id)
+        return st._open_neighbors if st is not None else frozenset()
+
+    def closed_neighbors(self, loc_id: Optional[str]) -> FrozenSet[str]:
+        st = self.locations_state.get(loc_id)
+        return st._closed_neighbors if st is not None else frozenset()
 
     def update_hunger(self, current_tick: int) -> list[Event]:
-        HUNGRY_THRESHOLD = 20
-        STARVING_THRESHOLD = 40
+        # Compare last_meal_tick against per-tick cutoffs instead of subtracting per NPC
+        starving_cutoff = current_tick - STARVING_THRESHOLD
+        hungry_cutoff = current_tick - HUNGRY_THRESHOLD
+        dead = self._dead_npcs
         events: list[Event] = []
-        for npc in self.npcs.values():
-            if "dead" in npc.tags.get("dynamic", []):
+        for npc_id, npc in self.npcs.items():
+            if npc_id in dead:
                 continue
-            ticks_since = current_tick - npc.last_meal_tick
-            if ticks_since >= STARVING_THRESHOLD:
-                npc.hunger_stage = "starving"
+            last_meal = npc.last_meal_tick
+            if last_meal <= starving_cutoff:
+                stage = "starving"
                 events.append(
                     Event(
                         event_type="damage_applied",
                         tick=current_tick,
                         actor_id=npc.id,
-                        target_ids=[npc.id],
+                        target_ids=(npc.id,),
                         payload={"amount": 1, "damage_type": "starvation"},
                     )
                 )
-            elif ticks_since >= HUNGRY_THRESHOLD:
-                npc.hunger_stage = "hungry"
+            elif last_meal <= hungry_cutoff:
+                stage = "hungry"
             else:
-                npc.hunger_stage = "sated"
+                stage = "sated"
+            # Most NPCs stay in the same stage from tick to tick; skip the redundant write
+            if npc.hunger_stage != stage:
+                npc.hunger_stage = stage
         return events
 
+    def next_starvation_tick(self) -> Optional[int]:
+        """Earliest tick at which update_hunger would emit starvation damage, or None if no NPC is alive."""
+        dead = self._dead_npcs
+        meals = [npc.last_meal_tick for npc_id, npc in self.npcs.items() if npc_id not in dead]
+        return min(meals) + STARVING_THRESHOLD if meals else None
+
+    def next_gm_index(self, prefix: str, taken: Dict[str, Any]) -> int:
+        """Reserve the next numeric suffix n such that f"{prefix}{n}" is not a key of taken.
+
+        The first call per prefix seeds the counter past the highest suffix already present; later
+        calls are O(1) instead of rescanning from 1.
+        """
+        idx = self._gm_next_index.get(prefix)
+        if idx is None:
+            plen = len(prefix)
+            idx = 1 + max(
+                (int(key[plen:]) for key in taken if key.startswith(prefix) and key[plen:].isdigit()),
+                default=0,
+            )
+        while f"{prefix}{idx}" in taken:
+            idx += 1
+        self._gm_next_index[prefix] = idx + 1
+        return idx
+
     def apply_event(self, event):
-        if event.event_type == "move":
-            actor_id = event.actor_id
-            target = (event.target_ids[0] if event.target_ids else None)
-            if not target:
-                return
-            current_loc = self.find_npc_location(actor_id)
-            if current_loc and actor_id in self.locations_state.get(current_loc, LocationState(id=current_loc, occupants=[], items=[], sublocations=[], transient_effects=[], connections_state={})).occupants:
-                try:
-                    self.locations_state[current_loc].occupants.remove(actor_id)
-                except ValueError:
-                    pass
-            self.locations_state.setdefault(target, LocationState(id=target, occupants=[], items=[], sublocations=[], transient_effects=[], connections_state={})).occupants.append(actor_id)
-        elif event.event_type == "grab":
-            actor_id = event.actor_id
-            item_id = event.target_ids[0]
-            loc_id = self.find_npc_location(actor_id)
-            if loc_id and item_id in self.locations_state[loc_id].items:
-                self.locations_state[loc_id].items.remove(item_id)
-                self.npcs[actor_id].inventory.append(item_id)
-                inst = self.item_instances.get(item_id)
-                if inst:
-                    inst.owner_id = actor_id
-                    inst.current_location = None
-        elif event.event_type == "drop":
-            actor_id = event.actor_id
-            item_id = event.target_ids[0]
-            loc_id = self.find_npc_location(actor_id)
-            if loc_id and item_id in self.npcs[actor_id].inventory:
-                self.npcs[actor_id].inventory.remove(item_id)
-                self.locations_state[loc_id].items.append(item_id)
+        # One dict lookup on the interned event type instead of walking an if/elif chain
+        handler = self._apply_handlers.get(event.event_type)
+        if handler is not None:
+            handler(event)
+
+    def _apply_move(self, event):
+        actor_id = event.actor_id
+        target = (event.target_ids[0] if event.target_ids else None)
+        if not target:
+            return
+        current_loc = self._npc_location.get(actor_id)
+        # Plain get: no throwaway default LocationState; add_occupant creates a missing target lazily
+        state = self.locations_state.get(current_loc) if current_loc else None
+        if state is not None and actor_id in state._occupant_names:
+            self.remove_occupant(current_loc, actor_id)
+        self.add_occupant(target, actor_id)
+
+    def _apply_grab(self, event):
+        actor_id = event.actor_id
+        item_id = event.target_ids[0]
+        loc_id = self._npc_location.get(actor_id)
+        if loc_id and self.remove_location_item(loc_id, item_id):
+            self.npcs[actor_id].inventory[item_id] = None
+            inst = self.item_instances.get(item_id)
+            if inst:
+                inst.owner_id = actor_id
+                inst.current_location = None
+
+    def _apply_drop(self, event):
+        actor_id = event.actor_id
+        item_id = event.target_ids[0]
+        loc_id = self._npc_location.get(actor_id)
+        if loc_id and item_id in self.npcs[actor_id].inventory:
+            self.npcs[actor_id].inventory.pop(item_id, None)
+            self.add_location_item(loc_id, item_id)
+            inst = self.item_instances.get(item_id)
+            if inst:
+                inst.owner_id = None
+                inst.current_location = loc_id
+
+    def _apply_eat(self, event):
+        actor_id = event.actor_id
+        item_id = event.target_ids[0]
+        npc = self.npcs.get(actor_id)
+        if npc and item_id in npc.inventory:
+            npc.inventory.pop(item_id, None)
+            self.item_instances.pop(item_id, None)
+            self._item_name_cache.pop(item_id, None)
+            npc.last_meal_tick = event.tick
+            npc.hunger_stage = "sated"
+
+    def _apply_damage_applied(self, event):
+        target_id = event.target_ids[0]
+        # Corpses take no further damage (e.g. starvation queued in the tick a fatal hit landed)
+        if target_id in self._dead_npcs:
+            return
+        amount = event.payload.get("amount", 0)
+        npc = self.npcs.get(target_id)
+        if npc:
+            npc.hp = max(npc.hp - amount, 0)
+
+    def _apply_rest(self, event):
+        actor_id = event.actor_id
+        healed = event.payload.get("healed", 0)
+        npc = self.npcs.get(actor_id)
+        if npc:
+            # Compute a deterministic max HP from constitution; default constitution=10.
+            constitution = npc.attributes.get("constitution", 10)
+            max_hp = max(1, constitution * 2)
+            npc.hp = min(npc.hp + healed, max_hp)
+
+    def _apply_equip(self, event):
+        actor_id = event.actor_id
+        item_id = event.target_ids[0]
+        slot = event.payload.get("slot")
+        npc = self.npcs.get(actor_id)
+        if npc and slot in npc.slots and item_id in npc.inventory:
+            current = npc.slots.get(slot)
+            if current:
+                npc.inventory[current] = None
+            npc.inventory.pop(item_id, None)
+            npc.slots[slot] = item_id
+            npc.ac_bonus += self.item_armour_rating(item_id) - self.item_armour_rating(current)
+            if slot == "main_hand":
+                npc.mainhand_bp = self.item_blueprint_of(item_id)
+
+    def _apply_unequip(self, event):
+        actor_id = event.actor_id
+        slot = event.payload.get("slot")
+        npc = self.npcs.get(actor_id)
+        if npc and slot in npc.slots and npc.slots.get(slot):
+            item_id = npc.slots[slot]
+            npc.inventory[item_id] = None
+            npc.slots[slot] = None
+            npc.ac_bonus -= self.item_armour_rating(item_id)
+            if slot == "main_hand":
+                npc.mainhand_bp = None
+
+    def _apply_give(self, event):
+        actor_id = event.actor_id
+        # Prefer structured payload, fallback to target_ids for backward compatibility
+        payload = event.payload or {}
+        target_ids = event.target_ids or []
+        item_id = payload.get("item_id") or (target_ids[0] if target_ids else None)
+        target_id = payload.get("recipient_id") or (target_ids[1] if len(target_ids) > 1 else None)
+        if not item_id or not target_id:
+            return
+        giver = self.npcs.get(actor_id)
+        receiver = self.npcs.get(target_id)
+        if giver and receiver and item_id in giver.inventory:
+            giver.inventory.pop(item_id, None)
+            receiver.inventory[item_id] = None
+            inst = self.item_instances.get(item_id)
+            if inst:
+                inst.owner_id = target_id
+
+    def _apply_open_connection(self, event):
+        actor_loc = self._npc_location.get(event.actor_id)
+        target = event.target_ids[0]
+        if actor_loc:
+            fr = self.locations_state[actor_loc].connections_state.setdefault(target, {})
+            to = self.locations_state[target].connections_state.setdefault(actor_loc, {})
+            fr["status"] = "open"
+            to["status"] = "open"
+            self.refresh_neighbor_sets(actor_loc, target)
+            # Preserve existing directions; if missing, attempt to infer from static layout
+            try:
+                if "direction" not in fr:
+                    d = self._hex_dir_index.get((actor_loc, target))
+                    if d is not None:
+                        fr["direction"] = d
+                if "direction" not in to:
+                    # Inverse of the forward direction if available
+                    inv = inverse_direction(fr.get("direction"))
+                    if inv:
+                        to["direction"] = inv
+                # If only the reverse has a direction, infer the forward
+                if "direction" not in fr and "direction" in to:
+                    inv = inverse_direction(to.get("direction"))
+                    if inv:
+                        fr["direction"] = inv
+            except Exception:
+                pass
+
+    def _apply_close_connection(self, event):
+        actor_loc = self._npc_location.get(event.actor_id)
+        target = event.target_ids[0]
+        if actor_loc:
+            fr = self.locations_state[actor_loc].connections_state.setdefault(target, {})
+            to = self.locations_state[target].connections_state.setdefault(actor_loc, {})
+            fr["status"] = "closed"
+            to["status"] = "closed"
+            self.refresh_neighbor_sets(actor_loc, target)
+            # Preserve or infer directions to avoid drift
+            try:
+                if "direction" not in fr and "direction" in to:
+                    inv = inverse_direction(to.get("direction"))
+                    if inv:
+                        fr["direction"] = inv
+                if "direction" not in to and "direction" in fr:
+                    inv = inverse_direction(fr.get("direction"))
+                    if inv:
+                        to["direction"] = inv
+            except Exception:
+                pass
+
+    def _apply_npc_died(self, event):
+        npc = self.npcs.get(event.actor_id)
+        if not npc:
+            return
+        if npc.id in self._dead_npcs:
+            return
+        loc_id = self._npc_location.get(npc.id)
+        if loc_id and npc.id in self.locations_state[loc_id]._occupant_names:
+            self.remove_occupant(loc_id, npc.id)
+            # Drop inventory and equipped items
+            all_items = list(npc.inventory)
+            for slot, item_id in npc.slots.items():
+                if item_id:
+                    all_items.append(item_id)
+                    npc.slots[slot] = None
+            npc.ac_bonus = 0
+            npc.mainhand_bp = None
+            for item_id in all_items:
+                self.add_location_item(loc_id, item_id)
                 inst = self.item_instances.get(item_id)
                 if inst:
                     inst.owner_id = None
                     inst.current_location = loc_id
-        elif event.event_type == "eat":
-            actor_id = event.actor_id
-            item_id = event.target_ids[0]
-            npc = self.npcs.get(actor_id)
-            if npc and item_id in npc.inventory:
-                npc.inventory.remove(item_id)
-                self.item_instances.pop(item_id, None)
-                npc.last_meal_tick = event.tick
-                npc.hunger_stage = "sated"
-        elif event.event_type == "damage_applied":
-            target_id = event.target_ids[0]
-            amount = event.payload.get("amount", 0)
-            npc = self.npcs.get(target_id)
-            if npc:
-                npc.hp = max(npc.hp - amount, 0)
-        elif event.event_type == "rest":
-            actor_id = event.actor_id
-            healed = event.payload.get("healed", 0)
-            npc = self.npcs.get(actor_id)
-            if npc:
-                # Compute a deterministic max HP from constitution; default constitution=10.
-                constitution = npc.attributes.get("constitution", 10)
-                max_hp = max(1, constitution * 2)
-                npc.hp = min(npc.hp + healed, max_hp)
-        elif event.event_type == "equip":
-            actor_id = event.actor_id
-            item_id = event.target_ids[0]
-            slot = event.payload.get("slot")
-            npc = self.npcs.get(actor_id)
-            if npc and slot in npc.slots and item_id in npc.inventory:
-                current = npc.slots.get(slot)
-                if current:
-                    npc.inventory.append(current)
-                npc.inventory.remove(item_id)
-                npc.slots[slot] = item_id
-        elif event.event_type == "unequip":
-            actor_id = event.actor_id
-            slot = event.payload.get("slot")
-            npc = self.npcs.get(actor_id)
-            if npc and slot in npc.slots and npc.slots.get(slot):
-                item_id = npc.slots[slot]
-                npc.inventory.append(item_id)
-                npc.slots[slot] = None
-        elif event.event_type == "give":
-            actor_id = event.actor_id
-            # Prefer structured payload, fallback to target_ids for backward compatibility
-            payload = event.payload or {}
-            target_ids = event.target_ids or []
-            item_id = payload.get("item_id") or (target_ids[0] if target_ids else None)
-            target_id = payload.get("recipient_id") or (target_ids[1] if len(target_ids) > 1 else None)
-            if not item_id or not target_id:
-                return
-            giver = self.npcs.get(actor_id)
-            receiver = self.npcs.get(target_id)
-            if giver and receiver and item_id in giver.inventory:
-                try:
-                    giver.inventory.remove(item_id)
-                except ValueError:
-                    pass
-                receiver.inventory.append(item_id)
-                inst = self.item_instances.get(item_id)
-                if inst:
-                    inst.owner_id = target_id
-        elif event.event_type == "open_connection":
-            actor_loc = self.find_npc_location(event.actor_id)
-            target = event.target_ids[0]
-            if actor_loc:
-                fr = self.locations_state[actor_loc].connections_state.setdefault(target, {})
-                to = self.locations_state[target].connections_state.setdefault(actor_loc, {})
-                fr["status"] = "open"
-                to["status"] = "open"
-                # Preserve existing directions; if missing, attempt to infer from static layout
-                try:
-                    if "direction" not in fr:
-                        static = self.locations_static.get(actor_loc)
-                        if static:
-                            for d, nb in (getattr(static, "hex_connections", {}) or {}).items():
-                                if nb == target:
-                                    fr["direction"] = d
-                                    break
-                    if "direction" not in to:
-                        # Inverse of the forward direction if available
-                        fdir = fr.get("direction")
-                        if isinstance(fdir, str):
-                            inv = HEX_DIR_INVERSE.get(fdir)
-                            if inv:
-                                to["direction"] = inv
-                    # If only the reverse has a direction, infer the forward
-                    if "direction" not in fr and "direction" in to:
-                        tdir = to.get("direction")
-                        if isinstance(tdir, str):
-                            inv = HEX_DIR_INVERSE.get(tdir)
-                            if inv:
-                                fr["direction"] = inv
-                except Exception:
-                    pass
-        elif event.event_type == "close_connection":
-            actor_loc = self.find_npc_location(event.actor_id)
-            target = event.target_ids[0]
-            if actor_loc:
-                fr = self.locations_state[actor_loc].connections_state.setdefault(target, {})
-                to = self.locations_state[target].connections_state.setdefault(actor_loc, {})
-                fr["status"] = "closed"
-                to["status"] = "closed"
-                # Preserve or infer directions to avoid drift
-                try:
-                    if "direction" not in fr and "direction" in to:
-                        tdir = to.get("direction")
-                        if isinstance(tdir, str):
-                            inv = HEX_DIR_INVERSE.get(tdir)
-                            if inv:
-                                fr["direction"] = inv
-                    if "direction" not in to and "direction" in fr:
-                        fdir = fr.get("direction")
-                        if isinstance(fdir, str):
-                            inv = HEX_DIR_INVERSE.get(fdir)
-                            if inv:
-                                to["direction"] = inv
-                except Exception:
-                    pass
-        elif event.event_type == "npc_died":
-            npc = self.npcs.get(event.actor_id)
-            if not npc:
-                return
-            if "dead" in npc.tags.get("dynamic", []):
-                return
-            loc_id = self.find_npc_location(npc.id)
-            if loc_id and npc.id in self.locations_state[loc_id].occupants:
-                self.locations_state[loc_id].occupants.remove(npc.id)
-                # Drop inventory and equipped items
-                all_items = list(npc.inventory)
-                for slot, item_id in npc.slots.items():
-                    if item_id:
-                        all_items.append(item_id)
-                        npc.slots[slot] = None
-                for item_id in all_items:
-                    self.locations_state[loc_id].items.append(item_id)
-                    inst = self.item_instances.get(item_id)
-                    if inst:
-                        inst.owner_id = None
-                        inst.current_location = loc_id
-                npc.inventory.clear()
-            # Mark as dead
-            if "dead" not in npc.tags.get("dynamic", []):
-                npc.tags.setdefault("dynamic", []).append("dead")
-        elif event.event_type == "reason":
-            # Deterministic handler for ReasonTool outcomes with a strict allowlist.
-            actor_id = event.actor_id
-            npc = self.npcs.get(actor_id)
-            if not npc:
-                return
-            desired = (event.payload or {}).get("desired_outcome") or {}
-            # Resolve which operation is requested
-            if "add_memory" in desired and isinstance(desired["add_memory"], dict):
-                data = desired["add_memory"]
-                # Build Memory with defaults and safe coercions
-                mem = Memory(
-                    text=str(data.get("text", ""))[:1000],
-                    tick=int(event.tick),
-                    priority=str(data.get("priority", "normal")),
-                    status=str(data.get("status", "active")),
-                    source_id=str(data.get("source_id")) if data.get("source_id") is not None else None,
-                    confidence=float(data.get("confidence", 1.0)),
-                    is_secret=bool(data.get("is_secret", False)),
-                    payload=dict(data.get("payload", {})) if isinstance(data.get("payload", dict)) else {},
-                )
-                npc.memories.append(mem)
-                # Keep a soft cap to prevent runaway growth (archival policy later)
-                if len(npc.memories) > 1000:
-                    # Archive oldest 50
-                    for old in npc.memories[:50]:
-                        try:
-                            old.status = "archived"
-                        except Exception:
-                            pass
-            elif "update_memory_status" in desired and isinstance(desired["update_memory_status"], dict):
-                data = desired["update_memory_status"]
-                match_text = str(data.get("match_text", "")).lower()
-                new_status = str(data.get("new_status", "active"))
-                # Update the first matching memory by substring in text or payload text
-                for m in npc.memories:
-                    try:
-                        hay = (m.text or "").lower()
-                        if match_text and match_text in hay:
-                            m.status = new_status
-                            break
-                    except Exception:
-                        # Legacy dict memory
-                        if isinstance(m, dict):
-                            hay = json.dumps(m, ensure_ascii=False).lower()
-                            if match_text and match_text in hay:
-                                m["status"] = new_status
-                                break
-                        continue
-            elif "add_goal" in desired and isinstance(desired["add_goal"], dict):
-                data = desired["add_goal"]
-                goal = Goal(
-                    text=str(data.get("text", ""))[:500],
-                    type=str(data.get("type", "note")),
-                    priority=str(data.get("priority", "normal")),
-                    status=str(data.get("status", "active")),
-                    payload=dict(data.get("payload", {})) if isinstance(data.get("payload", dict)) else {},
-                    expiry_tick=int(data.get("expiry_tick")) if data.get("expiry_tick") is not None else None,
-                )
-                npc.goals.append(goal)
-                # Optional: cap goals length
-                if len(npc.goals) > 100:
-                    npc.goals = npc.goals[-100:]
-            elif "update_goal_status" in desired and isinstance(desired["update_goal_status"], dict):
-                data = desired["update_goal_status"]
-                match_text = str(data.get("match_text", "")).lower()
-                new_status = str(data.get("new_status", "active"))
-                for g in npc.goals:
-                    try:
-                        if match_text and match_text in (g.text or "").lower():
-                            g.status = new_status
-                            break
-                    except Exception:
-                        # Legacy dict fallback
-                        if isinstance(g, dict):
-                            txt = str(g.get("text", "")).lower()
-                            if match_text and match_text in txt:
-                                g["status"] = new_status
-                                break
-                        continue
-            elif "update_relationship" in desired and isinstance(desired["update_relationship"], dict):
-                data = desired["update_relationship"]
-                target_id = str(data.get("target_id", ""))
-                new_status = str(data.get("new_status", ""))
-                if target_id:
-                    npc.relationships[target_id] = new_status
-            # All other mutations (hp, inventory, slots, movement) are forbidden by design.
-        elif event.event_type == "reflect":
-            # Deterministic handler for ReflectTool outcomes.
-            actor_id = event.actor_id
-            npc = self.npcs.get(actor_id)
-            if not npc:
+            npc.inventory.clear()
+        # Mark as dead
+        self._dead_npcs.add(npc.id)
+        if "dead" not in npc.tags.get("dynamic", []):
+            npc.tags.setdefault("dynamic", []).append("dead")
+
+    def _apply_reason(self, event):
+        # Deterministic handler for ReasonTool outcomes with a strict allowlist.
+        npc = self.npcs.get(event.actor_id)
+        if not npc:
+            return
+        desired = (event.payload or {}).get("desired_outcome") or {}
+        # First allowlisted operation with a dict body wins, in _reason_ops order
+        for key, handler in self._reason_ops:
+            data = desired.get(key)
+            if isinstance(data, dict):
+                handler(npc, event, data)
                 return
-            outputs = (event.payload or {}).get("outputs") or {}
-
-            def _mk_mem(d: Dict[str, Any]) -> Memory:
-                return Memory(
-                    text=str(d.get("text", ""))[:1000],
-                    tick=int(event.tick),
-                    priority=str(d.get("priority", "normal")) if d.get("priority") else "normal",
-                    status="active",
-                    source_id=actor_id,
-                    confidence=float(d.get("confidence", 0.8)) if d.get("confidence") is not None else 0.8,
-                    is_secret=bool(d.get("is_secret", False)),
-                    payload=dict(d.get("payload", {})) if isinstance(d.get("payload", dict)) else {},
-                )
+        # All other mutations (hp, inventory, slots, movement) are forbidden by design.
 
-            # Add new core memories
-            for d in outputs.get("new_core_memories", []) or []:
-                try:
-                    mem = _mk_mem(d)
-                    npc.core_memories.append(mem)
-                    if len(npc.core_memories) > 50:
-                        npc.core_memories = npc.core_memories[-50:]
-                except Exception:
-                    continue
+    def _reason_add_memory(self, npc, event, data):
+        # Build Memory with defaults and safe coercions
+        mem = Memory(
+            text=str(data.get("text", ""))[:1000],
+            tick=int(event.tick),
+            priority=str(data.get("priority", "normal")),
+            status=str(data.get("status", "active")),
+            source_id=str(data.get("source_id")) if data.get("source_id") is not None else None,
+            confidence=float(data.get("confidence", 1.0)),
+            is_secret=bool(data.get("is_secret", False)),
+            payload=dict(data.get("payload", {})) if isinstance(data.get("payload", {}), dict) else {},
+        )
+        npc.memories.append(mem)
+        self._enforce_memory_soft_cap(npc)
 
-            # Add new ordinary memories
-            for d in outputs.get("new_memories", []) or []:
-                try:
-                    mem = _mk_mem(d)
-                    npc.memories.append(mem)
-                    if len(npc.memories) > 1000:
-                        for old in npc.memories[:50]:
-                            try:
-                                old.status = "archived"
-                            except Exception:
-                                pass
-                except Exception:
-                    continue
+    @staticmethod
+    def _enforce_memory_soft_cap(npc) -> None:
+        # Keep a soft cap to prevent runaway growth (archival policy later): archive the oldest batch
+        if len(npc.memories) > MEMORY_SOFT_CAP:
+            for old in islice(npc.memories, MEMORY_ARCHIVE_BATCH):
+                old.status = "archived"
 
-            # Mark archive/consolidate by substring matches
-            archive_matches = outputs.get("archive_matches", []) or []
-            consolidate_matches = outputs.get("consolidate_matches", []) or []
+    def _reason_update_memory_status(self, npc, event, data):
+        match_text = str(data.get("match_text", "")).lower()
+        new_status = str(data.get("new_status", "active"))
+        if not match_text:
+            return
+        # Update the first matching memory by substring in text (memories are Memory instances since load)
+        for m in npc.memories:
+            if match_text in (m.text or "").lower():
+                m.status = new_status
+                break
 
-            def _match_and_mark(mem_list):
-                for m in mem_list:
-                    try:
-                        text = (m.text or "").lower()
-                    except Exception:
-                        if isinstance(m, dict):
-                            text = json.dumps(m, ensure_ascii=False).lower()
-                        else:
-                            continue
-                    for token in archive_matches:
-                        if isinstance(token, str) and token.lower() in text:
-                            try:
-                                m.status = "archived"
-                            except Exception:
-                                if isinstance(m, dict):
-                                    m["status"] = "archived"
-                    for token in consolidate_matches:
-                        if isinstance(token, str) and token.lower() in text:
-                            try:
-                                m.status = "consolidated"
-                            except Exception:
-                                if isinstance(m, dict):
-                                    m["status"] = "consolidated"
-
-            _match_and_mark(npc.memories)
-            _match_and_mark(npc.core_memories)
+    def _reason_add_goal(self, npc, event, data):
+        goal = Goal(
+            text=str(data.get("text", ""))[:500],
+            type=str(data.get("type", "note")),
+            priority=str(data.get("priority", "normal")),
+            status=str(data.get("status", "active")),
+            payload=dict(data.get("payload", {})) if isinstance(data.get("payload", {}), dict) else {},
+            expiry_tick=int(data.get("expiry_tick")) if data.get("expiry_tick") is not None else None,
+        )
+        npc.goals.append(goal)
+        # Optional: cap goals length (in place, so list references held elsewhere stay valid)
+        if len(npc.goals) > GOAL_CAP:
+            del npc.goals[:-GOAL_CAP]
+
+    def _reason_update_goal_status(self, npc, event, data):
+        match_text = str(data.get("match_text", "")).lower()
+        new_status = str(data.get("new_status", "active"))
+        if not match_text:
+            return
+        for g in npc.goals:
+            if match_text in (g.text or "").lower():
+                g.status = new_status
+                break
+
+    def _reason_update_relationship(self, npc, event, data):
+        target_id = str(data.get("target_id", ""))
+        new_status = str(data.get("new_status", ""))
+        if target_id:
+            npc.relationships[target_id] = new_status
+
+    def _apply_reflect(self, event):
+        # Deterministic handler for ReflectTool outcomes.
+        actor_id = event.actor_id
+        npc = self.npcs.get(actor_id)
+        if not npc:
+            return
+        outputs = (event.payload or {}).get("outputs") or {}
+
+        def _mk_mem(d: Dict[str, Any]) -> Memory:
+            return Memory(
+                text=str(d.get("text", ""))[:1000],
+                tick=int(event.tick),
+                priority=str(d.get("priority", "normal")) if d.get("priority") else "normal",
+                status="active",
+                source_id=actor_id,
+                confidence=float(d.get("confidence", 0.8)) if d.get("confidence") is not None else 0.8,
+                is_secret=bool(d.get("is_secret", False)),
+                payload=dict(d.get("payload", {})) if isinstance(d.get("payload", {}), dict) else {},
+            )
+
+        # Add new core memories; the cap is applied once after the batch
+        for d in outputs.get("new_core_memories", []) or []:
+            try:
+                npc.core_memories.append(_mk_mem(d))
+            except Exception:
+                continue
+        if len(npc.core_memories) > CORE_MEMORY_CAP:
+            del npc.core_memories[:-CORE_MEMORY_CAP]
+
+        # Add new ordinary memories; archival is idempotent, so it also runs once per batch
+        for d in outputs.get("new_memories", []) or []:
+            try:
+                npc.memories.append(_mk_mem(d))
+            except Exception:
+                continue
+        self._enforce_memory_soft_cap(npc)
+
+        # Mark archive/consolidate by substring matches
+        archive_matches = outputs.get("archive_matches", []) or []
+        consolidate_matches = outputs.get("consolidate_matches", []) or []
+
+        # One compiled alternation per kind: a single scan of each memory text instead of one per token
+        archive_re = _substring_matcher(archive_matches)
+        consolidate_re = _substring_matcher(consolidate_matches)
+        if archive_re is None and consolidate_re is None:
+            # Nothing to match (the common case): skip walking every memory
+            return
+
+        def _match_and_mark(mem_list):
+            for m in mem_list:
+                text = (m.text or "").lower()
+                # Consolidation takes precedence when a memory matches both kinds
+                if consolidate_re is not None and consolidate_re.search(text):
+                    m.status = "consolidated"
+                elif archive_re is not None and archive_re.search(text):
+                    m.status = "archived"
+
+        _match_and_mark(npc.memories)
+        _match_and_mark(npc.core_memories)
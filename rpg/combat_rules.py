@@ -1,5 +1,6 @@
 import random
-from typing import Dict
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 
 from engine.data_models import NPC, ItemBlueprint
 from engine.world_state import WorldState
@@ -21,11 +22,22 @@ def proficiency_bonus(level: str) -> int:
     return _PROFICIENCY_MAP.get(level, 0)
 
 
-def roll_dice(spec: str) -> int:
+@lru_cache(maxsize=64)
+def _parse_spec(spec: str) -> Tuple[int, int]:
     num, die = spec.lower().split('d')
-    num = int(num)
-    die = int(die)
-    return sum(random.randint(1, die) for _ in range(num))
+    return int(num), int(die)
+
+
+def roll_dice_nd(num: int, die: int) -> int:
+    """Roll ``num`` dice with ``die`` sides; same distribution as summing randint(1, die)."""
+    if num == 1:
+        return random.randrange(die) + 1
+    r = random.randrange
+    return sum(r(die) for _ in range(num)) + num
+
+
+def roll_dice(spec: str) -> int:
+    return roll_dice_nd(*_parse_spec(spec))
 
 
 _DEFAULT_UNARMED = ItemBlueprint(
@@ -40,28 +52,17 @@ _DEFAULT_UNARMED = ItemBlueprint(
 
 
 def get_weapon(world: WorldState, actor: NPC) -> ItemBlueprint:
-    inst_id = actor.slots.get("main_hand")
-    if inst_id and inst_id in world.item_instances:
-        inst = world.get_item_instance(inst_id)
-        bp = world.get_item_blueprint(inst.blueprint_id)
-        return bp
-    return _DEFAULT_UNARMED
+    # main-hand blueprint is cached on the NPC by WorldState on equip/unequip/death
+    return actor.mainhand_bp or _DEFAULT_UNARMED
 
 
 def compute_ac(world: WorldState, actor: NPC) -> int:
-    ac = 10
-    # armour from equipped items
-    for inst_id in actor.slots.values():
-        if inst_id and inst_id in world.item_instances:
-            inst = world.get_item_instance(inst_id)
-            bp = world.get_item_blueprint(inst.blueprint_id)
-            ac += getattr(bp, "armour_rating", 0)
+    # armour from equipped items is cached on the NPC by WorldState on equip/unequip/death
     dex = actor.attributes.get("dexterity", 10)
-    ac += ability_modifier(dex)
-    return ac
+    return 10 + actor.ac_bonus + ability_modifier(dex)
 
 
-def resolve_attack(world: WorldState, attacker: NPC, target: NPC) -> Dict[str, int]:
+def resolve_attack(world: WorldState, attacker: NPC, target: NPC) -> Dict[str, Any]:
     weapon = get_weapon(world, attacker)
     # choose ability
     str_mod = ability_modifier(attacker.attributes.get("strength", 10))
@@ -72,20 +73,20 @@ def resolve_attack(world: WorldState, attacker: NPC, target: NPC) -> Dict[str, i
         attr_mod = str_mod
     prof_level = attacker.skills.get(weapon.skill_tag, "")
     prof_bonus = proficiency_bonus(prof_level)
-    d20 = roll_dice("1d20")
+    d20 = roll_dice_nd(1, 20)
     to_hit = d20 + attr_mod + prof_bonus
     target_ac = compute_ac(world, target)
     hit = to_hit >= target_ac
     critical = d20 == 20
     damage = 0
     if hit:
-        damage = roll_dice(weapon.damage_dice)
-        if critical:
-            damage += roll_dice(weapon.damage_dice)
-        damage += attr_mod
+        num, die = _parse_spec(weapon.damage_dice)
+        # A critical rolls the damage dice twice: one roll of twice as many dice
+        damage = roll_dice_nd(num * 2 if critical else num, die) + attr_mod
     return {
         "hit": hit,
         "damage": damage,
         "to_hit": to_hit,
         "target_ac": target_ac,
+        "damage_type": weapon.damage_type,
     }
@@ -0,0 +1,28 @@
+import os
+import sys
+from pathlib import Path
+
+"""
+Pack the per-file world data under data/ into one JSON-lines file per section (data/.pack/*.jsonl).
+
+WorldState.load reads a pack instead of the individual JSON files while the pack is newer than every
+source file; after editing data, rerun this script (stale packs are ignored, never loaded).
+
+Usage:
+    python scripts/build_world_pack.py [data_dir]
+"""
+
+# Allow running from repository root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from engine.world_state import build_pack
+
+
+def main():
+    data_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("data")
+    pack_dir = build_pack(data_dir)
+    print(f"Wrote: {pack_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,22 @@
 import sys
 import os
+import atexit
+import copy
+import hashlib
+import json
+import queue
+import re
+import threading
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
 import argparse
 
+try:  # Optional C serializer for context digests; stdlib json is the fallback
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 
 # Allow running from repository root
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -41,99 +55,52 @@ def render_player_hud(sim: Simulator, world: WorldState, actor_id: str) -> None:
     if not player:
         return
     location_id = world.find_npc_location(actor_id)
-    loc_static = world.get_location_static(location_id) if location_id else None
-    loc_state = world.get_location_state(location_id) if location_id else None
-
-    # Location summary
-    loc_name = getattr(loc_static, "name", None) if loc_static else None
-    loc_desc = getattr(loc_static, "description", None) if loc_static else None
-
-    # Visible NPCs/items
-    visible_npcs = []
-    visible_items = []
-    if loc_state:
-        try:
-            visible_npcs = [nid for nid in getattr(loc_state, "occupants", []) if nid != actor_id]
-        except Exception:
-            visible_npcs = []
-        try:
-            visible_items = list(getattr(loc_state, "items", []))
-        except Exception:
-            visible_items = []
-
-    # Player summary
-    hp = getattr(player, "hp", None)
-    if hasattr(player, "attributes"):
-        max_hp = getattr(player, "attributes", {}).get("constitution", hp)
-        max_hp = max(1, max_hp * 2) if isinstance(max_hp, int) else hp
-    else:
-        max_hp = hp
-    hunger = getattr(player, "hunger_stage", None)
-
-    # Equipped summary (simple)
-    equipped = []
-    try:
-        slots = getattr(player, "slots", {}) or {}
-        for slot_name, slot_item in slots.items():
-            if slot_item:
-                equipped.append(f"{slot_name}:{slot_item}")
-    except Exception:
-        pass
-
-    # Inventory short summary
-    inv = []
-    try:
-        inv = list(getattr(player, "inventory", [])) if isinstance(getattr(player, "inventory", []), list) else []
-    except Exception:
-        inv = []
-    inv_preview = inv[:3]
+    loc_static = world.locations_static.get(location_id) if location_id else None
+    loc_state = world.locations_state.get(location_id) if location_id else None
+
+    # NPC/LocationStatic/LocationState are dataclasses: read fields directly, once each
+    hp = player.hp
+    max_hp = player.attributes.get("constitution", hp)
+    max_hp = max(1, max_hp * 2) if isinstance(max_hp, int) else hp
+    equipped = [f"{slot_name}:{slot_item}" for slot_name, slot_item in player.slots.items() if slot_item]
+    inv = player.inventory
+    inv_preview = list(islice(inv, 3))
     more_inv = max(0, len(inv) - len(inv_preview))
 
-    # Neighbors summary
-    neighbors = []
-    try:
-        if loc_static and hasattr(loc_static, "hex_connections"):
-            neighbors = list(loc_static.hex_connections.values())
-    except Exception:
-        neighbors = []
-
-    print("\n=== STATUS ===")
-    print(f"Tick: {sim.game_tick}")
-    print(f"HP: {hp}/{max_hp}  Hunger: {hunger}")
-    if equipped:
-        print("Equipped:", ", ".join(equipped))
-    else:
-        print("Equipped: (none)")
-
-    print("\n=== LOCATION ===")
-    if loc_name:
-        print(f"{loc_name}")
-    if loc_desc:
-        print(loc_desc)
-    if neighbors:
-        print("Neighbors:", ", ".join(neighbors))
-
-    print("\n=== AROUND YOU ===")
-    if visible_npcs:
-        print("NPCs:", ", ".join(visible_npcs))
-    else:
-        print("NPCs: (none)")
+    out = [
+        "\n=== STATUS ===",
+        f"Tick: {sim.game_tick}",
+        f"HP: {hp}/{max_hp}  Hunger: {player.hunger_stage}",
+        "Equipped: " + ", ".join(equipped) if equipped else "Equipped: (none)",
+        "\n=== LOCATION ===",
+    ]
+    if loc_static is not None:
+        if loc_static.name:
+            out.append(f"{loc_static.name}")
+        if loc_static.description:
+            out.append(loc_static.description)
+        if loc_static.hex_connections:
+            out.append("Neighbors: " + ", ".join(loc_static.hex_connections.values()))
+
+    out.append("\n=== AROUND YOU ===")
+    visible_npcs = [nid for nid in loc_state.occupants if nid != actor_id] if loc_state is not None else []
+    out.append("NPCs: " + ", ".join(visible_npcs) if visible_npcs else "NPCs: (none)")
+    visible_items = loc_state.items if loc_state is not None else []
     if visible_items:
         shown_items = visible_items[:5]
-        more_items = max(0, len(visible_items) - len(shown_items))
-        if shown_items:
-            print("Items:", ", ".join(shown_items) + (f" (+{more_items} more)" if more_items else ""))
-        else:
-            print("Items: (none)")
+        more_items = len(visible_items) - len(shown_items)
+        out.append("Items: " + ", ".join(shown_items) + (f" (+{more_items} more)" if more_items else ""))
     else:
-        print("Items: (none)")
+        out.append("Items: (none)")
 
-    print("\n=== INVENTORY (brief) ===")
+    out.append("\n=== INVENTORY (brief) ===")
     if inv_preview:
-        print(", ".join(inv_preview) + (f" (+{more_inv} more)" if more_inv else ""))
+        out.append(", ".join(inv_preview) + (f" (+{more_inv} more)" if more_inv else ""))
     else:
-        print("(empty)")
-    print("Hints: type 'inventory' for full list; 'look' to reprint surroundings; 'stats' for details.\n")
+        out.append("(empty)")
+    out.append("Hints: type 'inventory' for full list; 'look' to reprint surroundings; 'stats' for details.\n")
+    # One write for the whole HUD instead of one per line (stdout is tee'd into the run log)
+    print("\n".join(out))
 
 
 SYSTEM_PROMPT = (
@@ -171,38 +138,177 @@ SYSTEM_PROMPT = (
 )
 
 
-# Non-blocking input helper for Windows so pygame can keep pumping frames
+# -----------------------
+# Helper: deterministic fast path for trivial commands
+# -----------------------
+_FAST_INTENT = re.compile(
+    r"^(?:(?P<look>look(?:\s+around)?|l)"
+    r"|(?P<inventory>inventory|inv|i|bag|check\s+(?:bag|backpack))"
+    r"|(?P<stats>stats|status)"
+    r"|(?P<timed>wait|rest)(?:\s+(?P<ticks>\d{1,3}))?"
+    r"|(?:(?:go|walk|move|head)\s+)?(?P<dir>(?:north|south)[\s_-]?(?:east|west)|[ns][ew]|east|west|e|w)"
+    r"|(?:go|walk|move|head)\s+(?:to\s+)?(?:the\s+)?(?P<place>.+?)"
+    r"|(?:pick\s+up|grab|take)\s+(?:the\s+)?(?P<item>.+?))\s*$",
+    re.IGNORECASE,
+)
+
+# Spoken direction -> hex_connections key (the hex grid has no due north/south)
+_DIR_ALIASES = {"e": "E", "east": "E", "w": "W", "west": "W"}
+for _ns in ("north", "south"):
+    for _ew in ("east", "west"):
+        _key = _ns[0].upper() + _ew[0].upper()
+        for _sep in ("", " ", "_", "-"):
+            _DIR_ALIASES[_ns + _sep + _ew] = _key
+        _DIR_ALIASES[_key.lower()] = _key
+
+
+def fast_intent(cmd: str, world: WorldState, actor_id: str):
+    """
+    Map unambiguous trivial input (look, inventory, stats, wait/rest N, a hex direction or a
+    neighbouring location by name, grabbing a visible item by id or name) straight to a command
+    dict. Returns None to defer to the LLM.
+    """
+    m = _FAST_INTENT.match(cmd)
+    if not m:
+        return None
+    if m.group("look"):
+        return {"tool": "look", "params": {}}
+    if m.group("inventory"):
+        return {"tool": "inventory", "params": {}}
+    if m.group("stats"):
+        return {"tool": "stats", "params": {}}
+    if m.group("timed"):
+        return {"tool": m.group("timed").lower(), "params": {"ticks": int(m.group("ticks") or 1)}}
+    loc_id = world.find_npc_location(actor_id)
+    if not loc_id:
+        return None
+    if m.group("dir"):
+        static = world.locations_static.get(loc_id)
+        key = _DIR_ALIASES.get(m.group("dir").lower())
+        target = (getattr(static, "hex_connections", {}) or {}).get(key) if static else None
+        return {"tool": "move", "params": {"target_location": target}} if target else None
+    if m.group("place"):
+        static = world.locations_static.get(loc_id)
+        neighbor_ids = set((getattr(static, "hex_connections", {}) or {}).values()) if static else set()
+        key = m.group("place").lower().replace("_", " ")
+        # Same name/id index the LLM move normalization uses; only a single neighbour match resolves
+        matches = {lid for k in (key, key.replace(" ", "_")) for lid in world.location_ids_for_name(k) if lid in neighbor_ids}
+        return {"tool": "move", "params": {"target_location": matches.pop()}} if len(matches) == 1 else None
+    wanted = m.group("item").lower()
+    matches = [
+        item_id for item_id, name in world.location_item_names(loc_id).items()
+        if wanted in (item_id.lower(), str(name).lower())
+    ]
+    # Several items share the name: let the LLM (and the player) disambiguate
+    return {"tool": "grab", "params": {"item_id": matches[0]}} if len(matches) == 1 else None
+
+
+# -----------------------
+# Helper: player intent cache
+# -----------------------
+INTENT_CACHE_PATH = Path("exports/intent_cache.json")
+INTENT_CACHE_SIZE = 512
+
+
+class IntentCache:
+    """
+    LRU of parsed player commands keyed by (normalized input, context digest), so retyping the same
+    command in the same situation skips the LLM round-trip. time_tick is left out of the key since it
+    changes every turn without changing what the input means; location, visible ids, inventory and
+    stats are all part of it. Persisted to disk and dropped wholesale when SYSTEM_PROMPT changes.
+    """
+
+    def __init__(self, path: Path = INTENT_CACHE_PATH, maxsize: int = INTENT_CACHE_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        self.prompt_digest = hashlib.blake2b(SYSTEM_PROMPT.encode("utf-8"), digest_size=8).hexdigest()
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+
+    @staticmethod
+    def key(cmd: str, additional_context: dict) -> str:
+        ctx = {k: v for k, v in (additional_context or {}).items() if k != "time_tick"}
+        if _orjson is not None:
+            blob = _orjson.dumps(ctx, option=_orjson.OPT_SORT_KEYS, default=str)
+        else:
+            blob = json.dumps(ctx, sort_keys=True, default=str).encode("utf-8")
+        # Case is kept: speech content is copied verbatim from the input
+        return " ".join(cmd.split()) + "|" + hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+    def get(self, key: str):
+        command = self._entries.get(key)
+        if command is None:
+            return None
+        self._entries.move_to_end(key)
+        # Callers normalize params in place; never hand out the cached dict itself
+        return copy.deepcopy(command)
+
+    def put(self, key: str, command) -> None:
+        if not isinstance(command, dict) or "tool" not in command or "params" not in command:
+            return
+        self._entries[key] = copy.deepcopy(command)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("prompt") == self.prompt_digest:
+                for key, command in data.get("entries", []):
+                    self.put(key, command)
+        except Exception:
+            # Missing or unreadable cache: start empty
+            pass
+
+    def save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"prompt": self.prompt_digest, "entries": list(self._entries.items())}, f)
+        except Exception:
+            pass
+
+
+# Input helper that keeps an optional renderer (pygame) pumping frames while waiting for a line.
+# The line is read on a daemon thread; the main thread sleeps on the queue between frames instead of
+# polling the keyboard, so an idle player costs nothing without a renderer and one wake-up per frame with one.
+INPUT_FRAME_SECONDS = 1.0 / 30
+# Queue of a reader thread still blocked in input() (e.g. after the window closed); reused by the next call
+_pending_input = None
+
+
 def read_input_with_ui(sim, prompt: str) -> str:
-    try:
-        import msvcrt  # type: ignore
-    except Exception:
+    global _pending_input
+    renderer = getattr(sim, "renderer", None)
+    if not renderer and _pending_input is None:
         return input(prompt)
 
-    print(prompt, end="", flush=True)
-    buf = []
-    import time
+    lines = _pending_input
+    if lines is None:
+        lines = _pending_input = queue.Queue()
+
+        def _reader():
+            try:
+                lines.put(input(prompt))
+            except BaseException as e:
+                # EOFError and friends are re-raised on the main thread
+                lines.put(e)
+
+        threading.Thread(target=_reader, daemon=True).start()
     while True:
-        if msvcrt.kbhit():
-            ch = msvcrt.getwch()
-            if ch in ("\r", "\n"):
-                print("")
-                return "".join(buf)
-            elif ch == "\003":
-                raise KeyboardInterrupt
-            elif ch == "\b":
-                if buf:
-                    buf.pop()
-                    print("\b \b", end="", flush=True)
-            else:
-                buf.append(ch)
-                print(ch, end="", flush=True)
-        # Pump UI frames to keep pygame responsive
-        if hasattr(sim, "renderer") and sim.renderer:
-            res = sim.renderer.run_once()
-            if res is None:
+        try:
+            line = lines.get(timeout=INPUT_FRAME_SECONDS if renderer else None)
+        except queue.Empty:
+            # Pump UI frames to keep pygame responsive
+            if renderer.run_once() is None:
                 # Window closed
                 return ""
-        time.sleep(0.02)
+            continue
+        _pending_input = None
+        if isinstance(line, BaseException):
+            raise line
+        return line
 
 def main():
     parser = argparse.ArgumentParser()
@@ -263,42 +369,58 @@ def main():
         runlog_path.parent.mkdir(parents=True, exist_ok=True)
     except Exception:
         pass
-    log_fh = open(runlog_path, "w", encoding="utf-8")  # overwrite each run
+    # 64 KB buffer; a background thread flushes it once per second instead of on every print
+    log_fh = open(runlog_path, "w", encoding="utf-8", buffering=1 << 16)  # overwrite each run
+    log_lock = threading.Lock()
+    log_stop = threading.Event()
     print(f"[Session] Logging to {runlog_path} (overwriting previous run)")
 
-    # Simple stdout duplicator
+    def _flush_log():
+        with log_lock:
+            try:
+                log_fh.flush()
+            except Exception:
+                pass
+
+    def _log_flusher():
+        while not log_stop.wait(1.0):
+            _flush_log()
+
+    threading.Thread(target=_log_flusher, name="runlog-flusher", daemon=True).start()
+    atexit.register(_flush_log)
+
+    # Simple stdout duplicator; the run log is written under a lock and left to the flusher thread
     class _Tee:
-        def __init__(self, *streams):
-            self.streams = streams
+        def __init__(self, console, log):
+            self.console = console
+            self.log = log
         def write(self, s):
-            for st in self.streams:
+            try:
+                self.console.write(s)
+            except Exception:
+                pass
+            with log_lock:
                 try:
-                    st.write(s)
+                    self.log.write(s)
                 except Exception:
                     pass
         def flush(self):
-            for st in self.streams:
-                try:
-                    st.flush()
-                except Exception:
-                    pass
+            try:
+                self.console.flush()
+            except Exception:
+                pass
     import sys as _sys
     _sys_stdout = _sys.stdout
     _sys.stdout = _Tee(_sys_stdout, log_fh)
 
-    # Helper to log hidden reasoning blocks from the last LLM response file
+    # Helper to log hidden reasoning blocks from the last LLM response (kept in memory by the client)
+    think_extractor = llm.extract_think
+
     def _log_last_think(prefix: str):
         try:
-            from engine.llm_client import LLMClient as _LLM
-            extractor = _LLM().extract_think
-            raw = ""
-            try:
-                with open("llm_last_response.txt", "r", encoding="utf-8") as f:
-                    raw = f.read()
-            except Exception:
-                raw = ""
+            raw = llm.last_response_raw
             if raw:
-                think = extractor(raw)
+                think = think_extractor(raw)
                 if think:
                     print(f"[LLM think] {prefix}: {think}")
         except Exception:
@@ -309,40 +431,33 @@ def main():
     def _log_llm_io(label: str):
         try:
             # Pretty-print last request if available
-            try:
-                with open("llm_last_request.json", "r", encoding="utf-8") as f:
-                    req_txt = f.read()
-                if req_txt:
-                    print(f"[LLM request] {label}:\n{req_txt}")
-            except Exception:
-                pass
+            if llm.last_request:
+                req_txt = json.dumps(llm.last_request, ensure_ascii=False, indent=2)
+                print(f"[LLM request] {label}:\n{req_txt}")
             # Dump raw provider response body
-            try:
-                with open("llm_last_response.txt", "r", encoding="utf-8") as f:
-                    resp_raw = f.read()
-                if resp_raw:
-                    print(f"[LLM response raw] {label} (first 2KB):\n{resp_raw[:2048]}")
-            except Exception:
-                pass
+            resp_raw = llm.last_response_raw
+            if resp_raw:
+                print(f"[LLM response raw] {label} (first 2KB):\n{resp_raw[:2048]}")
             # Dump parsed full JSON if provider returned OpenAI-like JSON
-            try:
-                with open("llm_last_full.json", "r", encoding="utf-8") as f:
-                    resp_json = f.read()
-                if resp_json:
-                    print(f"[LLM response json] {label}:\n{resp_json}")
-            except Exception:
-                pass
+            if llm.last_response_full is not None:
+                resp_json = json.dumps(llm.last_response_full, ensure_ascii=False, indent=2)
+                print(f"[LLM response json] {label}:\n{resp_json}")
         except Exception:
             # Never crash the game loop from logging
             pass
 
+    intent_cache = IntentCache()
+    intent_cache.load()
+
+    last_ctx = None
+    last_ctx_version = -1
+
     while True:
-        cmd = input("-> ").strip()
+        cmd = read_input_with_ui(sim, "-> ").strip()
         # If user enters nothing, they 'do nothing' this turn: advance world state (NPCs act)
         if not cmd:
             # Drain pending events if any
-            while sim.event_queue:
-                sim.tick()
+            sim.drain_events()
             # Run NPC cycle and advance one tick if any acted
             any_npc_acted = False
             if hasattr(sim, "run_npc_round"):
@@ -356,32 +471,45 @@ def main():
         if cmd in {"quit", "exit"}:
             break
 
-        # Build minimal additional context for the LLM to help with disambiguation
-        player = world.get_npc(actor_id)
-        location_id = world.find_npc_location(actor_id)
-        loc_state = world.locations_state.get(location_id) if location_id else None
-        visible_items = list(loc_state.items) if loc_state and hasattr(loc_state, "items") and isinstance(loc_state.items, list) else []
-        visible_npcs = [nid for nid in (loc_state.occupants if loc_state and hasattr(loc_state, "occupants") else []) if nid != actor_id]
-        inventory_items = list(player.inventory) if player and hasattr(player, "inventory") and isinstance(player.inventory, list) else []
-        stats_summary = {
-            "hp": getattr(player, "hp", None),
-            "max_hp": getattr(player, "attributes", {}).get("constitution", getattr(player, "hp", None)) if hasattr(player, "attributes") else None,
-            "hunger_stage": getattr(player, "hunger_stage", None),
-        }
-
-        additional_context = {
-            "player_id": actor_id,
-            "location_id": location_id,
-            "visible_items": visible_items,
-            "visible_npcs": visible_npcs,
-            "inventory_items": inventory_items,
-            "stats": stats_summary,
-            "time_tick": sim.game_tick,
-        }
-
-        command = llm.parse_command(cmd, SYSTEM_PROMPT, additional_context=additional_context)
-        _log_last_think("player_intent")
-        _log_llm_io("player_intent")
+        # Build minimal additional context for the LLM to help with disambiguation.
+        # Reuse the previous turn's context while nothing in the simulation has changed.
+        if sim._context_version != last_ctx_version or last_ctx is None:
+            player = world.get_npc(actor_id)
+            location_id = world.find_npc_location(actor_id)
+            loc_state = world.locations_state.get(location_id) if location_id else None
+            visible_items = list(loc_state.items) if loc_state is not None else []
+            visible_npcs = [nid for nid in loc_state.occupants if nid != actor_id] if loc_state is not None else []
+            inventory_items = list(player.inventory) if player is not None else []
+            stats_summary = {
+                "hp": player.hp if player is not None else None,
+                "max_hp": player.attributes.get("constitution", player.hp) if player is not None else None,
+                "hunger_stage": player.hunger_stage if player is not None else None,
+            }
+
+            last_ctx = {
+                "player_id": actor_id,
+                "location_id": location_id,
+                "visible_items": visible_items,
+                "visible_npcs": visible_npcs,
+                "inventory_items": inventory_items,
+                "stats": stats_summary,
+                "time_tick": sim.game_tick,
+            }
+            last_ctx_version = sim._context_version
+        additional_context = last_ctx
+
+        # Trivial commands resolve locally; otherwise reuse a cached parse before asking the LLM
+        command = fast_intent(cmd, world, actor_id)
+        if command is None:
+            cache_key = IntentCache.key(cmd, additional_context)
+            command = intent_cache.get(cache_key)
+            if command is not None:
+                print("[LLM cache] player_intent: reused parsed command")
+            else:
+                command = llm.parse_command(cmd, SYSTEM_PROMPT, additional_context=additional_context)
+                _log_last_think("player_intent")
+                _log_llm_io("player_intent")
+                intent_cache.put(cache_key, command)
         # Normalize common param aliases to engine schema before validation/processing
         if command and isinstance(command, dict):
             t = command.get("tool")
@@ -391,27 +519,20 @@ def main():
                 # Accept neighbor names like "market square" by mapping to neighbor IDs when possible.
                 loc = params.get("target_location") or params.get("location_id") or params.get("target") or params.get("to")
                 # Normalize common display names to IDs visible from current location
-                if not isinstance(loc, str) or loc not in (world.locations_static or {}):
+                if isinstance(loc, str) and loc not in (world.locations_static or {}):
                     try:
-                        # Build a lowercase name->id map for neighbors only
-                        name_to_id = {}
                         cur = world.find_npc_location(actor_id)
                         if cur:
                             static = world.get_location_static(cur)
-                            # static.hex_connections is a dict of direction->neighbor_id; invert to id set
+                            # static.hex_connections is a dict of direction->neighbor_id; only neighbors qualify
                             neighbor_ids = set(getattr(static, "hex_connections", {}).values())
-                            for nid in neighbor_ids:
-                                st = world.get_location_static(nid)
-                                nname = getattr(st, "name", None) or getattr(st, "description", None) or nid
-                                name_to_id[str(nname).lower()] = nid
-                                # Also allow id itself as a key
-                                name_to_id[str(nid).lower()] = nid
-                        if isinstance(loc, str):
                             key = loc.strip().lower().replace("_", " ")
-                            # Try exact, then try with spaces/underscores swapped
-                            mapped = name_to_id.get(key) or name_to_id.get(key.replace(" ", "_")) or name_to_id.get(key.replace("_", " "))
-                            if mapped:
-                                loc = mapped
+                            # Try exact, then with spaces swapped for underscores (ids), via the world-wide name index
+                            for k in (key, key.replace(" ", "_")):
+                                mapped = next((lid for lid in world.location_ids_for_name(k) if lid in neighbor_ids), None)
+                                if mapped:
+                                    loc = mapped
+                                    break
                     except Exception:
                         pass
                 if isinstance(loc, str):
@@ -445,8 +566,7 @@ def main():
             continue
 
         # Drain events generated by the player's action
-        while sim.event_queue:
-            sim.tick()
+        sim.drain_events()
 
         # Run NPC cycle: each NPC acts once (LLM-driven) before returning to the player.
         # Advance global time exactly once after the full NPC round (per your timing model).
@@ -461,19 +581,22 @@ def main():
         render_player_hud(sim, world, actor_id)
 
         # Ensure time advances until the player is ready again (if tools applied cooldown)
-        while sim.world.get_npc(actor_id).next_available_tick > sim.game_tick:
-            sim.tick()
+        sim.advance_to(sim.world.get_npc(actor_id).next_available_tick)
+
+    intent_cache.save()
 
     # Restore stdout and close log at end
     try:
         _sys.stdout = _sys_stdout
     except Exception:
         pass
-    try:
-        log_fh.flush()
-        log_fh.close()
-    except Exception:
-        pass
+    log_stop.set()
+    with log_lock:
+        try:
+            log_fh.flush()
+            log_fh.close()
+        except Exception:
+            pass
 
 
 if __name__ == "__main__":
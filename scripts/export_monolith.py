@@ -1,8 +1,10 @@
+import codecs
 import os
 import sys
 from pathlib import Path
 import zipfile
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 """
 Export only the engine/game code into a single monolithic text file, and also produce a zip archive
@@ -34,159 +36,174 @@ MONOLITH_PATH = EXPORT_DIR / "monolith.txt"
 ZIP_PATH = EXPORT_DIR / "monolith.zip"
 
 # File extensions commonly treated as text (best-effort)
-TEXT_EXTS = {
+TEXT_EXTS = frozenset({
     ".py", ".txt", ".md", ".json", ".yml", ".yaml", ".ini", ".cfg",
     ".toml", ".csv", ".tsv", ".xml", ".html", ".htm", ".css", ".js", ".ts",
     ".tsx", ".jsx", ".env", ".gitignore", ".gitattributes", ".sh", ".bat",
     ".ps1", ".pyi",
-}
+})
+
+# Bytes sniffed from files whose extension is not in TEXT_EXTS
+SNIFF_BYTES = 512
+
+# Write buffer for the monolith; it is written as pre-encoded UTF-8 bytes in one binary stream
+MONOLITH_BUFFER = 1 << 20
+
+# File boundary rule, pre-encoded since it is written twice per file
+SEP = ("=" * 100 + "\n").encode()
+
+# Deflate level for the zip: the archive is a local, throwaway export, so favour speed over size
+ZIP_COMPRESSLEVEL = 1
 
 # Allowlist roots to include in exports (engine/game code only)
-INCLUDE_ROOTS = {"engine", "rpg"}
+INCLUDE_ROOTS = frozenset({"engine", "rpg"})
 
 # Folders to always skip if encountered under included roots
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     ".git", ".venv", "venv", "__pycache__", ".mypy_cache", ".pytest_cache",
     ".idea", ".vscode", "node_modules", "dist", "build", "exports"
-}
+})
 
 # Specific files to exclude from the monolith output
-SKIP_FILES = {
+SKIP_FILES = frozenset({
     "Follow this",
-}
+})
+
 
-def is_text_file(path: Path) -> bool:
-    # Heuristic: use extension; fallback to small binary sniffing
-    if path.suffix.lower() in TEXT_EXTS:
+def _looks_like_text(chunk: bytes) -> bool:
+    # If there are null bytes, likely binary; otherwise require valid utf-8. The incremental decoder
+    # tolerates a multi-byte character cut off at the end of the sniffed chunk.
+    if chunk.find(b"\x00") != -1:
+        return False
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(chunk, final=False)
         return True
+    except UnicodeDecodeError:
+        return False
+
+def walk_fast(root):
+    """
+    Files under root, depth first, pruning SKIP_DIRS. os.scandir entries carry their type, so no
+    extra stat per entry; like os.walk, directory symlinks are not followed.
+    """
     try:
-        with open(path, "rb") as f:
-            chunk = f.read(2048)
-        # If there are null bytes, likely binary
-        if b"\x00" in chunk:
-            return False
-        # Try decoding as utf-8 ignoring errors; if too many replacements would occur, treat as binary
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        entries = list(it)
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            if e.name not in SKIP_DIRS:
+                yield from walk_fast(e.path)
+        elif e.is_file():
+            yield Path(e.path)
+
+def decode_text(data: bytes) -> str:
+    """Same text as reading the file in text mode with utf-8/errors=replace (universal newlines)."""
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+def text_bytes(data: bytes) -> bytes:
+    """UTF-8 bytes of decode_text(data); valid UTF-8 without carriage returns is passed through as is."""
+    if b"\r" not in data:
         try:
-            chunk.decode("utf-8")
-            return True
+            data.decode("utf-8")
+            return data
         except UnicodeDecodeError:
-            return False
-    except Exception:
-        # If unreadable, treat as binary to be safe
-        return False
+            pass
+    return decode_text(data).encode("utf-8")
 
-def dump_text(fp_out, rel_path: str, abs_path: Path):
-    fp_out.write("\n")
-    fp_out.write("=" * 100 + "\n")
-    fp_out.write(f"FILE: {rel_path}\n")
-    fp_out.write("=" * 100 + "\n\n")
+def load_entry(entry):
+    """(rel, path, data, is_text, error) for one file; runs on the reader pool."""
+    rel, p = entry
     try:
-        with open(abs_path, "r", encoding="utf-8", errors="replace") as f:
-            fp_out.write(f.read())
+        data = p.read_bytes()
     except Exception as e:
-        fp_out.write(f"[ERROR] Failed to read as text: {e}\n")
+        return rel, p, None, False, e
+    # Sniff the bytes already in hand instead of re-opening the file
+    is_text = p.suffix.lower() in TEXT_EXTS or _looks_like_text(data[:SNIFF_BYTES])
+    return rel, p, data, is_text, None
+
+def dump_text(fp_out, rel_path: str, body: bytes):
+    fp_out.write(b"\n")
+    fp_out.write(SEP)
+    fp_out.write(f"FILE: {rel_path}\n".encode())
+    fp_out.write(SEP)
+    fp_out.write(b"\n")
+    fp_out.write(body)
 
 def dump_binary(fp_out, rel_path: str, abs_path: Path):
     # Skip binary content in monolith; add a placeholder note only
-    fp_out.write("\n")
-    fp_out.write("=" * 100 + "\n")
-    fp_out.write(f"FILE (binary skipped): {rel_path}\n")
-    fp_out.write("=" * 100 + "\n\n")
-    fp_out.write("[NOTE] Binary content omitted for readability.\n")
-
-def build_monolith():
-    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.datetime.now().isoformat()
-    with open(MONOLITH_PATH, "w", encoding="utf-8") as out:
-        out.write("# Monolithic export of engine/game code\n")
-        out.write(f"# Project root: {PROJECT_ROOT}\n")
-        out.write(f"# Generated: {timestamp}\n")
-        out.write("# Included roots: engine/, rpg/\n")
-        out.write("# Order: sorted paths\n")
-        out.write("\n")
-
-        all_paths = []
-
-        # Walk only included roots
-        for root_name in sorted(INCLUDE_ROOTS):
-            root_dir = PROJECT_ROOT / root_name
-            if not root_dir.exists():
+    fp_out.write(b"\n")
+    fp_out.write(SEP)
+    fp_out.write(f"FILE (binary skipped): {rel_path}\n".encode())
+    fp_out.write(SEP)
+    fp_out.write(b"\n[NOTE] Binary content omitted for readability.\n")
+
+def collect_paths():
+    """Sorted (posix relative path, absolute path) pairs for every exported file."""
+    all_paths = []
+    # Walk only included roots
+    for root_name in sorted(INCLUDE_ROOTS):
+        root_dir = PROJECT_ROOT / root_name
+        if not root_dir.exists():
+            continue
+        for p in walk_fast(root_dir):
+            # Skip specific files by name before any path arithmetic
+            if p.name in SKIP_FILES:
                 continue
-            for root, dirs, files in os.walk(root_dir):
-                # prune unwanted dirs
-                pruned = []
-                for d in list(dirs):
-                    if d in SKIP_DIRS:
-                        pruned.append(d)
-                for d in pruned:
-                    dirs.remove(d)
-
-                root_path = Path(root)
-                for name in files:
-                    p = root_path / name
-                    # Skip outputs themselves if they end up under included roots (unlikely)
-                    if p == MONOLITH_PATH or p == ZIP_PATH:
-                        continue
-                    try:
-                        rel = p.relative_to(PROJECT_ROOT).as_posix()
-                    except ValueError:
-                        continue
-                    # Skip specific files by name
-                    if p.name in SKIP_FILES:
-                        continue
-                    all_paths.append((rel, p))
-
-        # Sort by path to keep deterministic
-        all_paths.sort(key=lambda t: t[0])
-
-        for rel, p in all_paths:
-            if is_text_file(p):
-                dump_text(out, rel, p)
-            else:
-                dump_binary(out, rel, p)
-
-    return MONOLITH_PATH
-
-def build_zip():
-    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
-    # Create a zip archive containing only included roots
-    with zipfile.ZipFile(ZIP_PATH, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for root_name in sorted(INCLUDE_ROOTS):
-            root_dir = PROJECT_ROOT / root_name
-            if not root_dir.exists():
+            # Skip outputs themselves if they end up under included roots (unlikely)
+            if p == MONOLITH_PATH or p == ZIP_PATH:
                 continue
-            for root, dirs, files in os.walk(root_dir):
-                # prune unwanted dirs
-                pruned = []
-                for d in list(dirs):
-                    if d in SKIP_DIRS:
-                        pruned.append(d)
-                for d in pruned:
-                    dirs.remove(d)
-
-                root_path = Path(root)
-                for name in files:
-                    p = root_path / name
-                    if p == ZIP_PATH:
-                        continue
-                    try:
-                        rel = p.relative_to(PROJECT_ROOT)
-                    except ValueError:
-                        continue
-                    # Skip specific files by name
-                    if p.name in SKIP_FILES:
-                        continue
-                    zf.write(p, rel)
-
-    return ZIP_PATH
+            try:
+                rel = p.relative_to(PROJECT_ROOT).as_posix()
+            except ValueError:
+                continue
+            all_paths.append((rel, p))
+    # Sort by path to keep deterministic
+    all_paths.sort(key=lambda t: t[0])
+    return all_paths
+
+def build_all():
+    """
+    Write the monolith and the zip in a single pass: the tree is walked once and each file is read once,
+    with the same bytes feeding the text dump and the archive.
+    """
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    all_paths = collect_paths()
+    timestamp = datetime.datetime.now().isoformat()
+    with open(MONOLITH_PATH, "wb", buffering=MONOLITH_BUFFER) as out, \
+            zipfile.ZipFile(ZIP_PATH, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL) as zf:
+        out.write((
+            "# Monolithic export of engine/game code\n"
+            f"# Project root: {PROJECT_ROOT}\n"
+            f"# Generated: {timestamp}\n"
+            "# Included roots: engine/, rpg/\n"
+            "# Order: sorted paths\n"
+            "\n"
+        ).encode())
+
+        # Read files concurrently (I/O bound); map() yields results in sorted order for writing
+        with ThreadPoolExecutor(max_workers=max(1, min(32, len(all_paths)))) as pool:
+            for rel, p, data, is_text, error in pool.map(load_entry, all_paths):
+                if error is not None:
+                    # Unreadable: note it in the monolith and leave it out of the zip
+                    dump_text(out, rel, f"[ERROR] Failed to read as text: {error}\n".encode())
+                    continue
+                if is_text:
+                    dump_text(out, rel, text_bytes(data))
+                else:
+                    dump_binary(out, rel, p)
+                # Keep the file's timestamp and mode in the archive, as ZipFile.write would
+                zinfo = zipfile.ZipInfo.from_file(p, rel)
+                zf.writestr(zinfo, data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=ZIP_COMPRESSLEVEL)
+
+    return MONOLITH_PATH, ZIP_PATH
 
 def main():
-    print("Exporting monolithic text file ...")
-    mono = build_monolith()
+    print("Exporting monolithic text file and project zip ...")
+    mono, z = build_all()
     print(f"Wrote: {mono}")
-
-    print("Exporting full project zip ...")
-    z = build_zip()
     print(f"Wrote: {z}")
 
     print("Done.")
@@ -1,17 +1,28 @@
 import os
 import sys
 from pathlib import Path
-from flask import Flask, jsonify, request, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask import Flask, Response, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room
+import functools
+import hashlib
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, List, Optional, Any
 
+try:  # Optional C (de)serializer for the JSON endpoints and request bodies; Flask's stdlib json is the fallback
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from engine.world_state import WorldState
+from engine.world_state import WorldState, HEX_DIR_INVERSE
 from engine.simulator import Simulator
 from engine.narrator import Narrator
+from engine.data_models import Memory, Goal, ItemInstance, LocationState, LocationStatic
 from engine.tools.move import MoveTool
 from engine.tools.talk import TalkTool
 from engine.tools.talk_loud import TalkLoudTool
@@ -37,9 +48,13 @@ from engine.llm_client import LLMClient
 
 # --- WebNarrator: extend Narrator to also emit narration over Socket.IO ---
 class WebNarrator(Narrator):
+    """Narrator that queues narrated lines and broadcasts them in one "log_lines" emit per flush()."""
+
     def __init__(self, world: WorldState, socketio: SocketIO):
         super().__init__(world)
         self._socketio = socketio
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
 
     def render(self, event, extra: Optional[Dict[str, Any]] = None) -> str:
         msg = super().render(event, extra)
@@ -51,16 +66,64 @@ class WebNarrator(Narrator):
                     "actor_id": getattr(event, "actor_id", None),
                     "text": msg,
                 }
-                # Broadcast to all connected clients
-                self._socketio.emit("log_line", payload)
+                # Queued; broadcast to all connected clients on the next flush()
+                with self._pending_lock:
+                    self._pending.append(payload)
         except Exception:
             # Socket emission should never break narration
             pass
         return msg
+
+    def flush(self) -> None:
+        """Broadcast all queued narration lines as a single "log_lines" event."""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            lines = self._pending
+            self._pending = []
+        try:
+            self._socketio.emit("log_lines", lines)
+        except Exception:
+            pass
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """Parses request bodies (request.json) with orjson; anything it rejects gets the stdlib's verdict."""
+
+    def loads(self, s, **kwargs):
+        try:
+            return _orjson.loads(s)
+        except _orjson.JSONDecodeError:
+            # e.g. NaN or integers beyond 64 bits, which the stdlib accepts
+            return super().loads(s, **kwargs)
+
+
 app = Flask(__name__, static_folder='static')
 app.config['SECRET_KEY'] = 'your-secret-key-change-this'
+if _orjson is not None:
+    app.json = _OrjsonProvider(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
 
+
+def _encode_json(obj) -> bytes:
+    """obj as compact UTF-8 JSON bytes, via orjson when it is installed and can encode the payload."""
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_response(obj) -> Response:
+    """jsonify(obj), serialized with orjson when it is installed and can encode the payload."""
+    if _orjson is not None:
+        try:
+            return Response(_orjson.dumps(obj), mimetype="application/json")
+        except TypeError:
+            pass
+    return jsonify(obj)
+
 # -----------------------
 # Hex layout helpers
 # -----------------------
@@ -73,44 +136,51 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 #   W  = (-1,  0)
 #   SW = (-1, +1)
 #   SE = ( 0, +1)
-_HEX_DIR_DELTAS = {
-    "E":  ( 1,  0),
-    "NE": ( 1, -1),
-    "NW": ( 0, -1),
-    "W":  (-1,  0),
-    "SW": (-1,  1),
-    "SE": ( 0,  1),
+# Interned so table keys and normalized results are the same objects as the engine's interned codes
+_CANON_DIRS = tuple(sys.intern(d) for d in ("E", "NE", "NW", "W", "SW", "SE"))
+_HEX_DIR_DELTAS = dict(zip(_CANON_DIRS, (
+    ( 1,  0),
+    ( 1, -1),
+    ( 0, -1),
+    (-1,  0),
+    (-1,  1),
+    ( 0,  1),
+)))
+_HEX_DIR_ORDER = tuple(_HEX_DIR_DELTAS.values())
+_CANON_DIR_SET = frozenset(_CANON_DIRS)
+# Axial deltas to try per preferred direction: the preferred one first, then the rest clockwise
+_HEX_DIR_PRIORITY = {
+    d: (delta,) + tuple(o for o in _HEX_DIR_ORDER if o != delta) for d, delta in _HEX_DIR_DELTAS.items()
 }
 
 # Normalize a variety of direction spellings used in static data
 # to one of the six canonical codes above. This keeps the map
 # consistent and avoids "infinite-degree" graphs: each location
 # can only have up to six neighbors (one per side).
+_DIR_NORMALIZE = {
+    "east": "E", "west": "W",
+    "north_east": "NE", "northeast": "NE",
+    "north_west": "NW", "northwest": "NW",
+    "south_west": "SW", "southwest": "SW",
+    "south_east": "SE", "southeast": "SE",
+    # Graceful aliases for cardinal-only inputs on flat-top:
+    # map "south" to SE (down), and "north" to NW (up)
+    "south": "SE", "north": "NW",
+    # Already-canonical codes (as stored in hex_connections keys and edge directions)
+    "e": "E", "ne": "NE", "nw": "NW", "w": "W", "sw": "SW", "se": "SE",
+}
+# Exact canonical spellings resolve on the first lookup, before any string normalization
+_DIR_NORMALIZE.update({d: d for d in _HEX_DIR_DELTAS})
+
 def _normalize_dir(raw: str) -> Optional[str]:
     if not isinstance(raw, str):
         return None
-    key = raw.strip().lower().replace("-", "_")
-    if key in {"east"}:
-        return "E"
-    if key in {"west"}:
-        return "W"
-    if key in {"north_east", "northeast"}:
-        return "NE"
-    if key in {"north_west", "northwest"}:
-        return "NW"
-    if key in {"south_west", "southwest"}:
-        return "SW"
-    if key in {"south_east", "southeast"}:
-        return "SE"
-    # Graceful aliases for cardinal-only inputs on flat-top:
-    # map "south" to SE (down), and "north" to NW (up)
-    if key == "south":
-        return "SE"
-    if key == "north":
-        return "NW"
-    return None
+    canon = _DIR_NORMALIZE.get(raw)
+    if canon is not None:
+        return canon
+    return _DIR_NORMALIZE.get(raw.strip().lower().replace("-", "_"))
 
-def _compute_axial_coordinates(world) -> Dict[str, Tuple[int, int]]:
+def _compute_axial_coordinates(world, edges_by_loc: Optional[Dict[str, Dict[str, Dict]]] = None) -> Dict[str, Tuple[int, int]]:
     """
     Compute axial (q,r) for every location by BFS using canonical hex directions.
 
@@ -125,6 +195,8 @@ def _compute_axial_coordinates(world) -> Dict[str, Tuple[int, int]]:
     - Prefer a stable root: 'town_square' if present, else any location.
     - If multiple disconnected components exist, place each subsequent component
       far apart on the q-axis to avoid overlap.
+
+    edges_by_loc, when given, holds precomputed _build_edges_for results per location.
     """
     from collections import deque
 
@@ -132,6 +204,29 @@ def _compute_axial_coordinates(world) -> Dict[str, Tuple[int, int]]:
     if not world.locations_static:
         return coords
 
+    # Adjacency pre-pass: loc -> [(neighbor, preferred direction or None)], built once instead of
+    # re-deriving dynamic and static edge maps for every vertex popped by the BFS.
+    # Prefer the dynamic direction, else fall back to the static hex_connections one.
+    adj: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+    for loc_id in list(world.locations_static.keys()) + [l for l in world.locations_state.keys() if l not in world.locations_static]:
+        if edges_by_loc is not None and loc_id in edges_by_loc:
+            edge_meta = edges_by_loc[loc_id]
+        else:
+            edge_meta = _build_edges_for(loc_id, world) or {}
+        static_map: Dict[str, str] = {}
+        st = world.locations_static.get(loc_id)
+        for dkey, nb in ((st.hex_connections or {}).items() if st is not None else ()):
+            canon = _normalize_dir(dkey)
+            if canon:
+                static_map[str(nb)] = canon
+        pairs: List[Tuple[str, Optional[str]]] = []
+        for nb, meta in edge_meta.items():
+            pairs.append((nb, _normalize_dir((meta or {}).get("direction")) or static_map.get(nb)))
+        for nb, canon in static_map.items():
+            if nb not in edge_meta:
+                pairs.append((nb, canon))
+        adj[loc_id] = pairs
+
     # Unplaced set to support multiple components if needed
     unplaced = set(world.locations_static.keys())
 
@@ -145,54 +240,23 @@ def _compute_axial_coordinates(world) -> Dict[str, Tuple[int, int]]:
             cur = dq.popleft()
             cq, cr = coords[cur]
 
-            # Build combined neighbor list. Prefer dynamic, union with static.
-            edge_meta = _build_edges_for(cur, world) or {}
-            # Build static reverse map neighbor -> direction (canonicalized)
-            try:
-                st = world.get_location_static(cur)
-                static_map = {}
-                for dkey, nb in (getattr(st, "hex_connections", {}) or {}).items():
-                    canon = _normalize_dir(dkey)
-                    if canon:
-                        static_map[str(nb)] = canon
-            except Exception:
-                static_map = {}
-
-            # Neighbor id set
-            neighbor_ids = set(edge_meta.keys()) | set(static_map.keys())
-
-            for nb in neighbor_ids:
+            for nb, canon in adj.get(cur, ()):
                 # Already placed -> nothing to do
                 if nb in coords:
                     continue
 
-                # Decide a direction to try first
-                canon = _normalize_dir((edge_meta.get(nb) or {}).get("direction")) if nb in edge_meta else None
-                if not canon:
-                    canon = static_map.get(nb)
-
-                # Generate candidate targets in priority order: preferred dir first, then remaining dirs
-                dir_order = list(_HEX_DIR_DELTAS.keys())
-                if canon in dir_order:
-                    dir_order = [canon] + [d for d in dir_order if d != canon]
-
-                placed_here = False
-                for d in dir_order:
-                    dq1, dr1 = _HEX_DIR_DELTAS[d]
+                # Candidate targets in priority order: preferred dir first, then remaining dirs.
+                # The preferred slot is usually free, so the loop normally stops at its first delta.
+                for dq1, dr1 in _HEX_DIR_PRIORITY.get(canon, _HEX_DIR_ORDER):
                     target = (cq + dq1, cr + dr1)
                     # Free slot?
                     if target not in pos_to_id:
                         coords[nb] = target
                         pos_to_id[target] = nb
-                        if nb in unplaced:
-                            unplaced.discard(nb)
+                        unplaced.discard(nb)
                         dq.append(nb)
-                        placed_here = True
                         break
-
                 # If all six adjacent slots are occupied, skip for now (will be placed when reached from another node)
-                if not placed_here:
-                    continue
 
     # Choose first component root
     if "town_square" in world.locations_static:
@@ -222,33 +286,60 @@ def _build_edges_for(loc_id: str, world) -> Dict[str, Dict]:
     edges: Dict[str, Dict] = {}
 
     # Start from dynamic to preserve current open/closed status
-    try:
-        dyn = world.get_location_state(loc_id)
-        for nb, meta in (getattr(dyn, "connections_state", {}) or {}).items():
-            status = (meta or {}).get("status", "open")
-            d_raw = (meta or {}).get("direction")
-            edges[str(nb)] = {"status": status, "direction": _normalize_dir(d_raw) if d_raw else None}
-    except Exception:
-        pass
+    dyn = world.locations_state.get(loc_id)
+    if dyn is not None:
+        for nb, meta in (dyn.connections_state or {}).items():
+            meta = meta or {}
+            d_raw = meta.get("direction")
+            edges[str(nb)] = {"status": meta.get("status", "open"), "direction": _normalize_dir(d_raw) if d_raw else None}
 
     # Fill any missing directions from static layout
-    try:
-        st = world.get_location_static(loc_id)
-        for dkey, nb in (getattr(st, "hex_connections", {}) or {}).items():
+    st = world.locations_static.get(loc_id)
+    if st is not None:
+        for dkey, nb in (st.hex_connections or {}).items():
             canon = _normalize_dir(dkey)
             rec = edges.setdefault(str(nb), {"status": "open", "direction": None})
-            if rec.get("direction") is None and canon is not None:
+            if rec["direction"] is None and canon is not None:
                 rec["direction"] = canon
-    except Exception:
-        pass
 
     return edges
+
+# Serialized /api/locations response, valid for the same world while its topology_version is unchanged
+_layout_cache: Dict[str, Any] = {"world": None, "version": None, "body": None, "mimetype": "application/json"}
+
 # Global game state
 world = None
 simulator = None
 llm_client = None
 player_id = "npc_sample"
 
+# Serializes every route that mutates the world (player actions and GM edits), so concurrent
+# request threads cannot interleave read-modify-write updates or allocate the same new id.
+# Readers that iterate world dicts (state/locations/actors/world snapshots) take it as well.
+_world_lock = threading.RLock()
+
+
+def with_world_lock(fn):
+    """Run the route while holding the world lock, waiting for it if another mutation is in progress."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _world_lock:
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def with_world_lock_or_busy(fn):
+    """Run a bulk route under the world lock, answering 409 instead of queueing behind another mutation."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _world_lock.acquire(blocking=False):
+            return jsonify({"error": "busy"}), 409
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _world_lock.release()
+    return wrapper
+
 # System prompt for LLM command parsing
 SYSTEM_PROMPT = (
     "You are an intent detector for a text RPG. The player will type any natural language.\n"
@@ -297,17 +388,14 @@ def initialize_game():
         if "npc_bard" in world.npcs:
             bard = world.npcs["npc_bard"]
             # Light, safe seed memories/goals (dataclass objects accepted by engine)
-            from engine.data_models import Memory, Goal
             bard.memories.append(Memory(text="I love to play music in the town square.", tick=0, priority="normal", status="active", source_id="system", confidence=0.9, is_secret=False, payload={"topic":"music","place":"town_square"}))
             bard.goals.append(Goal(text="Perform a short tune for townsfolk.", type="task", priority="normal", status="active", payload={"place":"town_square"}, expiry_tick=None))
         if "npc_blacksmith" in world.npcs:
             smith = world.npcs["npc_blacksmith"]
-            from engine.data_models import Memory, Goal
             smith.memories.append(Memory(text="Running low on scrap metal; check the market.", tick=0, priority="normal", status="active", source_id="system", confidence=0.85, is_secret=False, payload={"topic":"materials","place":"market_square"}))
             smith.goals.append(Goal(text="Acquire materials from the market or trade.", type="task", priority="normal", status="active", payload={"place":"market_square"}, expiry_tick=None))
         if "npc_guard" in world.npcs:
             guard = world.npcs["npc_guard"]
-            from engine.data_models import Memory, Goal
             guard.memories.append(Memory(text="Keep watch over the town and discourage brawls.", tick=0, priority="normal", status="active", source_id="system", confidence=0.9, is_secret=False, payload={"topic":"order"}))
             guard.goals.append(Goal(text="Patrol between town_square and market_square.", type="routine", priority="normal", status="active", payload={"route":["town_square","market_square"]}, expiry_tick=None))
     except Exception as _e:
@@ -363,126 +451,125 @@ def index():
     return send_from_directory('static', 'index.html')
 
 @app.route('/api/state')
+@with_world_lock
 def get_state():
     """Get current game state"""
     if not simulator:
         return jsonify({"error": "Game not initialized"}), 500
-    
+    state = _state_snapshot()
+    if _state_cache["body"] is None:
+        response = _json_response(state)
+        _state_cache["body"] = response.get_data()
+        _state_cache["mimetype"] = response.mimetype
+    return Response(_state_cache["body"], mimetype=_state_cache["mimetype"])
+
+
+# Last get_state payload (and its serialized body), reused while the key below is unchanged
+_state_cache: Dict[str, Any] = {"key": None, "state": None, "body": None, "mimetype": "application/json"}
+
+
+def _state_snapshot() -> Optional[Dict[str, Any]]:
+    """
+    The player-facing state dict, rebuilt only when the simulation may have changed: commands,
+    events, ticks and renderer GM commands bump simulator._context_version, editor endpoints bump
+    it through _emit_refresh, and map edits bump world.topology_version. Treat the result as read-only.
+    """
+    if not simulator:
+        return None
+    key = (id(world), simulator._context_version, world.topology_version, simulator.game_tick, player_id)
+    if _state_cache["key"] != key:
+        _state_cache["state"] = _build_state()
+        _state_cache["body"] = None
+        _state_cache["key"] = key
+    return _state_cache["state"]
+
+
+def _build_state() -> Dict[str, Any]:
     # Get player location
     player_location = world.find_npc_location(player_id)
     
-    # Get location details
-    location_static = None
-    location_state = None
-    if player_location:
-        try:
-            location_static = world.get_location_static(player_location)
-            location_state = world.get_location_state(player_location)
-        except Exception:
-            pass
-    
+    # Get location details; the typed records always carry their fields, so only None needs guarding
+    location_static = world.locations_static.get(player_location) if player_location else None
+    location_state = world.locations_state.get(player_location) if player_location else None
+
     # Get visible NPCs and items
     visible_npcs = []
     visible_items = []
-    if location_state:
-        try:
-            visible_npcs = [nid for nid in getattr(location_state, "occupants", []) if nid != player_id]
-        except Exception:
-            pass
-        try:
-            visible_items = list(getattr(location_state, "items", []))
-        except Exception:
-            pass
-    
+    if location_state is not None:
+        visible_npcs = [nid for nid in location_state.occupants if nid != player_id]
+        visible_items = list(location_state.items)
+
     # Get player details
-    player = world.get_npc(player_id)
+    player = world.npcs.get(player_id)
     inventory = []
     equipped = {}
-    if player:
-        try:
-            inventory = list(getattr(player, "inventory", []))
-        except Exception:
-            pass
-        try:
-            equipped = dict(getattr(player, "slots", {}))
-        except Exception:
-            pass
+    if player is not None:
+        inventory = list(player.inventory)
+        equipped = dict(player.slots)
+
+    # Resolve helpers for names: plain dict lookups on typed records, no exception guards on this hot path
+    instances = world.item_instances
+    blueprints = world.item_blueprints
+    npcs = world.npcs
 
-    # Resolve helpers for names
     def _resolve_item(iid: str) -> Dict[str, str]:
-        try:
-            inst = world.item_instances.get(iid)
-            if inst is None:
-                return {"id": str(iid), "name": str(iid)}
-            bp = world.item_blueprints.get(getattr(inst, "blueprint_id", ""))
-            name = getattr(bp, "name", None) or getattr(inst, "blueprint_id", str(iid))
-            return {"id": str(iid), "name": str(name)}
-        except Exception:
+        inst = instances.get(iid)
+        if inst is None:
             return {"id": str(iid), "name": str(iid)}
+        bp = blueprints.get(inst.blueprint_id)
+        return {"id": str(iid), "name": str((bp.name if bp is not None else None) or inst.blueprint_id)}
 
     def _resolve_npc(nid: str) -> Dict[str, str]:
-        try:
-            npc = world.npcs.get(nid)
-            return {"id": str(nid), "name": getattr(npc, "name", str(nid)) if npc else str(nid)}
-        except Exception:
-            return {"id": str(nid), "name": str(nid)}
+        npc = npcs.get(nid)
+        return {"id": str(nid), "name": npc.name if npc is not None else str(nid)}
 
-    inventory_resolved = [_resolve_item(i) for i in (inventory or [])]
-    equipped_resolved: Dict[str, Optional[Dict[str, str]]] = {}
-    try:
-        for slot, iid in (equipped or {}).items():
-            if iid:
-                equipped_resolved[str(slot)] = _resolve_item(iid)
-            else:
-                equipped_resolved[str(slot)] = None
-    except Exception:
-        equipped_resolved = {}
+    inventory_resolved = [_resolve_item(i) for i in inventory]
+    equipped_resolved: Dict[str, Optional[Dict[str, str]]] = {
+        str(slot): (_resolve_item(iid) if iid else None) for slot, iid in equipped.items()
+    }
 
     # Primary equipped label preference: main_hand else first non-null
     equipped_primary = None
-    try:
-        if isinstance(equipped, dict) and equipped.get("main_hand"):
-            equipped_primary = _resolve_item(equipped["main_hand"])["name"]
-        else:
-            for _slot, _iid in (equipped or {}).items():
-                if _iid:
-                    equipped_primary = _resolve_item(_iid)["name"]
-                    break
-    except Exception:
-        pass
+    if equipped.get("main_hand"):
+        equipped_primary = equipped_resolved["main_hand"]["name"]
+    else:
+        for _slot, _iid in equipped.items():
+            if _iid:
+                equipped_primary = equipped_resolved[str(_slot)]["name"]
+                break
 
-    occupants_resolved = [_resolve_npc(n) for n in (visible_npcs or [])]
-    items_resolved = [_resolve_item(i) for i in (visible_items or [])]
+    occupants_resolved = [_resolve_npc(n) for n in visible_npcs]
+    items_resolved = [_resolve_item(i) for i in visible_items]
 
     # Get connections
-    connections = {}
-    if location_state and hasattr(location_state, "connections_state"):
-        try:
-            connections = dict(getattr(location_state, "connections_state", {}))
-        except Exception:
-            pass
+    # Read-only reference: the payload is only serialized, and every edge edit bumps the snapshot key
+    connections = location_state.connections_state if location_state is not None else {}
+
+    # Derived stats read the attribute dict once
+    attrs = player.attributes if player is not None else {}
+    max_hp = attrs.get("constitution", 10) * 2 if player is not None else 10
 
     # Build response
     state = {
         "game_tick": simulator.game_tick,
         "player": {
             "id": player_id,
-            "name": player.name if player else "Unknown",
-            "hp": getattr(player, "hp", 0) if player else 0,
-            "max_hp": getattr(player, "attributes", {}).get("constitution", 10) * 2 if player else 10,
-            "hunger_stage": getattr(player, "hunger_stage", "sated") if player else "sated",
+            "name": player.name if player is not None else "Unknown",
+            "hp": player.hp if player is not None else 0,
+            "max_hp": max_hp,
+            "hunger_stage": player.hunger_stage if player is not None else "sated",
             "inventory": inventory,
             "inventory_resolved": inventory_resolved,
             "equipped": equipped,
             "equipped_resolved": equipped_resolved,
             "equipped_primary_label": equipped_primary,
-            "attributes": getattr(player, "attributes", {}) if player else {},
-            "skills": getattr(player, "skills", {}) if player else {}
+            "attributes": attrs,
+            "skills": player.skills if player is not None else {}
         },
         "location": {
             "id": player_location,
-            "name": getattr(location_static, "name", player_location) if location_static else player_location,
-            "description": getattr(location_static, "description", "") if location_static else "",
+            "name": location_static.name if location_static is not None else player_location,
+            "description": location_static.description if location_static is not None else "",
             "occupants": visible_npcs,
             "occupants_resolved": occupants_resolved,
             "items": visible_items,
@@ -493,46 +580,56 @@ def get_state():
             "locations": list(world.locations_static.keys())
         }
     }
-    
-    return jsonify(state)
+    return state
 
 @app.route('/api/locations')
+@with_world_lock
 def get_locations():
     """Get all locations with their connections and hex metadata (axial coords, edges).
     Backward compatible: existing fields remain; new fields:
       - hex: {"q": int, "r": int, "orientation": "flat"}
       - edges: {neighbor_id: {"status": "open"|"closed", "direction": "E"|"NE"|"NW"|"W"|"SW"|"SE"}}
     """
-    # Compute axial coordinates once per request (small worlds; can be cached later if needed)
-    coords = _compute_axial_coordinates(world)
+    # The map only changes through topology edits (which bump world.topology_version), so the
+    # serialized response is reused until then
+    version = world.topology_version
+    if _layout_cache["world"] is world and _layout_cache["version"] == version and _layout_cache["body"] is not None:
+        return Response(_layout_cache["body"], mimetype=_layout_cache["mimetype"])
+
+    # Edges once per location, shared by the layout BFS and the response
+    edges_by_loc = {loc_id: _build_edges_for(loc_id, world) for loc_id in world.locations_static}
+    coords = _compute_axial_coordinates(world, edges_by_loc)
 
     locations = {}
     for loc_id, loc_static in world.locations_static.items():
-        try:
-            loc_state = world.get_location_state(loc_id)
-            connections = getattr(loc_state, "connections_state", {})
-        except Exception:
-            connections = {}
+        loc_state = world.locations_state.get(loc_id)
+        connections = loc_state.connections_state if loc_state is not None else {}
 
         # Derive hex metadata
         q, r = coords.get(loc_id, (0, 0))
-        edges = _build_edges_for(loc_id, world)
+        edges = edges_by_loc[loc_id]
 
         locations[loc_id] = {
             "id": loc_id,
-            "name": getattr(loc_static, "name", loc_id),
-            "description": getattr(loc_static, "description", ""),
+            "name": loc_static.name,
+            "description": loc_static.description,
             # Existing fields preserved for compatibility
             "connections": connections,
-            "hex_connections": getattr(loc_static, "hex_connections", {}),
+            "hex_connections": loc_static.hex_connections,
             # New fields for proper hex rendering and finite-degree constraints
             "hex": {"q": q, "r": r, "orientation": "flat"},
             "edges": edges,
         }
 
-    return jsonify(locations)
+    response = _json_response(locations)
+    _layout_cache["world"] = world
+    _layout_cache["version"] = version
+    _layout_cache["body"] = response.get_data()
+    _layout_cache["mimetype"] = response.mimetype
+    return response
 
 @app.route('/api/actors')
+@with_world_lock
 def get_actors():
     """Get all actors in the world"""
     actors = []
@@ -547,7 +644,7 @@ def get_actors():
             "hunger_stage": npc.hunger_stage
         })
     
-    return jsonify(actors)
+    return _json_response(actors)
 
 @app.route('/api/parse-command', methods=['POST'])
 def parse_command():
@@ -562,29 +659,9 @@ def parse_command():
         return jsonify({"error": "No command provided"}), 400
     
     try:
-        # Get current state for context
-        state_response = get_state()
-        state_data = state_response.get_json(silent=True) if hasattr(state_response, "get_json") else None
-        if not state_data:
-            state_data = {}
-        
-        # Build additional context for the LLM
-        player = state_data.get("player", {})
-        location = state_data.get("location", {})
-        
-        additional_context = {
-            "player_id": player_id,
-            "location_id": location.get("id"),
-            "visible_items": location.get("items", []),
-            "visible_npcs": location.get("occupants", []),
-            "inventory_items": player.get("inventory", []),
-            "stats": {
-                "hp": player.get("hp"),
-                "max_hp": player.get("max_hp"),
-                "hunger_stage": player.get("hunger_stage"),
-            },
-            "time_tick": simulator.game_tick,
-        }
+        # Build additional context for the LLM (under the lock; the LLM call itself runs without it)
+        with _world_lock:
+            additional_context = _build_player_context()
         
         # Parse command using LLM
         command = llm_client.parse_command(user_input, SYSTEM_PROMPT, additional_context=additional_context)
@@ -593,7 +670,27 @@ def parse_command():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def _build_player_context() -> Dict[str, Any]:
+    """The player's LLM disambiguation context, read straight from the world without a state snapshot."""
+    player = world.npcs.get(player_id)
+    location_id = world.find_npc_location(player_id)
+    loc_state = world.locations_state.get(location_id) if location_id else None
+    return {
+        "player_id": player_id,
+        "location_id": location_id,
+        "visible_items": list(loc_state.items) if loc_state is not None else [],
+        "visible_npcs": [nid for nid in loc_state.occupants if nid != player_id] if loc_state is not None else [],
+        "inventory_items": list(player.inventory) if player is not None else [],
+        "stats": {
+            "hp": player.hp if player is not None else 0,
+            "max_hp": player.attributes.get("constitution", 10) * 2 if player is not None else 10,
+            "hunger_stage": player.hunger_stage if player is not None else "sated",
+        },
+        "time_tick": simulator.game_tick,
+    }
+
 @app.route('/api/action', methods=['POST'])
+@with_world_lock
 def perform_action():
     """Perform a game action"""
     if not simulator:
@@ -606,310 +703,544 @@ def perform_action():
         # Process the command
         simulator.process_command(player_id, action)
         
-        # Drain events generated by the player's action
-        while simulator.event_queue:
-            simulator.tick()
-        
-        # Run NPC cycle
-        any_npc_acted = False
-        while simulator.run_npc_round():
-            any_npc_acted = True
-        if any_npc_acted:
-            simulator.tick()
-        
-        # Ensure time advances until the player is ready again
-        while world.get_npc(player_id).next_available_tick > simulator.game_tick:
-            simulator.tick()
-        
-        # Emit updated state to all clients
-        socketio.emit('state_update', get_state().json)
+        # Drain the action's events, run the NPC cycle and wait out the player's cooldown
+        simulator.advance_until_player_ready(player_id)
+
+        # Send the narration from this action in one batch, then the updated state
+        _emit_refresh(player_id)
         
         return jsonify({"success": True})
     except Exception as e:
+        # Lines narrated before the failure still go out
+        _flush_narration()
         return jsonify({"error": str(e)}), 400
 
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
-    emit('state_update', get_state().json)
+    # Live clients share one room; the debounced state_delta pushes go there instead of being polled
+    join_room(WORLD_ROOM)
+    with _world_lock:
+        state = _state_snapshot()
+    emit('state_update', state)
 
 # ========== World/Editor API (creator-tool endpoints) ==========
 
 @app.route('/api/world', methods=['GET'])
+@with_world_lock
 def api_world_snapshot():
     """Return a compact world snapshot for editor UIs."""
     try:
-        # Locations with occupants/items and dynamic connections
-        locations = []
-        for loc_id, st in world.locations_state.items():
-            try:
-                stat = world.get_location_static(loc_id)
-            except Exception:
-                stat = None
-            locations.append({
-                "id": str(loc_id),
-                "description": getattr(stat, "description", ""),
-                "occupants": list(getattr(st, "occupants", []) or []),
-                "items": list(getattr(st, "items", []) or []),
-                "connections": dict(getattr(st, "connections_state", {}) or {}),
-            })
-        # NPCs with their current location
-        npcs = []
-        for nid, npc in world.npcs.items():
-            npcs.append({
-                "id": nid,
-                "name": getattr(npc, "name", nid),
-                "location_id": world.find_npc_location(nid),
-                "hp": getattr(npc, "hp", 0),
-            })
-        return jsonify({"locations": locations, "npcs": npcs})
+        # Same staleness signals as the /api/state cache: the simulation and topology versions
+        key = (id(world), getattr(simulator, "_context_version", None), world.topology_version)
+        if _world_snapshot_cache["key"] != key:
+            response = _json_response(_rebuild_world_snapshot())
+            _world_snapshot_cache["body"] = response.get_data()
+            _world_snapshot_cache["mimetype"] = response.mimetype
+            _world_snapshot_cache["key"] = key
+        return Response(_world_snapshot_cache["body"], mimetype=_world_snapshot_cache["mimetype"])
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-def _emit_refresh():
+# Serialized /api/world body, reused while its key is unchanged
+_world_snapshot_cache: Dict[str, Any] = {"key": None, "body": None, "mimetype": "application/json"}
+
+
+def _rebuild_world_snapshot() -> Dict[str, Any]:
+    # Locations with occupants/items and dynamic connections
+    locations = []
+    statics = world.locations_static
+    for loc_id, st in world.locations_state.items():
+        stat = statics.get(loc_id)
+        locations.append({
+            "id": str(loc_id),
+            "description": stat.description if stat is not None else "",
+            # Serialized immediately by the caller, so live lists/dicts need no defensive copies
+            "occupants": st.occupants,
+            "items": st.items,
+            "connections": st.connections_state,
+        })
+    # NPCs with their current location
+    npcs = []
+    for nid, npc in world.npcs.items():
+        npcs.append({
+            "id": nid,
+            "name": npc.name,
+            "location_id": world.find_npc_location(nid),
+            "hp": npc.hp,
+        })
+    return {"locations": locations, "npcs": npcs}
+
+
+def _flush_narration():
+    narrator = getattr(simulator, "narrator", None)
+    if isinstance(narrator, WebNarrator):
+        narrator.flush()
+
+
+# Trailing-edge window for state_update broadcasts: edits arriving within it share one snapshot
+REFRESH_DEBOUNCE_SECONDS = 0.05
+WORLD_ROOM = "world"
+_refresh_lock = threading.Lock()
+_refresh_scheduled = False
+# Entity ids touched since the last broadcast, shipped with the state_delta so clients can skip untouched views
+_refresh_dirty: set = set()
+
+
+def _deferred_refresh():
+    global _refresh_scheduled, _refresh_dirty
+    socketio.sleep(REFRESH_DEBOUNCE_SECONDS)
+    # Clear the flag before snapshotting so an edit landing during the build schedules its own refresh
+    with _refresh_lock:
+        _refresh_scheduled = False
+        changed, _refresh_dirty = _refresh_dirty, set()
     try:
-        socketio.emit('state_update', get_state().json)
+        with app.app_context():
+            _flush_narration()
+            # Snapshot under the world lock so a concurrent edit cannot resize dicts mid-iteration
+            with _world_lock:
+                delta = {
+                    "changed": sorted(changed),
+                    "topology_version": world.topology_version if world is not None else None,
+                    "state": _state_snapshot(),
+                }
+            # Encode once as UTF-8 JSON bytes (sent as a binary frame) rather than handing Socket.IO a dict
+            socketio.emit('state_delta', _encode_json(delta), to=WORLD_ROOM)
+    except Exception as e:
+        # A background task has nobody to report to; at least leave a trace of the lost broadcast
+        print(f"[web] state_delta broadcast failed: {e}")
+
+
+def _emit_refresh(*changed_ids: str):
+    """Schedule a narration flush and state_delta broadcast at the end of the debounce window.
+
+    changed_ids names the locations/NPCs/items an edit touched; they accumulate until the broadcast.
+    """
+    global _refresh_scheduled
+    # Editor endpoints mutate through _gm_* helpers directly; mark the cached state snapshot stale
+    if simulator is not None:
+        simulator._context_version += 1
+    with _refresh_lock:
+        _refresh_dirty.update(i for i in changed_ids if isinstance(i, str) and i)
+        if _refresh_scheduled:
+            return
+        _refresh_scheduled = True
+    try:
+        socketio.start_background_task(_deferred_refresh)
     except Exception:
-        pass
+        with _refresh_lock:
+            _refresh_scheduled = False
 
 
-# ----- Location endpoints -----
-@app.route('/api/locations/create', methods=['POST'])
-def api_loc_create():
-    data = request.json or {}
+# ----- Editor operations -----
+# Each op takes the request's JSON args and returns (response body, HTTP status) without broadcasting.
+# The single-op routes and /api/batch both dispatch through _do_op; callers emit one refresh afterwards.
+OpResult = Tuple[Dict[str, Any], int]
+
+
+def _op_loc_create(data: Dict[str, Any]) -> OpResult:
     loc = data.get("location_id")
     desc = data.get("description", "")
     if not isinstance(loc, str) or not loc:
-        return jsonify({"error": "location_id required"}), 400
+        return {"error": "location_id required"}, 400
     ok = simulator._gm_create_location(loc, str(desc or ""))
     if not ok:
-        return jsonify({"error": "failed to create"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed to create"}, 400
+    return {"success": True}, 200
 
-@app.route('/api/locations/delete', methods=['POST'])
-def api_loc_delete():
-    data = request.json or {}
+def _op_loc_delete(data: Dict[str, Any]) -> OpResult:
     loc = data.get("location_id")
     if not isinstance(loc, str) or not loc:
-        return jsonify({"error": "location_id required"}), 400
+        return {"error": "location_id required"}, 400
     ok = simulator._gm_delete_location(loc)
     if not ok:
-        return jsonify({"error": "failed to delete (occupied?)"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed to delete (occupied?)"}, 400
+    return {"success": True}, 200
 
-@app.route('/api/locations/connect', methods=['POST'])
-def api_loc_connect():
-    data = request.json or {}
+def _op_loc_connect(data: Dict[str, Any]) -> OpResult:
     a = data.get("a"); b = data.get("b")
     status = str(data.get("status", "open")).lower()
     if not isinstance(a, str) or not isinstance(b, str) or a == b:
-        return jsonify({"error": "invalid a/b"}), 400
+        return {"error": "invalid a/b"}, 400
     ok = simulator._gm_connect_locations(a, b, status=status)
     if not ok:
-        return jsonify({"error": "failed to connect"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed to connect"}, 400
+    return {"success": True}, 200
 
-@app.route('/api/locations/disconnect', methods=['POST'])
-def api_loc_disconnect():
-    data = request.json or {}
+def _op_loc_disconnect(data: Dict[str, Any]) -> OpResult:
     a = data.get("a"); b = data.get("b")
     if not isinstance(a, str) or not isinstance(b, str) or a == b:
-        return jsonify({"error": "invalid a/b"}), 400
+        return {"error": "invalid a/b"}, 400
     ok = simulator._gm_disconnect_locations(a, b)
     if not ok:
-        return jsonify({"error": "failed to disconnect"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed to disconnect"}, 400
+    return {"success": True}, 200
 
-@app.route('/api/edges/status', methods=['POST'])
-def api_edge_status():
-    data = request.json or {}
+def _op_edge_status(data: Dict[str, Any]) -> OpResult:
     a = data.get("a"); b = data.get("b")
     status = data.get("status", "open")
     if not isinstance(a, str) or not isinstance(b, str) or a == b:
-        return jsonify({"error": "invalid a/b"}), 400
+        return {"error": "invalid a/b"}, 400
     ok = simulator._gm_set_edge_status(a, b, status)
     if not ok:
-        return jsonify({"error": "failed to set status"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
-
+        return {"error": "failed to set status"}, 400
+    return {"success": True}, 200
+
+def _set_edge_direction(connections: Dict[str, Dict], nb: str, direction: str) -> None:
+    """Set connections[nb]["direction"], creating the entry as open if missing and keeping an existing status."""
+    ent = connections.get(nb)
+    if ent is None:
+        connections[nb] = {"status": "open", "direction": direction}
+        return
+    if "status" not in ent:
+        ent["status"] = "open"
+    ent["direction"] = direction
+
+def _set_bidirectional_edge(st_a: LocationState, st_b: LocationState, direction: str) -> None:
+    """Point the a->b edge at direction and the b->a edge at its inverse (both created open if missing)."""
+    _set_edge_direction(st_a.connections_state, st_b.id, direction)
+    _set_edge_direction(st_b.connections_state, st_a.id, HEX_DIR_INVERSE[direction])
+
+def _op_edge_direction(data: Dict[str, Any]) -> OpResult:
+    """
+    Set the direction metadata on an edge in BOTH directions using canonical codes:
+      E, NE, NW, W, SW, SE
+    Creates the edge entries if missing, preserves open/closed status if present.
+    """
+    a = data.get("a"); b = data.get("b"); d = data.get("direction")
+    if not isinstance(a, str) or not isinstance(b, str) or a == b:
+        return {"error": "invalid a/b"}, 400
+    if d not in _CANON_DIR_SET:
+        return {"error": "direction must be one of E,NE,NW,W,SW,SE"}, 400
+    try:
+        st_a = world.locations_state.get(a)
+        st_b = world.locations_state.get(b)
+        if st_a is None or st_b is None:
+            return {"error": "unknown locations"}, 400
+        _set_bidirectional_edge(st_a, st_b, d)
+        world.refresh_neighbor_sets(a, b)
+        return {"success": True}, 200
+    except Exception as e:
+        return {"error": str(e)}, 500
 
-# ----- NPC endpoints -----
-@app.route('/api/npcs/spawn', methods=['POST'])
-def api_npc_spawn():
-    data = request.json or {}
+def _op_npc_spawn(data: Dict[str, Any]) -> OpResult:
     name = data.get("name") or None
     loc = data.get("location_id")
     if not isinstance(loc, str) or not loc:
-        return jsonify({"error": "location_id required"}), 400
-    nid = simulator._gm_spawn_npc(loc)
+        return {"error": "location_id required"}, 400
+    # Named at creation so the location's occupant name cache starts out with the right name
+    nid = simulator._gm_spawn_npc(loc, name=name if isinstance(name, str) else None)
     if not nid:
-        return jsonify({"error": "failed to spawn"}), 400
-    if isinstance(name, str) and nid in world.npcs:
-        try:
-            world.npcs[nid].name = name
-        except Exception:
-            pass
-    _emit_refresh()
-    return jsonify({"success": True, "npc_id": nid})
+        return {"error": "failed to spawn"}, 400
+    return {"success": True, "npc_id": nid}, 200
 
-@app.route('/api/npcs/delete', methods=['POST'])
-def api_npc_delete():
-    data = request.json or {}
+def _op_npc_delete(data: Dict[str, Any]) -> OpResult:
     npc_id = data.get("npc_id")
     if not isinstance(npc_id, str) or not npc_id:
-        return jsonify({"error": "npc_id required"}), 400
+        return {"error": "npc_id required"}, 400
     ok = simulator._gm_delete_npc(npc_id)
     if not ok:
-        return jsonify({"error": "failed to delete"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed to delete"}, 400
+    return {"success": True}, 200
 
-@app.route('/api/npcs/move', methods=['POST'])
-def api_npc_move():
-    data = request.json or {}
+def _op_npc_move(data: Dict[str, Any]) -> OpResult:
     npc_id = data.get("npc_id")
     to = data.get("to_location_id")
     if not isinstance(npc_id, str) or not isinstance(to, str):
-        return jsonify({"error": "npc_id and to_location_id required"}), 400
+        return {"error": "npc_id and to_location_id required"}, 400
     ok = simulator._gm_move_actor(npc_id, to)
     if not ok:
-        return jsonify({"error": "failed to move"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed to move"}, 400
+    return {"success": True}, 200
 
-@app.route('/api/npcs/memory/add', methods=['POST'])
-def api_npc_mem_add():
-    data = request.json or {}
+def _op_mem_add(data: Dict[str, Any]) -> OpResult:
     npc_id = data.get("npc_id"); text = data.get("text", "")
     if not isinstance(npc_id, str) or not isinstance(text, str) or not text:
-        return jsonify({"error": "npc_id and text required"}), 400
+        return {"error": "npc_id and text required"}, 400
     simulator._gm_add_memory(npc_id, text)
-    _emit_refresh()
-    return jsonify({"success": True})
+    return {"success": True}, 200
 
-@app.route('/api/npcs/memory/remove', methods=['POST'])
-def api_npc_mem_remove():
-    data = request.json or {}
+def _op_mem_remove(data: Dict[str, Any]) -> OpResult:
     npc_id = data.get("npc_id")
     if not isinstance(npc_id, str):
-        return jsonify({"error": "npc_id required"}), 400
+        return {"error": "npc_id required"}, 400
     ok = simulator._gm_remove_memory(npc_id)
     if not ok:
-        return jsonify({"error": "failed"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed"}, 400
+    return {"success": True}, 200
 
-@app.route('/api/npcs/goal/add', methods=['POST'])
-def api_npc_goal_add():
-    data = request.json or {}
+def _op_goal_add(data: Dict[str, Any]) -> OpResult:
     npc_id = data.get("npc_id"); text = data.get("text", "")
     if not isinstance(npc_id, str) or not isinstance(text, str) or not text:
-        return jsonify({"error": "npc_id and text required"}), 400
+        return {"error": "npc_id and text required"}, 400
     simulator._gm_add_goal(npc_id, text)
-    _emit_refresh()
-    return jsonify({"success": True})
+    return {"success": True}, 200
 
-@app.route('/api/npcs/goal/remove', methods=['POST'])
-def api_npc_goal_remove():
-    data = request.json or {}
+def _op_goal_remove(data: Dict[str, Any]) -> OpResult:
     npc_id = data.get("npc_id")
     if not isinstance(npc_id, str):
-        return jsonify({"error": "npc_id required"}), 400
+        return {"error": "npc_id required"}, 400
     ok = simulator._gm_remove_goal(npc_id)
     if not ok:
-        return jsonify({"error": "failed"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
-
+        return {"error": "failed"}, 400
+    return {"success": True}, 200
 
-# ----- Item endpoints -----
-@app.route('/api/items/spawn', methods=['POST'])
-def api_item_spawn():
-    data = request.json or {}
+def _op_item_spawn(data: Dict[str, Any]) -> OpResult:
     loc = data.get("location_id")
     bp = data.get("blueprint_id")
     if not isinstance(loc, str) or not loc:
-        return jsonify({"error": "location_id required"}), 400
+        return {"error": "location_id required"}, 400
     # Use GM helper if no explicit blueprint, else create directly
+    if bp and bp not in world.item_blueprints:
+        return {"error": f"unknown blueprint_id: {bp}"}, 400
     if not bp:
         iid = simulator._gm_spawn_item(loc)
     else:
         try:
             # Create instance directly mirroring _gm_spawn_item behavior
-            idx = 1
-            while True:
-                cand = f"item_gm_{idx}"
-                if cand not in world.item_instances:
-                    break
-                idx += 1
-            iid = cand
-            from engine.data_models import ItemInstance, LocationState
+            iid = f"item_gm_{world.next_gm_index('item_gm_', world.item_instances)}"
             inst = ItemInstance(id=iid, blueprint_id=bp, current_location=loc, owner_id=None)
             world.item_instances[iid] = inst
-            if loc not in world.locations_state:
-                world.locations_state[loc] = LocationState(id=loc)
-            st = world.locations_state[loc]
-            if iid not in st.items:
-                st.items.append(iid)
+            world.add_location_item(loc, iid)
         except Exception as e:
-            return jsonify({"error": f"failed: {e}"}), 400
+            return {"error": f"failed: {e}"}, 400
     if not iid:
-        return jsonify({"error": "failed to spawn"}), 400
-    _emit_refresh()
-    return jsonify({"success": True, "item_id": iid})
+        return {"error": "failed to spawn"}, 400
+    return {"success": True, "item_id": iid}, 200
 
-@app.route('/api/items/delete', methods=['POST'])
-def api_item_delete():
-    data = request.json or {}
+def _op_item_delete(data: Dict[str, Any]) -> OpResult:
     item_id = data.get("item_id")
     if not isinstance(item_id, str) or not item_id:
-        return jsonify({"error": "item_id required"}), 400
+        return {"error": "item_id required"}, 400
     ok = simulator._gm_delete_item(item_id)
     if not ok:
-        return jsonify({"error": "failed"}), 400
-    _emit_refresh()
-    return jsonify({"success": True})
+        return {"error": "failed"}, 400
+    return {"success": True}, 200
+
+
+_GM_OPS = {
+    "loc_create": _op_loc_create,
+    "loc_delete": _op_loc_delete,
+    "loc_connect": _op_loc_connect,
+    "loc_disconnect": _op_loc_disconnect,
+    "edge_status": _op_edge_status,
+    "edge_direction": _op_edge_direction,
+    "npc_spawn": _op_npc_spawn,
+    "npc_delete": _op_npc_delete,
+    "npc_move": _op_npc_move,
+    "mem_add": _op_mem_add,
+    "mem_remove": _op_mem_remove,
+    "goal_add": _op_goal_add,
+    "goal_remove": _op_goal_remove,
+    "item_spawn": _op_item_spawn,
+    "item_delete": _op_item_delete,
+}
 
 
-# ----- Edge direction endpoint (canonical hex directions: E, NE, NW, W, SW, SE) -----
-@app.route('/api/edges/direction', methods=['POST'])
-def api_edge_set_direction():
+# Request/response keys that name the entities an op touches
+_OP_ID_KEYS = ("location_id", "to_location_id", "a", "b", "npc_id", "item_id")
+
+
+def _op_changed_ids(args: Dict[str, Any], body: Dict[str, Any]) -> List[str]:
+    ids = [args.get(k) for k in _OP_ID_KEYS]
+    ids.extend(body.get(k) for k in ("npc_id", "item_id"))
+    return [i for i in ids if isinstance(i, str) and i]
+
+
+def _do_op(op: Any, args: Dict[str, Any]) -> OpResult:
+    handler = _GM_OPS.get(op) if isinstance(op, str) else None
+    if handler is None:
+        return {"error": f"unknown op: {op}"}, 400
+    return handler(args)
+
+
+def _run_op(op: str):
+    """Run one editor op for a single-op route and broadcast a refresh if it succeeded."""
+    args = request.json or {}
+    body, status = _do_op(op, args)
+    if status == 200:
+        _emit_refresh(*_op_changed_ids(args, body))
+    return _json_response(body), status
+
+
+@app.route('/api/batch', methods=['POST'])
+@with_world_lock
+def api_batch():
     """
-    Set the direction metadata on an edge in BOTH directions using canonical codes:
-      E, NE, NW, W, SW, SE
-    Creates the edge entries if missing, preserves open/closed status if present.
+    Apply several editor ops in one request: {"ops": [{"op": "mem_add", "args": {...}}, ...]}.
+    Ops run in order and independently; the response lists each op's body (with its "status"),
+    and a single refresh carrying every touched id is broadcast if any op succeeded.
     """
     data = request.json or {}
-    a = data.get("a"); b = data.get("b"); d = data.get("direction")
-    if not isinstance(a, str) or not isinstance(b, str) or a == b:
-        return jsonify({"error": "invalid a/b"}), 400
-    if d not in {"E","NE","NW","W","SW","SE"}:
-        return jsonify({"error": "direction must be one of E,NE,NW,W,SW,SE"}), 400
-    try:
-        st_a = world.locations_state.get(a)
-        st_b = world.locations_state.get(b)
-        if st_a is None or st_b is None:
-            return jsonify({"error": "unknown locations"}), 400
-        ent_a = st_a.connections_state.setdefault(b, {})
-        ent_b = st_b.connections_state.setdefault(a, {})
-        ent_a["status"] = ent_a.get("status", "open")
-        ent_b["status"] = ent_b.get("status", "open")
-        inverse = {"E":"W","W":"E","NE":"SW","SW":"NE","NW":"SE","SE":"NW"}
-        ent_a["direction"] = d
-        ent_b["direction"] = inverse[d]
-        _emit_refresh()
-        return jsonify({"success": True})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    ops = data.get("ops")
+    if not isinstance(ops, list):
+        return jsonify({"error": "ops must be a list"}), 400
+    results = []
+    changed: List[str] = []
+    succeeded = False
+    for entry in ops:
+        if not isinstance(entry, dict):
+            results.append({"error": "op must be an object", "status": 400})
+            continue
+        args = entry.get("args") if isinstance(entry.get("args"), dict) else {}
+        body, status = _do_op(entry.get("op"), args)
+        results.append(dict(body, status=status))
+        if status == 200:
+            succeeded = True
+            changed.extend(_op_changed_ids(args, body))
+    if succeeded:
+        _emit_refresh(*changed)
+    return _json_response({"results": results})
+
+
+# ----- Location endpoints -----
+@app.route('/api/locations/create', methods=['POST'])
+@with_world_lock
+def api_loc_create():
+    return _run_op("loc_create")
+
+@app.route('/api/locations/delete', methods=['POST'])
+@with_world_lock
+def api_loc_delete():
+    return _run_op("loc_delete")
+
+@app.route('/api/locations/connect', methods=['POST'])
+@with_world_lock
+def api_loc_connect():
+    return _run_op("loc_connect")
+
+@app.route('/api/locations/disconnect', methods=['POST'])
+@with_world_lock
+def api_loc_disconnect():
+    return _run_op("loc_disconnect")
+
+@app.route('/api/edges/status', methods=['POST'])
+@with_world_lock
+def api_edge_status():
+    return _run_op("edge_status")
+
+
+# ----- NPC endpoints -----
+@app.route('/api/npcs/spawn', methods=['POST'])
+@with_world_lock
+def api_npc_spawn():
+    return _run_op("npc_spawn")
+
+@app.route('/api/npcs/delete', methods=['POST'])
+@with_world_lock
+def api_npc_delete():
+    return _run_op("npc_delete")
+
+@app.route('/api/npcs/move', methods=['POST'])
+@with_world_lock
+def api_npc_move():
+    return _run_op("npc_move")
+
+@app.route('/api/npcs/memory/add', methods=['POST'])
+@with_world_lock
+def api_npc_mem_add():
+    return _run_op("mem_add")
+
+@app.route('/api/npcs/memory/remove', methods=['POST'])
+@with_world_lock
+def api_npc_mem_remove():
+    return _run_op("mem_remove")
+
+@app.route('/api/npcs/goal/add', methods=['POST'])
+@with_world_lock
+def api_npc_goal_add():
+    return _run_op("goal_add")
+
+@app.route('/api/npcs/goal/remove', methods=['POST'])
+@with_world_lock
+def api_npc_goal_remove():
+    return _run_op("goal_remove")
+
+
+# ----- Item endpoints -----
+@app.route('/api/items/spawn', methods=['POST'])
+@with_world_lock
+def api_item_spawn():
+    return _run_op("item_spawn")
+
+@app.route('/api/items/delete', methods=['POST'])
+@with_world_lock
+def api_item_delete():
+    return _run_op("item_delete")
+
+
+# ----- Edge direction endpoint (canonical hex directions: E, NE, NW, W, SW, SE) -----
+@app.route('/api/edges/direction', methods=['POST'])
+@with_world_lock
+def api_edge_set_direction():
+    return _run_op("edge_direction")
+
+
+# path -> digest of the bytes last written to (or found in) that file by _persist_json
+# (threads of _persist_pool only ever touch distinct keys)
+_persist_hash_cache: Dict[str, bytes] = {}
+# Small pool for overlapping the independent location-file writes of reset_hexgrid
+_persist_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="persist")
+
+
+def _persist_json(path: Path, obj: Any) -> bool:
+    """Write obj as indented JSON unless the file already holds exactly those bytes. Returns True if written."""
+    buf = None
+    if _orjson is not None:
+        try:
+            buf = _orjson.dumps(obj, option=_orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    if buf is None:
+        buf = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    digest = hashlib.blake2b(buf, digest_size=16).digest()
+    key = str(path)
+    cached = _persist_hash_cache.get(key)
+    if cached is None and path.is_file():
+        # First visit since startup: a read is far cheaper than rewriting an unchanged file
+        cached = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+    if cached == digest:
+        _persist_hash_cache[key] = digest
+        return False
+    # Write a sibling temp file and rename it over the target so readers never see a torn file
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(buf)
+    os.replace(tmp, path)
+    _persist_hash_cache[key] = digest
+    return True
+
+
+# Locations kept by reset_hexgrid and their canonical static hex layout around the hub
+_HEXGRID_KEEP_IDS = ("town_square", "tavern", "market_square", "alley")
+_HEXGRID_LAYOUT = {
+    "town_square": {"NE": "tavern", "SE": "market_square", "SW": "alley"},
+    "tavern":      {"SW": "town_square"},
+    "market_square": {"NW": "town_square"},
+    "alley":       {"NE": "town_square"},
+}
+
+
+def _hexgrid_is_canonical() -> bool:
+    """True when the world holds exactly the keeper locations, wired as _HEXGRID_LAYOUT in both directions."""
+    keep = set(_HEXGRID_KEEP_IDS)
+    if world.locations_state.keys() != keep or world.locations_static.keys() != keep:
+        return False
+    for a, conns in _HEXGRID_LAYOUT.items():
+        if world.locations_static[a].hex_connections != conns:
+            return False
+        conn_a = world.locations_state[a].connections_state
+        for d, b in conns.items():
+            ent_a = conn_a.get(b)
+            ent_b = world.locations_state[b].connections_state.get(a)
+            if (ent_a is None or ent_b is None or "status" not in ent_a or "status" not in ent_b
+                    or ent_a.get("direction") != d or ent_b.get("direction") != HEX_DIR_INVERSE[d]):
+                return False
+    return True
 
 
 @app.route('/api/world/reset_hexgrid', methods=['POST'])
+@with_world_lock_or_busy
 def api_world_reset_hexgrid():
     """
     Hard reset the top-level world into a canonical flat-top hex cross of four locations
@@ -925,125 +1256,91 @@ def api_world_reset_hexgrid():
     - Rewrites static.hex_connections and dynamic connections_state with open status and directions
     - Attempts to delete any other locations
     - Persists updated JSON back to data/locations/* files
+    Returns {"success": true, "noop": true} without touching anything when the world already matches.
     """
+    # Repeated resets of an already canonical world skip the rewrite, the persistence and the broadcast
+    if _hexgrid_is_canonical():
+        return jsonify({"success": True, "noop": True})
+
+    keep_ids = _HEXGRID_KEEP_IDS
+    # Ensure base locations exist (create if missing)
+    for loc in keep_ids:
+        if loc not in world.locations_state:
+            simulator._gm_create_location(loc, description=f"{loc.replace('_',' ').title()}")
+
+    # Move actors in unknown/extra locations to town_square, then delete extras
+    # (the _gm_* helpers report their own failures and return False)
+    hub = "town_square"
+    for loc_id in list(world.locations_state.keys()):
+        if loc_id in keep_ids:
+            continue
+        st = world.locations_state.get(loc_id)
+        if not st:
+            continue
+        # Move occupants to hub
+        for npc_id in list(st.occupants):
+            simulator._gm_move_actor(npc_id, hub)
+        # Attempt delete
+        simulator._gm_delete_location(loc_id)
+
+    # Ensure static entries exist for the keepers
+    for loc_id in keep_ids:
+        if loc_id not in world.locations_static:
+            world.locations_static[loc_id] = LocationStatic(id=loc_id, description=f"{loc_id.replace('_',' ').title()}")
+            world.invalidate_location_names()
+
+    # Apply static hex_connections and dynamic connections with directions
+    locs_static = world.locations_static
+    locs_state = world.locations_state
+    for a, conns in _HEXGRID_LAYOUT.items():
+        st = locs_static.get(a)
+        if st:
+            st.hex_connections = {k: v for k, v in conns.items()}
+        # ensure dynamic entries
+        st_a = locs_state.get(a)
+        if st_a is None:
+            st_a = locs_state[a] = LocationState(id=a)
+        for d, b in conns.items():
+            st_b = locs_state.get(b)
+            if st_b is None:
+                st_b = locs_state[b] = LocationState(id=b)
+            _set_bidirectional_edge(st_a, st_b, d)
+    world.rebuild_hex_dir_index()
+    world.refresh_neighbor_sets()
+
+    # Persist to JSON files on disk
+    base = Path("data") / "locations"
+    # Collect the keeper payloads, then write them concurrently (the writes are independent files)
+    pending: List[Tuple[Path, Dict[str, Any]]] = []
+    for loc_id in keep_ids:
+        ls = world.locations_static.get(loc_id)
+        st = world.locations_state.get(loc_id)
+        if ls:
+            pending.append((base / f"{loc_id}_static.json", {
+                "id": ls.id,
+                "description": getattr(ls, "description", ""),
+                "tags": getattr(ls, "tags", {"inherent": []}),
+                "hex_connections": getattr(ls, "hex_connections", {}),
+            }))
+        if st:
+            pending.append((base / f"{loc_id}_state.json", {
+                "id": st.id,
+                "occupants": list(getattr(st, "occupants", []) or []),
+                "items": list(getattr(st, "items", []) or []),
+                "sublocations": list(getattr(st, "sublocations", []) or []),
+                "transient_effects": list(getattr(st, "transient_effects", []) or []),
+                "connections_state": getattr(st, "connections_state", {}) or {},
+            }))
     try:
-        keep_ids = ["town_square", "tavern", "market_square", "alley"]
-        # Ensure base locations exist (create if missing)
-        for loc in keep_ids:
-            if loc not in world.locations_state:
-                simulator._gm_create_location(loc, description=f"{loc.replace('_',' ').title()}")
-
-        # Move actors in unknown/extra locations to town_square, then delete extras
-        hub = "town_square"
-        for loc_id in list(world.locations_state.keys()):
-            if loc_id in keep_ids:
-                continue
-            st = world.locations_state.get(loc_id)
-            if not st:
-                continue
-            # Move occupants to hub
-            for npc_id in list(getattr(st, "occupants", []) or []):
-                try:
-                    simulator._gm_move_actor(npc_id, hub)
-                except Exception:
-                    pass
-            # Attempt delete
-            try:
-                simulator._gm_delete_location(loc_id)
-            except Exception:
-                pass
-
-        # Canonical static hex layout from hub
-        layout = {
-            "town_square": {"NE": "tavern", "SE": "market_square", "SW": "alley"},
-            "tavern":      {"SW": "town_square"},
-            "market_square": {"NW": "town_square"},
-            "alley":       {"NE": "town_square"},
-        }
-
-        # Normalize tags helper
-        def ensure(loc_id):
-            try:
-                ls = world.locations_static.get(loc_id)
-                if ls is None:
-                    from engine.data_models import LocationStatic
-                    world.locations_static[loc_id] = LocationStatic(id=loc_id, description=f"{loc_id.replace('_',' ').title()}")
-            except Exception:
-                pass
-
-        for loc_id in keep_ids:
-            ensure(loc_id)
-
-        # Apply static hex_connections and dynamic connections with directions
-        inv = {"E":"W","W":"E","NE":"SW","SW":"NE","NW":"SE","SE":"NW"}
-        for a, conns in layout.items():
-            try:
-                st = world.locations_static.get(a)
-                if st:
-                    st.hex_connections = {k: v for k, v in conns.items()}
-            except Exception:
-                pass
-            # ensure dynamic entries
-            try:
-                st_a = world.locations_state.get(a)
-                if st_a is None:
-                    from engine.data_models import LocationState
-                    world.locations_state[a] = LocationState(id=a)
-                    st_a = world.locations_state[a]
-                for d, b in conns.items():
-                    # forward
-                    ent_a = st_a.connections_state.setdefault(b, {})
-                    ent_a["status"] = ent_a.get("status", "open")
-                    ent_a["direction"] = d
-                    # back
-                    st_b = world.locations_state.get(b)
-                    if st_b is None:
-                        from engine.data_models import LocationState
-                        world.locations_state[b] = LocationState(id=b)
-                        st_b = world.locations_state[b]
-                    ent_b = st_b.connections_state.setdefault(a, {})
-                    ent_b["status"] = ent_b.get("status", "open")
-                    ent_b["direction"] = inv[d]
-            except Exception:
-                pass
-
-        # Persist to JSON files on disk
-        try:
-            import json as _json
-            base = Path("data") / "locations"
-            base.mkdir(parents=True, exist_ok=True)
-            # Write keepers
-            for loc_id in keep_ids:
-                ls = world.locations_static.get(loc_id)
-                st = world.locations_state.get(loc_id)
-                if ls:
-                    static_path = base / f"{loc_id}_static.json"
-                    with open(static_path, "w", encoding="utf-8") as f:
-                        _json.dump({
-                            "id": ls.id,
-                            "description": getattr(ls, "description", ""),
-                            "tags": getattr(ls, "tags", {"inherent": []}),
-                            "hex_connections": getattr(ls, "hex_connections", {}),
-                        }, f, ensure_ascii=False, indent=2)
-                if st:
-                    state_path = base / f"{loc_id}_state.json"
-                    with open(state_path, "w", encoding="utf-8") as f:
-                        _json.dump({
-                            "id": st.id,
-                            "occupants": list(getattr(st, "occupants", []) or []),
-                            "items": list(getattr(st, "items", []) or []),
-                            "sublocations": list(getattr(st, "sublocations", []) or []),
-                            "transient_effects": list(getattr(st, "transient_effects", []) or []),
-                            "connections_state": getattr(st, "connections_state", {}) or {},
-                        }, f, ensure_ascii=False, indent=2)
-        except Exception:
-            # Persistence failure is non-fatal for runtime view
-            pass
+        base.mkdir(parents=True, exist_ok=True)
+        # Consume the results so the first failure propagates; the world lock keeps payloads stable meanwhile
+        list(_persist_pool.map(lambda job: _persist_json(*job), pending))
+    except OSError:
+        # Persistence failure is non-fatal for runtime view
+        pass
 
-        _emit_refresh()
-        return jsonify({"success": True})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    _emit_refresh(*keep_ids)
+    return jsonify({"success": True})
 
 if __name__ == '__main__':
     # Create static directory if it doesn't exist
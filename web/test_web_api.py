@@ -3,55 +3,78 @@
 Test script for the web interface
 """
 
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+import socketio
 
-def test_web_api():
-    """Test the web API endpoints"""
-    base_url = "http://localhost:5000"
-    
-    # Test getting game state
+PUSH_TIMEOUT_SECONDS = 5.0
+
+
+def _check_endpoint(response_future, label: str, noun: str) -> None:
     try:
-        response = requests.get(f"{base_url}/api/state")
+        response = response_future.result()
         if response.status_code == 200:
-            print("✓ Game state endpoint working")
-            state = response.json()
-            print(f"  Game tick: {state.get('game_tick', 'N/A')}")
-            print(f"  Player: {state.get('player', {}).get('name', 'N/A')}")
+            print(f"✓ {label} endpoint working")
+            print(f"  Found {len(response.json())} {noun}")
         else:
-            print(f"✗ Game state endpoint failed with status {response.status_code}")
-    except requests.exceptions.ConnectionError:
-        print("✗ Could not connect to server. Is it running?")
-        return
+            print(f"✗ {label} endpoint failed with status {response.status_code}")
     except Exception as e:
-        print(f"✗ Error testing game state endpoint: {e}")
-    
-    # Test getting locations
+        print(f"✗ Error testing {label.lower()} endpoint: {e}")
+
+
+def test_web_api():
+    """Test the web API: live state arrives by Socket.IO push, the map and actors are fetched once"""
+    base_url = "http://localhost:5000"
+
+    # Subscribe instead of polling /api/state: the server pushes the state on connect and a
+    # debounced state_delta after every change
+    client = socketio.Client()
+    got_state = threading.Event()
+    received: dict = {}
+
+    @client.on('state_update')
+    def on_state_update(state):
+        received["state"] = state
+        got_state.set()
+
+    @client.on('state_delta')
+    def on_state_delta(payload):
+        # The server sends the delta as pre-encoded JSON bytes
+        delta = json.loads(payload) if isinstance(payload, (bytes, bytearray)) else payload
+        print(f"  state_delta: {len((delta or {}).get('changed') or [])} changed ids")
+
     try:
-        response = requests.get(f"{base_url}/api/locations")
-        if response.status_code == 200:
-            print("✓ Locations endpoint working")
-            locations = response.json()
-            print(f"  Found {len(locations)} locations")
-        else:
-            print(f"✗ Locations endpoint failed with status {response.status_code}")
-    except Exception as e:
-        print(f"✗ Error testing locations endpoint: {e}")
-    
-    # Test getting actors
+        client.connect(base_url)
+    except socketio.exceptions.ConnectionError:
+        print("✗ Could not connect to server. Is it running?")
+        return
+
     try:
-        response = requests.get(f"{base_url}/api/actors")
-        if response.status_code == 200:
-            print("✓ Actors endpoint working")
-            actors = response.json()
-            print(f"  Found {len(actors)} actors")
-        else:
-            print(f"✗ Actors endpoint failed with status {response.status_code}")
-    except Exception as e:
-        print(f"✗ Error testing actors endpoint: {e}")
+        # Bootstrap data, fetched once and concurrently (later changes arrive as pushes); the
+        # requests overlap each other and the wait for the initial state push
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            locations = pool.submit(requests.get, f"{base_url}/api/locations")
+            actors = pool.submit(requests.get, f"{base_url}/api/actors")
+
+            if got_state.wait(PUSH_TIMEOUT_SECONDS) and received.get("state"):
+                print("✓ Game state push working")
+                state = received["state"]
+                print(f"  Game tick: {state.get('game_tick', 'N/A')}")
+                print(f"  Player: {state.get('player', {}).get('name', 'N/A')}")
+            else:
+                print(f"✗ No state pushed within {PUSH_TIMEOUT_SECONDS:.0f}s of connecting")
+
+            _check_endpoint(locations, "Locations", "locations")
+            _check_endpoint(actors, "Actors", "actors")
+    finally:
+        client.disconnect()
 
 if __name__ == "__main__":
     print("Testing Living Tapestry Web Interface...")
     print("=" * 40)
     test_web_api()
     print("=" * 40)
-    print("Test complete. Make sure the server is running before running this test.")
\ No newline at end of file
+    print("Test complete. Make sure the server is running before running this test.")